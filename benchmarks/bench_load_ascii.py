@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2020 Gabriele Bozzola
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, see <https://www.gnu.org/licenses/>.
+
+"""Compare the speed of the ASCII readers in :py:mod:`~.cactus_ascii_utils`
+with ``np.loadtxt`` on a file that looks like a Cactus scalar output.
+
+Usage: ``python benchmarks/bench_load_ascii.py [number of lines]``
+(default, 1000000 lines), with PostCactus installed or in the PYTHONPATH.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from postcactus import cactus_ascii_utils as cau
+
+
+def write_scalar_file(path, num_lines):
+    """Write a file with num_lines lines with iteration, time, and data."""
+    iterations = np.arange(num_lines)
+    data = np.column_stack(
+        (iterations, 0.25 * iterations, np.sin(0.01 * iterations))
+    )
+    with open(path, "w") as file_:
+        file_.write("# Scalar ASCII output created by CarpetIOScalar\n")
+        file_.write("# data columns: 3:rho\n")
+        np.savetxt(file_, data, fmt=("%d", "%.19g", "%.19g"))
+
+
+def best_time(function, repeat=3):
+    """Return the shortest of repeat runs of function."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(num_lines):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "hydrobase-rho.maximum.asc")
+        write_scalar_file(path, num_lines)
+
+        readers = {
+            "np.loadtxt": lambda: np.loadtxt(path, ndmin=2),
+            "load_ascii": lambda: cau.load_ascii(path),
+            "np.fromstring": lambda: cau._load_ascii_numpy(path, None),
+        }
+        if cau.pandas is not None:
+            readers["pandas"] = lambda: cau._load_ascii_pandas(path, None)
+
+        timings = {name: best_time(reader) for name, reader in readers.items()}
+
+        print(f"NumPy {np.__version__}, {num_lines} lines")
+        for name, elapsed in timings.items():
+            print(
+                f"{name:>15}: {elapsed:6.2f} s "
+                f"(speedup {timings['np.loadtxt'] / elapsed:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
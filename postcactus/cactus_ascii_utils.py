@@ -20,6 +20,29 @@
 
 import os
 import re
+import warnings
+from bz2 import open as bopen
+from gzip import open as gopen
+
+import numpy as np
+
+# pandas is not a dependency of PostCactus, but if it is available, we use its
+# parser, which is the fastest one
+try:
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
+
+# Starting from version 1.23, np.loadtxt is implemented in C. Before that, it
+# was written in pure Python and it was very slow.
+_NUMPY_HAS_FAST_LOADTXT = tuple(
+    int(number) for number in np.__version__.split(".")[:2]
+) >= (1, 23)
+
+# Table for bytes.translate that maps whitespace to 0 and everything else to 1
+_NOT_WHITESPACE_TABLE = bytes(
+    0 if byte in b" \t\n\r\v\f" else 1 for byte in range(256)
+)
 
 
 def _scan_strings_for_columns(strings, pattern, path=None):
@@ -31,9 +54,10 @@ def _scan_strings_for_columns(strings, pattern, path=None):
 
     """
 
-    # Here we match (number):(word[number])
-    # We are matching expressions like 3:kxx
-    pattern_columns = r"^(\d+):(\w+(\[\d+\])?)$"
+    # Here we match (number):(word[number](reduction))
+    # We are matching expressions like 3:kxx, or 3:kxx(minimum) for files
+    # with all the reductions (all_reductions_in_one_file)
+    pattern_columns = r"^(\d+):(\w+(\[\d+\])?(\(\w+\))?)$"
     rx_columns = re.compile(pattern_columns)
 
     # We scan these lines and see if any matches with the regexp for the
@@ -81,7 +105,7 @@ def _scan_strings_for_columns(strings, pattern, path=None):
     # to the description. Columns are indexed starting from 1.
     columns_description = {
         variable_name: int(column_number) - 1
-        for column_number, variable_name, _ in (c.groups() for c in columns)
+        for column_number, variable_name in (c.group(1, 2) for c in columns)
     }
 
     return columns_description
@@ -168,6 +192,183 @@ def scan_header(
     return time_column, data_column
 
 
+def _open_text(path):
+    """Open the file at path for reading text, decompressing it if its
+    extension is ``.gz`` or ``.bz2``.
+
+    This function is not meant to be called directly.
+
+    :param path: Path of the file
+    :type path: str
+
+    :returns: File object
+    :rtype: file object
+    """
+    extension = os.path.splitext(str(path))[1]
+    opener = {".gz": gopen, ".bz2": bopen}.get(extension, open)
+    return opener(path, mode="rt")
+
+
+def _load_ascii_pandas(path, usecols):
+    """Read the columns of numbers in path using pandas' C parser.
+
+    pandas fills the missing values of lines that are too short (e.g., the
+    last line of a file that is being written) with NaN, whereas np.loadtxt
+    raises an error. So, if there are NaNs, None is returned, and the file is
+    read again with np.loadtxt (which also reads the NaNs that are actually
+    in the file).
+
+    This function is not meant to be called directly.
+
+    :returns: Data with one row for each line in the file, or None
+    :rtype: 2D numpy array or None
+    """
+    data = pandas.read_csv(
+        path,
+        sep=r"\s+",
+        engine="c",
+        header=None,
+        comment="#",
+        usecols=usecols,
+        dtype=float,
+        compression="infer",
+        # Without this, the last digit can be different from np.loadtxt
+        float_precision="round_trip",
+    )
+    # pandas returns the columns in the order they are in the file
+    if usecols is not None:
+        data = data[list(usecols)]
+    data = data.to_numpy(dtype=float)
+    if np.isnan(data).any():
+        return None
+    return data
+
+
+def _load_ascii_numpy(path, usecols):
+    """Read the columns of numbers in path using np.fromstring.
+
+    np.fromstring parses numbers separated by whitespace in C, so it is
+    much faster than the Python implementation of np.loadtxt in old versions of
+    NumPy, but it ignores the structure of the lines. We remove comments and
+    blank lines, and we check that all the lines have the same number of
+    values (so, lines that are too short, e.g. the last line of a file that is
+    being written, are not silently misread). If something goes wrong, None is
+    returned, and np.loadtxt can be used to read the file (or to raise the
+    appropriate error).
+
+    This function is not meant to be called directly.
+
+    :returns: Data with one row for each line in the file, or None
+    :rtype: 2D numpy array or None
+    """
+    with _open_text(path) as file_:
+        text = file_.read()
+
+    # Remove all the lines that are comments or blank
+    text = re.sub(r"^[ \t]*(#.*)?(\n|$)", "", text, flags=re.MULTILINE)
+    text = text.strip()
+
+    if not text or "#" in text:
+        # Empty file, or comments at the end of lines
+        return None
+
+    num_lines = text.count("\n") + 1
+    first_line, _, _ = text.partition("\n")
+    num_columns = len(first_line.split())
+
+    # We count the values in each line working with the bytes of the text: a
+    # value starts where a character that is not whitespace follows
+    # whitespace (or the beginning of the text). With translate, we turn the
+    # text into booleans without looping in Python.
+    text_bytes = text.encode()
+    not_space = np.frombuffer(
+        text_bytes.translate(_NOT_WHITESPACE_TABLE), dtype=bool
+    )
+    value_starts = not_space.copy()
+    value_starts[1:] &= ~not_space[:-1]
+    # Number of values before each newline
+    values_before_newline = np.searchsorted(
+        np.flatnonzero(value_starts),
+        np.flatnonzero(np.frombuffer(text_bytes, dtype=np.uint8) == ord("\n")),
+    )
+    values_per_line = np.diff(
+        values_before_newline,
+        prepend=0,
+        append=np.count_nonzero(value_starts),
+    )
+    if np.any(values_per_line != num_columns):
+        return None
+
+    with warnings.catch_warnings():
+        # fromstring emits a DeprecationWarning when it finds something that
+        # is not a number
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            data = np.fromstring(text, sep=" ")
+        except (DeprecationWarning, ValueError):
+            return None
+
+    if data.size != num_lines * num_columns:
+        return None
+
+    data = data.reshape(num_lines, num_columns)
+    if usecols is not None:
+        if max(usecols) >= num_columns:
+            return None
+        data = data[:, usecols]
+    return data
+
+
+def load_ascii(path, usecols=None):
+    """Read the columns of numbers in the ASCII file at path.
+
+    This is equivalent to ``np.loadtxt(path, ndmin=2, usecols=usecols)``, but
+    much faster with old versions of NumPy. Lines starting with ``#`` are
+    ignored and compressed files (``gz`` and ``bz2``) are supported. As with
+    ``np.loadtxt``, lines that are too short (e.g., the last line of a file
+    that is being written) are an error, with all the backends.
+
+    Starting from version 1.23, ``np.loadtxt`` is implemented in C, and it is
+    as fast as the alternatives, so we use it. With older versions of NumPy,
+    if pandas is available, its C parser is used. Otherwise, the numbers are
+    parsed with ``np.fromstring``. If the file cannot be parsed with these
+    methods (e.g., it contains comments at the end of the lines), we fall back
+    to ``np.loadtxt``. ``np.loadtxt`` is also used when path is a file object.
+
+    :param path: Path of the file
+    :type path: str or file object
+    :param usecols: Columns to read (all if None)
+    :type usecols: list or tuple of int
+
+    :returns: Data with one row for each line in the file and one column for
+              each of the usecols
+    :rtype: 2D numpy array
+    """
+    if usecols is not None:
+        usecols = list(usecols)
+
+    data = None
+
+    # We cannot go back to the beginning of file objects if the fast methods
+    # fail, so we always use np.loadtxt for them
+    is_path = isinstance(path, (str, os.PathLike))
+
+    if is_path and not _NUMPY_HAS_FAST_LOADTXT:
+        if pandas is not None:
+            try:
+                data = _load_ascii_pandas(path, usecols)
+            except (ValueError, IndexError, KeyError):
+                # pandas.errors.ParserError is a ValueError
+                data = None
+        else:
+            data = _load_ascii_numpy(path, usecols)
+
+    if data is None:
+        data = np.loadtxt(path, ndmin=2, usecols=usecols)
+
+    return data
+
+
 def total_filesize(allfiles, unit="MB"):
     """Return the total size of the given files.
     Available units B, KB, MB and GB
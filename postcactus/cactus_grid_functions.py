@@ -51,11 +51,20 @@ class BaseOneGridFunction(ABC):
     """Abstract class that implements capabilities to handle grid functions.
 
     Using the [] notation you can access values with as HierarchicalGridFunction.
+
+    The data can be read with a different type than the one used in the files
+    by specifying dtype (e.g., np.float32 to halve the memory needed). Complex
+    data is read with the complex type with the same precision. If dtype is
+    None, the type in the files is used.
     """
 
-    def __init__(self, allfiles, var_name):
+    def __init__(self, allfiles, var_name, dtype=None):
         self.allfiles = list(allfiles)
 
+        # We need this before parsing the files, because some readers read
+        # the data when parsing
+        self.dtype = None if dtype is None else np.dtype(dtype)
+
         # self.alldata is a nested dictionary
         # 1. At the first level, we have the file
         # 2. self.alldata[filename] is a dictionary with keys the various
@@ -100,6 +109,24 @@ class BaseOneGridFunction(ABC):
     def time_at_iteration(self, iteration):
         pass
 
+    def _dtype_for(self, file_dtype):
+        """Return the type with which data stored in the files with type
+        file_dtype has to be read.
+
+        :param file_dtype: Type of the data in the file.
+        :type file_dtype: NumPy dtype
+
+        :returns: Type to use for the data in memory.
+        :rtype: NumPy dtype
+        """
+        if self.dtype is None:
+            return np.dtype(file_dtype)
+        # If the data is complex, we want the complex type with the
+        # precision of self.dtype (e.g., complex64 for float32)
+        if np.dtype(file_dtype).kind == "c":
+            return np.result_type(self.dtype, np.complex64)
+        return self.dtype
+
     @lru_cache(128)
     def _iterations_in_file(self, path):
         """Return the (sorted) available iterations in file path.
@@ -399,12 +426,12 @@ class OneGridFunctionASCII(BaseOneGridFunction):
         "bz2": (bopen, "rt"),
     }
 
-    def __init__(self, allfiles, var_name, num_ghost=None):
+    def __init__(self, allfiles, var_name, num_ghost=None, dtype=None):
 
         self._iterations_to_times = {}
         self.num_ghost = num_ghost
 
-        super().__init__(allfiles, var_name)
+        super().__init__(allfiles, var_name, dtype=dtype)
 
     def _parse_file(self, path):
 
@@ -498,7 +525,9 @@ class OneGridFunctionASCII(BaseOneGridFunction):
             x0 = np.asarray(x0_3d)[dimensions_in_data]
             x1 = np.asarray(x1_3d)[dimensions_in_data]
 
-            var_data = np.array(current_data).reshape(tuple(shape[::-1]))
+            var_data = np.array(
+                current_data, dtype=self._dtype_for(float)
+            ).reshape(tuple(shape[::-1]))
 
             grid = grid_data.UniformGrid(
                 shape,
@@ -678,7 +707,7 @@ class OneGridFunctionH5(BaseOneGridFunction):
     ([ ]c=(\d+))?       # Component
     """
 
-    def __init__(self, allfiles, var_name):
+    def __init__(self, allfiles, var_name, dtype=None):
 
         # We need these variables to propertly find what dataset to look at in
         # the HDF5 file.
@@ -687,7 +716,7 @@ class OneGridFunctionH5(BaseOneGridFunction):
 
         self.rx_group_name = re.compile(self._pattern_group_name, re.VERBOSE)
 
-        super().__init__(allfiles, var_name)
+        super().__init__(allfiles, var_name, dtype=dtype)
 
         # super() will fill the other variables that we need for dataset_format
         if self.map is None:
@@ -824,7 +853,15 @@ class OneGridFunctionH5(BaseOneGridFunction):
                 grid = self._grid_from_dataset(
                     dataset, iteration, ref_level, component
                 )
-                data = np.transpose(dataset[()])
+                data_dtype = self._dtype_for(dataset.dtype)
+                if data_dtype == dataset.dtype:
+                    data = dataset[()]
+                else:
+                    # HDF5 converts the data while reading it, so we never
+                    # have the data with the type in the file in memory
+                    data = np.empty(dataset.shape, dtype=data_dtype)
+                    dataset.read_direct(data)
+                data = np.transpose(data)
 
                 self.alldata[path][iteration][ref_level][
                     component
@@ -923,12 +960,15 @@ class AllGridFunctions:
         (0, 1, 2): "xyz",
     }
 
-    def __init__(self, allfiles, dimension, num_ghost=None):
+    def __init__(self, allfiles, dimension, num_ghost=None, dtype=None):
         """allfiles is a list of files, dimension has to a tuple.
 
         :param num_ghost: Number of ghost zones in the data for each dimension.
                           This is used only for ASCII data.
         :type num_ghost: list or tuple of the same length as the number of dimension
+        :param dtype: Type used to store the data in memory (e.g. np.float32).
+                      If None, use the type in the files.
+        :type dtype: NumPy dtype or None
 
         """
 
@@ -946,6 +986,8 @@ class AllGridFunctions:
         # Here we are using a setter for num_ghost, see below
         self.num_ghost = num_ghost
 
+        self.dtype = dtype
+
         # This is a simple regex:
         # 1. ^ and $ mean that we have to match the entire string
         # 2. ([a-zA-Z0-9_]+) means that we match any combination of letters
@@ -1091,7 +1133,9 @@ class AllGridFunctions:
         var_name = str(key)
         # We prefer h5
         if var_name in self._vars_h5:
-            return OneGridFunctionH5(self._vars_h5[var_name], var_name)
+            return OneGridFunctionH5(
+                self._vars_h5[var_name], var_name, dtype=self.dtype
+            )
 
         if var_name in self._vars_ascii:
             if self.num_ghost is None:
@@ -1101,7 +1145,10 @@ class AllGridFunctions:
                     " of this object to properly account for the ghost zones. "
                 )
             return OneGridFunctionASCII(
-                self._vars_ascii[var_name], var_name, num_ghost=self.num_ghost
+                self._vars_ascii[var_name],
+                var_name,
+                num_ghost=self.num_ghost,
+                dtype=self.dtype,
             )
 
         raise KeyError(f"Variable {key} not present in simulation data")
@@ -1190,6 +1237,11 @@ class GridFunctionsDir:
     :ivar yz:          Access to 2D data along yz-plane.
     :ivar xyz:         Access to 3D data.
 
+    The data can be read with a type different from the one in the files by
+    passing dtype to the constructor. For example, with dtype=np.float32 data
+    written in double precision is stored in single precision (and complex
+    data in complex64), halving the memory needed.
+
     """
 
     # Usually we think in terms of dimensions xyz, but it is much more
@@ -1206,7 +1258,16 @@ class GridFunctionsDir:
         "xyz": (0, 1, 2),
     }
 
-    def __init__(self, sd):
+    def __init__(self, sd, dtype=None):
+        """Constructor.
+
+        :param sd: Simulation directory.
+        :type sd: :py:class:`~.SimDir`
+        :param dtype: Type used to store the data in memory (e.g. np.float32).
+                      If None, use the type in the files.
+        :type dtype: NumPy dtype or None
+
+        """
 
         if not isinstance(sd, simdir.SimDir):
             raise TypeError("Input is not SimDir")
@@ -1215,7 +1276,9 @@ class GridFunctionsDir:
         # AllGridFunctions, which contains all the variables for which that
         # dimension is available
         self._all_griddata = {
-            dim: AllGridFunctions(sd.allfiles, dim)
+            dim: AllGridFunctions(
+                sd._files_by_kind["grid_functions"], dim, dtype=dtype
+            )
             for dim in self._dim_indices.values()
         }
 
@@ -25,11 +25,53 @@ simulation.
 import os
 import re
 import warnings
+from collections.abc import Mapping
+from functools import partial
 
 import numpy as np
 
 from postcactus.attr_dict import pythonize_name_dict
-from postcactus.timeseries import TimeSeries, combine_ts
+from postcactus.cactus_ascii_utils import load_ascii
+from postcactus.timeseries import TimeSeries, combine_many_ts
+
+
+class _LazyTimeSeriesDict(Mapping):
+    """Read-only dictionary with the timeseries of a horizon, which are
+    computed as ``function(names[key])`` only when they are accessed for the
+    first time.
+
+    Not intended for direct use.
+
+    """
+
+    def __init__(self, names, function):
+        """Constructor.
+
+        :param names: Dictionary that maps the keys to the arguments of
+                      function.
+        :type names: dict
+        :param function: Function that returns the timeseries.
+        :type function: callable
+
+        """
+        self._names = names
+        self._function = function
+        self._cache = {}
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            self._cache[key] = self._function(self._names[key])
+        return self._cache[key]
+
+    def __contains__(self, key):
+        # Mapping would implement this by reading the data
+        return key in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
 
 
 class OneHorizon:
@@ -60,24 +102,8 @@ class OneHorizon:
         self._qlm_vars = qlm_vars
         self._ah_vars = ah_vars
 
-        # We turn the var_dictionary into attributes
-        for var, timeseries in self._qlm_vars.items():
-            # With this we can access properties in the following way
-            # horizon.mass
-            setattr(self, var, timeseries)
-
-        # Here we compute some interesting and useful quantities, if we have
-        # qlm data
-        if self._qlm_vars:
-            self.mass_final = self.mass.y[-1]
-            self.spin_final = self.spin.y[-1]
-            self.dimensionless_spin_final = (
-                self.spin_final / self.mass_final ** 2
-            )
-        else:
-            self.mass_final = None
-            self.spin_final = None
-            self.dimensionless_spin_final = None
+        # The qlm_vars are accessed as attributes (e.g., horizon.mass) with
+        # __getattr__, so that they are read only when they are needed.
 
         # We put the AH vars under the ah attribute, they are accessed in the
         # same way as qlm_vars (as attribute). This is achieved using
@@ -85,12 +111,6 @@ class OneHorizon:
         # Here we use the method get_ah_property that peeks into self._ah_vars.
         self.ah = pythonize_name_dict(ah_vars, self.get_ah_property)
 
-        # We read the formation time from a variable in AH
-        if self._ah_vars:
-            self.formation_time = self.ah.area.tmin
-        else:
-            self.formation_time = None
-
         # Now we deal with the shape. Shape files is a dictionary that maps
         # iteration to the associated file
         self._shape_files = shape_files
@@ -106,35 +126,103 @@ class OneHorizon:
             self.shape_iteration_min = self.shape_iterations[0]
             self.shape_iteration_max = self.shape_iterations[-1]
 
-            # To convert between time and iteration, we need the AH data If we
-            # don't have that, we will assume time = iteration.
-            #
-            if self._ah_vars:
-                # Now we find the associated times using ah.cctk_iteration
-                # self.ah.cctk_iteration is a function time vs iteration, we
-                # want the opposite. We define a new timeseries in which we swap
-                # t and y
-                times_iterations = TimeSeries(
-                    self.ah.cctk_iteration.y, self.ah.cctk_iteration.t
-                )
-                self.shape_times = times_iterations(self.shape_iterations)
-                self.shape_time_min = self.shape_times[0]
-                self.shape_time_max = self.shape_times[-1]
-            else:
+            # To convert between time and iteration, we need the AH data. The
+            # times are computed only when they are needed (see the
+            # shape_times property), so that the AH files are not read here.
+            self._shape_times = None
+            if not self._ah_vars:
                 warnings.warn(
                     "AH data not found, so it is impossible to convert"
                     " between iteration number to time.\nManually set"
                     " shape_times or methods involving shape and time"
                     " will not work"
                 )
-                self.shape_times = None
-                self.shape_time_min = None
-                self.shape_time_max = None
 
             # We will save all the shape patches and their origin that we read in
             # this dictionary
             self._patches = {}
 
+    @property
+    def shape_times(self):
+        """Times corresponding to :py:attr:`shape_iterations` (None if there
+        is no AH data). They are computed from the AH data the first time they
+        are accessed.
+        """
+        if not self.shape_available:
+            raise AttributeError("Object has no attribute shape_times")
+        if self._shape_times is None and self._ah_vars:
+            # self.ah.cctk_iteration is a function time vs iteration, we
+            # want the opposite. We define a new timeseries in which we swap
+            # t and y
+            times_iterations = TimeSeries(
+                self.ah.cctk_iteration.y, self.ah.cctk_iteration.t
+            )
+            self._shape_times = times_iterations(self.shape_iterations)
+        return self._shape_times
+
+    @shape_times.setter
+    def shape_times(self, times):
+        self._shape_times = times
+
+    @property
+    def shape_time_min(self):
+        """Time of the first shape file (None if :py:attr:`shape_times` is
+        not available)."""
+        if self.shape_times is None:
+            return None
+        return self.shape_times[0]
+
+    @property
+    def shape_time_max(self):
+        """Time of the last shape file (None if :py:attr:`shape_times` is not
+        available)."""
+        if self.shape_times is None:
+            return None
+        return self.shape_times[-1]
+
+    def __getattr__(self, name):
+        # __getattr__ is called only when name is not a normal attribute. We
+        # exclude the private names, which are not qlm_vars, to avoid infinite
+        # recursion when _qlm_vars is not defined yet (e.g., when unpickling).
+        if name.startswith("_") or name not in self._qlm_vars:
+            raise AttributeError(f"Object has no attribute {name}")
+        return self._qlm_vars[name]
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(self._qlm_vars)
+
+    @property
+    def mass_final(self):
+        """Mass at the end of the simulation (None if there is no QLM data)."""
+        if not self._qlm_vars:
+            return None
+        return self.mass.y[-1]
+
+    @property
+    def spin_final(self):
+        """Angular momentum at the end of the simulation (None if there is no
+        QLM data)."""
+        if not self._qlm_vars:
+            return None
+        return self.spin.y[-1]
+
+    @property
+    def dimensionless_spin_final(self):
+        """Dimensionless spin at the end of the simulation (None if there is
+        no QLM data)."""
+        if not self._qlm_vars:
+            return None
+        return self.spin_final / self.mass_final ** 2
+
+    @property
+    def formation_time(self):
+        """First time at which the horizon has been found (None if there is no
+        AH data)."""
+        # We read the formation time from a variable in AH
+        if not self._ah_vars:
+            return None
+        return self.ah.area.tmin
+
     def __getitem__(self, key):
         if key not in self._qlm_vars.keys():
             raise KeyError(f"Quantity {key} does not exist")
@@ -464,6 +552,10 @@ class HorizonsDir:
         # stripped of the qlm_ prefix and of the number, and as values the
         # timeseries. We extract the number with a regular expression which
         # matches qlm_VARNAME[NUM]
+        #
+        # The timeseries in _qlm_vars and _ah_vars are read only when they are
+        # accessed for the first time (see _LazyTimeSeriesDict), so that
+        # creating this object does not read any data.
 
         self._qlm_vars = {}
         self._populate_qlm_vars(sd)
@@ -519,24 +611,38 @@ class HorizonsDir:
         # 4. Then we match the brackets, and inside a number
         rx_qlm_number = re.compile(r"^qlm_(\w+)\[(\d+)\]$")
 
+        # For each horizon, we have a dictionary that maps stripped variable
+        # names to the full names
+        qlm_names = {}
+
         for var_name in sd.ts.scalar.keys():
             matched = rx_qlm_number.match(var_name)
             if matched is not None:
                 # Here we strip of qlm_ and of the number
                 var_name_stripped = matched.group(1)
                 horizon_number = int(matched.group(2))
-                # For each horizon, we have a dictionary that maps variable
-                # names to the timeseries
-                horizon_vars = self._qlm_vars.setdefault(horizon_number, {})
-                horizon_vars[var_name_stripped] = sd.ts.scalar[var_name]
+                horizon_names = qlm_names.setdefault(horizon_number, {})
+                horizon_names[var_name_stripped] = var_name
+
+        # The timeseries are read from sd.ts.scalar when they are needed
+        for horizon_number, horizon_names in qlm_names.items():
+            self._qlm_vars[horizon_number] = _LazyTimeSeriesDict(
+                horizon_names, sd.ts.scalar.__getitem__
+            )
 
     def _populate_ah_vars(self, sd):
         # First, we find all the files related to apparent horizons. These
         # have names like BH_diagnostics.ah1.gp
         self._ah_files = {}
 
+        # Here we save the data of the files (as from load_ascii) and the
+        # timeseries of each horizon once we read them. The data of the files
+        # is removed once it is combined into the timeseries.
+        self._ah_files_data = {}
+        self._ah_timeseries = {}
+
         rx_ah_filename = re.compile(r"^BH_diagnostics.ah(\d+).gp$")
-        for path in sd.allfiles:
+        for path in sd._files_by_kind["horizons"]:
             filename = os.path.split(path)[-1]
             matched = rx_ah_filename.search(filename)
             if matched is not None:
@@ -602,7 +708,7 @@ class HorizonsDir:
 
                     # We need to know where the time is
                     if name == "cctk_time":
-                        time_column = column_number
+                        self._ah_time_column = column_number
 
                     # We exclude some variables we don't want in OneHorizon
                     # (e.g., we don't want cctk_time)
@@ -618,24 +724,83 @@ class HorizonsDir:
                     name = name.replace("/", "-")
                     self._ah_vars_columns[name] = column_number
 
-            # Now we are ready to populate, we read all the data first. Then, we
-            # select all the columns
-            for ah_index, files in self._ah_files.items():
-                # We create an empty dictionary in self._ah_vars[ah_index]
-                self._ah_vars.setdefault(ah_index, {})
-
-                # We read all the data
-                alldata = [np.loadtxt(f, unpack=True, ndmin=2) for f in files]
-                for var_name, column_number in self._ah_vars_columns.items():
-                    # Here we select the time column and the data column for all
-                    # the data in each file and we convert them into TimeSeries
-                    data_ts = combine_ts(
-                        [
-                            TimeSeries(data[time_column], data[column_number])
-                            for data in alldata
-                        ]
+            # Now we are ready to populate. The files are read only when one
+            # of the variables is accessed (see _ah_var).
+            for ah_index in self._ah_files:
+                self._ah_vars[ah_index] = _LazyTimeSeriesDict(
+                    {
+                        var_name: (ah_index, var_name)
+                        for var_name in self._ah_vars_columns
+                    },
+                    self._ah_var,
+                )
+
+    def _ah_var(self, ah_index_and_name):
+        """Return the timeseries of the given variable of the given horizon,
+        reading the files of the horizon if they were not read yet.
+
+        This function is not meant to be called directly.
+
+        :param ah_index_and_name: Index of the horizon and name of the
+                                  variable.
+        :type ah_index_and_name: tuple
+
+        :returns: Timeseries of the variable
+        :rtype: :py:class:`~.TimeSeries`
+
+        """
+        ah_index, name = ah_index_and_name
+
+        if ah_index not in self._ah_timeseries:
+            # We read each file only once, all the variables are in it. The
+            # files read by SimDir.preload are taken (and removed) from
+            # self._ah_files_data.
+            alldata = [
+                (
+                    self._ah_files_data.pop(path)
+                    if path in self._ah_files_data
+                    else load_ascii(path)
+                ).T
+                for path in self._ah_files[ah_index]
+            ]
+            # Here we select the time column and the data columns for all the
+            # data in each file and we combine them into TimeSeries. All the
+            # variables share the same times, so we combine them all together.
+            self._ah_timeseries[ah_index] = combine_many_ts(
+                [data[self._ah_time_column] for data in alldata],
+                {
+                    var_name: [data[column_number] for data in alldata]
+                    for var_name, column_number in (
+                        self._ah_vars_columns.items()
                     )
-                    self._ah_vars[ah_index][var_name] = data_ts
+                },
+            )
+
+        return self._ah_timeseries[ah_index][name]
+
+    def _jobs_to_preload(self):
+        """Return what has to be read to load the AH data of all the horizons,
+        as a list of tuples (function, argument, callback). callback saves
+        function(argument) in the caches of this object. What was already
+        read is not included.
+
+        This function is not meant to be called directly.
+
+        :returns: Jobs to run
+        :rtype: list of tuples
+
+        """
+        return [
+            (
+                load_ascii,
+                path,
+                partial(self._ah_files_data.__setitem__, path),
+            )
+            for ah_index, files in self._ah_files.items()
+            if ah_index not in self._ah_timeseries
+            for path in files
+            if path not in self._ah_files_data
+        ]
 
     def _populate_shape_files(self, sd):
         # Here we match the files with a regular expression:
@@ -646,7 +811,7 @@ class HorizonsDir:
         # 5. another number (\d+)
         # 6. and the file extension .gp
         rx_shape_filename = re.compile(r"^h.t(\d+).ah(\d+).gp$")
-        for path in sd.allfiles:
+        for path in sd._files_by_kind["horizons"]:
             filename = os.path.split(path)[1]
             matched = rx_shape_filename.match(filename)
             if matched is not None:
@@ -24,13 +24,76 @@
 
 import os
 import re
-from functools import lru_cache
+from functools import lru_cache, partial
 
 import h5py
-import numpy as np
 
 from postcactus import timeseries
 from postcactus.attr_dict import pythonize_name_dict
+from postcactus.cactus_ascii_utils import load_ascii
+from postcactus.parallel_utils import _map_in_pool
+
+
+class _LazyTimeSeries:
+    """Placeholder for a :py:class:`~.TimeSeries` that is read only when it is
+    needed, as ``function(*args)``.
+
+    It can be used in place of a :py:class:`~.TimeSeries` in the data passed
+    to :py:class:`~.MultipoleOneDet` and :py:class:`~.MultipoleAllDets`.
+
+    prefetch, if not None, is a function that takes the list of the args of
+    multiple placeholders (with the same prefetch) and reads their data at
+    once, so that the following calls to function are cheap (e.g., reading
+    multiple datasets opening the file only once). See
+    :py:func:`~._prefetch_lazy_ts`.
+
+    Not intended for direct use.
+
+    """
+
+    def __init__(self, function, *args, prefetch=None):
+        self.function = function
+        self.args = args
+        self.prefetch = prefetch
+
+    def load(self):
+        """Return the :py:class:`~.TimeSeries`."""
+        return self.function(*self.args)
+
+
+def _combined_lazy_ts(series):
+    """Return the combination of the given series, reading the ones that are
+    :py:class:`~._LazyTimeSeries`.
+
+    This function is not meant to be called directly.
+
+    """
+    return timeseries.combine_ts(
+        [ts.load() if isinstance(ts, _LazyTimeSeries) else ts for ts in series]
+    )
+
+
+def _prefetch_lazy_ts(series):
+    """Call the prefetch functions of the :py:class:`~._LazyTimeSeries` in
+    series (also of the ones that are combined), so that the placeholders
+    that have the same prefetch are read together.
+
+    This function is not meant to be called directly.
+
+    """
+    args_by_prefetch = {}
+    series = list(series)
+    # The list grows while we loop over it when we find combined placeholders
+    for ts in series:
+        if not isinstance(ts, _LazyTimeSeries):
+            continue
+        if ts.function is _combined_lazy_ts:
+            series.extend(ts.args[0])
+        elif ts.prefetch is not None:
+            args_by_prefetch.setdefault(ts.prefetch, []).append(ts.args)
+
+    for prefetch, args in args_by_prefetch.items():
+        prefetch(args)
 
 
 class MultipoleOneDet:
@@ -50,6 +113,10 @@ class MultipoleOneDet:
     The reason we allow for l_min is to remove those files that are not
     necessary when considering gravitational waves (l<2).
 
+    The data can contain placeholders for timeseries that have not been read
+    yet (as for HDF5 files). These are read when the corresponding (l, m) is
+    requested for the first time, and then they are kept.
+
     Not intended for direct use.
 
     :ivar dist: Radius of the sphere
@@ -97,8 +164,14 @@ class MultipoleOneDet:
 
         # Now self._multipoles is a dictionary in which all the timeseries are
         # collapse in a single one. So it is a straightforward map (l, m) -> ts
+        # If some of the timeseries have not been read yet, the value is a
+        # placeholder that reads and combines them when needed
         self._multipoles = {
-            lm: timeseries.combine_ts(ts)
+            lm: (
+                _LazyTimeSeries(_combined_lazy_ts, ts)
+                if any(isinstance(s, _LazyTimeSeries) for s in ts)
+                else timeseries.combine_ts(ts)
+            )
             for lm, ts in multipoles_list_ts.items()
         }
         self.available_l = sorted(
@@ -119,8 +192,11 @@ class MultipoleOneDet:
         # set subtraction
         self.missing_lm = all_lm - self.available_lm
 
-        # Data is in the format expected by __init__
-        self.data = [(lm[0], lm[1], ts) for lm, ts in self._multipoles.items()]
+    @property
+    def data(self):
+        """Data in the format expected by __init__ (the timeseries that were
+        not read yet are not read)."""
+        return [(lm[0], lm[1], ts) for lm, ts in self._multipoles.items()]
 
     def copy(self):
         return type(self)(self.dist, self.data, self.l_min)
@@ -129,7 +205,33 @@ class MultipoleOneDet:
         return key in self._multipoles
 
     def __getitem__(self, key):
-        return self._multipoles[key]
+        ts = self._multipoles[key]
+        if isinstance(ts, _LazyTimeSeries):
+            ts = self._multipoles[key] = ts.load()
+        return ts
+
+    def _pending(self):
+        """Return the placeholders of the timeseries that were not read yet.
+
+        This function is not meant to be called directly.
+
+        """
+        return [
+            ts
+            for ts in self._multipoles.values()
+            if isinstance(ts, _LazyTimeSeries)
+        ]
+
+    def _load_all(self):
+        """Read all the timeseries that were not read yet. Data that can be
+        read together (e.g., datasets in the same HDF5 file) is read at once.
+
+        This function is not meant to be called directly.
+
+        """
+        _prefetch_lazy_ts(self._pending())
+        for key in self._multipoles:
+            self[key]
 
     def __call__(self, mult_l, mult_m):
         return self[(mult_l, mult_m)]
@@ -137,13 +239,17 @@ class MultipoleOneDet:
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
-        return (
-            self.dist == other.dist and self._multipoles == other._multipoles
-        )
+        if self.dist != other.dist or self.keys() != other.keys():
+            return False
+        self._load_all()
+        other._load_all()
+        return all(self[lm] == other[lm] for lm in self.keys())
 
     def __iter__(self):
-        for (mult_l, mult_m), ts in sorted(self._multipoles.items()):
-            yield mult_l, mult_m, ts
+        # We are going to need all the timeseries
+        self._load_all()
+        for mult_l, mult_m in sorted(self._multipoles):
+            yield mult_l, mult_m, self[(mult_l, mult_m)]
 
     def __len__(self):
         return len(self._multipoles)
@@ -151,6 +257,21 @@ class MultipoleOneDet:
     def keys(self):
         return self.available_lm
 
+    def to_TimeSeriesBundle(self):
+        """Return all the multipoles as a single
+        :py:class:`~.TimeSeriesBundle`, with channels labeled by (l, m).
+
+        This is useful to apply the same operations to all the multipoles at
+        once. All the multipoles have to be defined on the same times.
+
+        :returns: Bundle with all the multipoles
+        :rtype: :py:class:`~.TimeSeriesBundle`
+
+        """
+        return timeseries.TimeSeriesBundle.from_timeseries(
+            {(mult_l, mult_m): ts for mult_l, mult_m, ts in self}
+        )
+
     def __str__(self):
         ret = f"(l, m) available: {self.keys()}"
         if self.missing_lm:
@@ -285,12 +406,16 @@ class MultipoleAllDets:
         # Alias
         self._dets = self._detectors
 
-        # Data is in the format expected by __init__
+    @property
+    def data(self):
+        """Data in the format expected by __init__ (the timeseries that were
+        not read yet are not read)."""
         # (multipole_l, multipole_m, extraction_radius, [timeseries])
-        self.data = []
-        for radius, det in self._dets.items():
-            for mult_l, mult_m, ts in det:
-                self.data.append((mult_l, mult_m, radius, ts))
+        return [
+            (mult_l, mult_m, radius, ts)
+            for radius, det in self._dets.items()
+            for mult_l, mult_m, ts in det.data
+        ]
 
     def copy(self):
         return type(self)(self.data, self.l_min)
@@ -323,10 +448,27 @@ class MultipoleAllDets:
         for r in self.radii:
             yield self[r]
 
+    def _load_all(self):
+        """Read all the timeseries that were not read yet. Data that can be
+        read together (e.g., datasets in the same HDF5 file) is read at once.
+
+        This function is not meant to be called directly.
+
+        """
+        _prefetch_lazy_ts(
+            ts for det in self._dets.values() for ts in det._pending()
+        )
+        for det in self._dets.values():
+            det._load_all()
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
-        return self.radii == other.radii and self._dets == other._dets
+        if self.radii != other.radii:
+            return False
+        self._load_all()
+        other._load_all()
+        return self._dets == other._dets
 
     def __len__(self):
         return len(self._dets)
@@ -352,10 +494,21 @@ class MultipolesDir:
     loaded. If both h5 and ASCII are present, h5 are preferred. There's no
     attempt to combine the two.
 
+    For h5 files, only the names of the datasets are read when a variable is
+    accessed. Each multipole is read when it is requested for the first time
+    (e.g., with ``multipoles["psi4"][110.69](2, 2)``). When all the multipoles
+    of a detector are needed (e.g., when iterating over them), the datasets in
+    the same file are read together, and the files are read concurrently.
+
     Alternatively, you can access variables with get() or with fields.var_name.
+
+    If num_workers is not 1, the files of a variable are read concurrently by
+    num_workers threads (or processes, if use_processes is True). If
+    num_workers is None, the number of workers is chosen based on the number of
+    CPUs. The result does not depend on these options.
     """
 
-    def __init__(self, sd):
+    def __init__(self, sd, num_workers=1, use_processes=False):
         # self._vars is a dictionary. For _vars_ascii, the keys are the
         # variables  and the items are sets of tuples of the form
         # (multipole_l,  multipole_m, radius, filename) for text files.
@@ -366,6 +519,25 @@ class MultipolesDir:
         self._vars_h5 = {}
 
         self.path = sd.path
+        self.num_workers = num_workers
+        self.use_processes = use_processes
+
+        # Data read from each text file, as a dictionary that maps the path to
+        # what _multipole_from_textfile returns
+        self._textfiles_data = {}
+        # Multipoles in each h5 file, as a dictionary that maps the path to
+        # what _index_h5file returns
+        self._h5files_index = {}
+        # Data read from h5 files, as a dictionary that maps (path, dataset)
+        # to the timeseries
+        self._h5datasets_data = {}
+        # The data in _textfiles_data and _h5datasets_data is removed once it
+        # is combined into the MultipoleAllDets (which keep it), so that it is
+        # not kept twice. These dictionaries only hold what was read by
+        # SimDir.preload (or concurrently) and was not used yet. We remember
+        # what was used, so that SimDir.preload does not read it again.
+        self._used_textfiles = set()
+        self._used_h5datasets = set()
         # First, we need to find the multipole files.
         # There are text files and h5 files
         #
@@ -396,7 +568,7 @@ class MultipolesDir:
         # For h5 files is easy: it is just the var name
         rx_h5 = re.compile(r"^mp_([a-zA-Z0-9\[\]_]+).h5$")
 
-        for f in sd.allfiles:
+        for f in sd._files_by_kind["multipoles"]:
             filename = os.path.split(f)[1]
             matched_h5 = rx_h5.match(filename)
             matched_ascii = rx_ascii.match(filename)
@@ -426,15 +598,20 @@ class MultipolesDir:
 
     @staticmethod
     def _multipole_from_textfile(path):
-        a = np.loadtxt(path, unpack=True, ndmin=2)
+        a = load_ascii(path).T
         if len(a) != 3:
             raise RuntimeError(f"Wrong format in {path}")
         complex_mp = a[1] + 1j * a[2]
         return timeseries.remove_duplicate_iters(a[0], complex_mp)
 
     @staticmethod
-    def _multipoles_from_h5file(path):
-        alldets = []
+    def _index_h5file(path):
+        """Return the multipoles in the given HDF5 file as a list of tuples
+        (multipole_l, multipole_m, radius, dataset name). The data is not
+        read.
+
+        """
+        index = []
         # This regex matches : l(number)_m(-number)_r(number)
         fieldname_pattern = re.compile(r"l(\d+)_m([-]?\d+)_r([0-9.]+)")
 
@@ -447,34 +624,232 @@ class MultipolesDir:
                     mult_l = int(matched.group(1))
                     mult_m = int(matched.group(2))
                     radius = float(matched.group(3))
-                    # Read the actual data
-                    a = data[entry][()].T
-                    ts = timeseries.TimeSeries(a[0], a[1] + 1j * a[2])
-                    alldets.append((mult_l, mult_m, radius, ts))
+                    index.append((mult_l, mult_m, radius, entry))
 
-        return alldets
+        return index
+
+    @staticmethod
+    def _multipole_from_h5dataset(path, entry):
+        return MultipolesDir._multipoles_from_h5datasets((path, [entry]))[0]
+
+    @staticmethod
+    def _multipoles_from_h5datasets(path_and_entries):
+        """Read the given datasets of an HDF5 file, opening the file only
+        once.
+
+        :param path_and_entries: Path of the file and names of the datasets
+        :type path_and_entries: tuple of str and list of str
+
+        :returns: Timeseries of the datasets
+        :rtype: list of :py:class:`~.TimeSeries`
+
+        """
+        path, entries = path_and_entries
+        series = []
+        with h5py.File(path, "r") as data:
+            for entry in entries:
+                # Read the actual data
+                a = data[entry][()].T
+                series.append(timeseries.TimeSeries(a[0], a[1] + 1j * a[2]))
+        return series
+
+    def _store_h5datasets(self, path, entries, series):
+        """Save in self._h5datasets_data the series of the datasets entries
+        of the file path, as returned by _multipoles_from_h5datasets.
+
+        This function is not meant to be called directly.
+
+        """
+        self._h5datasets_data.update(
+            ((path, entry), ts) for entry, ts in zip(entries, series)
+        )
+
+    def _h5datasets_to_read(self, datasets):
+        """Return the datasets that are not read yet among the given ones,
+        grouped by file, as a list of tuples (path, names of the datasets).
+
+        This function is not meant to be called directly.
+
+        :param datasets: Path of the file and name of each dataset.
+        :type datasets: list of tuples
+
+        """
+        entries = {}
+        for path, entry in datasets:
+            if not (
+                (path, entry) in self._h5datasets_data
+                or (path, entry) in self._used_h5datasets
+            ):
+                entries.setdefault(path, []).append(entry)
+        return [(path, tuple(names)) for path, names in entries.items()]
+
+    def _read_h5datasets(self, datasets):
+        """Read the given datasets that were not read yet and save them in
+        self._h5datasets_data. Each file is opened only once, and the files
+        are read concurrently if num_workers is not 1.
+
+        This function is not meant to be called directly.
+
+        :param datasets: Path of the file and name of each dataset.
+        :type datasets: list of tuples
+
+        """
+        jobs = self._h5datasets_to_read(datasets)
+        for (path, entries), series in zip(
+            jobs, self._read_files(self._multipoles_from_h5datasets, jobs)
+        ):
+            self._store_h5datasets(path, entries, series)
+
+    def _cached_multipole_from_h5dataset(self, path, entry):
+        """Same as _multipole_from_h5dataset, but the datasets already read
+        are taken (and removed) from self._h5datasets_data.
+
+        This function is not meant to be called directly.
+
+        """
+        self._used_h5datasets.add((path, entry))
+        if (path, entry) in self._h5datasets_data:
+            return self._h5datasets_data.pop((path, entry))
+        return self._multipole_from_h5dataset(path, entry)
+
+    def _read_files(self, function, paths, cache=None):
+        """Return ``[function(path) for path in paths]``. The results are saved
+        in cache, and only the files that are not already there are read
+        (concurrently, if num_workers is not 1).
+
+        This function is not meant to be called directly.
+
+        :param function: Function that reads a file.
+        :type function: callable
+        :param paths: Files to read (or, in general, arguments of function).
+        :type paths: list
+        :param cache: Dictionary that maps paths to the output of function
+                      (if None, the results are not saved).
+        :type cache: dict or None
+
+        """
+        if cache is None:
+            cache = {}
+        missing = [path for path in paths if path not in cache]
+        cache.update(
+            zip(
+                missing,
+                _map_in_pool(
+                    function, missing, self.num_workers, self.use_processes
+                ),
+            )
+        )
+        return [cache[path] for path in paths]
+
+    def _jobs_to_preload(self, key, radii=None):
+        """Return what has to be read to load the variable key at the given
+        radii (all if None), as a list of tuples (function, argument,
+        callback). callback saves function(argument) in the caches of this
+        object. What was already read is not included.
+
+        This function is not meant to be called directly.
+
+        :param key: Variable.
+        :type key: str
+        :param radii: Radii (as in the names of the files or datasets).
+        :type radii: list of float or None
+
+        :returns: Jobs to run
+        :rtype: list of tuples
+
+        """
+        k = str(key).lower()
+        jobs = []
+        if k in self._vars_h5:
+            paths = sorted(self._vars_h5[k])
+            indices = self._read_files(
+                self._index_h5file, paths, self._h5files_index
+            )
+            # One job for each file, which reads all the needed datasets
+            datasets = [
+                (path, entry)
+                for path, index in zip(paths, indices)
+                for *_, radius, entry in index
+                if radii is None or radius in radii
+            ]
+            for path, entries in self._h5datasets_to_read(datasets):
+                jobs.append(
+                    (
+                        self._multipoles_from_h5datasets,
+                        (path, entries),
+                        partial(self._store_h5datasets, path, entries),
+                    )
+                )
+        elif k in self._vars_ascii:
+            for _, _, radius, path in sorted(self._vars_ascii[k]):
+                if (radii is None or radius in radii) and not (
+                    path in self._textfiles_data
+                    or path in self._used_textfiles
+                ):
+                    jobs.append(
+                        (
+                            self._multipole_from_textfile,
+                            path,
+                            partial(self._textfiles_data.__setitem__, path),
+                        )
+                    )
+        else:
+            raise KeyError(f"{key} not available")
+
+        return jobs
 
     def _multipoles_from_textfiles(self, mpfiles):
+        # We sort the files, so that the order in which they are combined does
+        # not depend on the order in which they are read
+        mpfiles = sorted(mpfiles)
+
         # We prepare the data for MultipoleAllDets checking
         # for errors
-        alldets = [
-            (
-                mult_l,
-                mult_m,
-                radius,
-                self._multipole_from_textfile(filename),
-            )
-            for mult_l, mult_m, radius, filename in mpfiles
-        ]
-        return MultipoleAllDets(alldets)
+        paths = [filename for *_, filename in mpfiles]
+        allseries = self._read_files(
+            self._multipole_from_textfile, paths, self._textfiles_data
+        )
+        alldets = MultipoleAllDets(
+            [
+                (mult_l, mult_m, radius, series)
+                for (mult_l, mult_m, radius, _), series in zip(
+                    mpfiles, allseries
+                )
+            ]
+        )
 
-    def _multipoles_from_h5files(self, mpfiles):
-        mult_l = []
+        # Now the data is in alldets
+        for path in paths:
+            del self._textfiles_data[path]
+        self._used_textfiles.update(paths)
 
-        for filename in mpfiles:
-            mult_l.extend(self._multipoles_from_h5file(filename))
+        return alldets
 
-        return MultipoleAllDets(mult_l)
+    def _multipoles_from_h5files(self, mpfiles):
+        # Only the names of the datasets are read here. The data is read when
+        # a multipole is requested for the first time.
+        paths = sorted(mpfiles)
+        indices = self._read_files(
+            self._index_h5file, paths, self._h5files_index
+        )
+
+        return MultipoleAllDets(
+            [
+                (
+                    mult_l,
+                    mult_m,
+                    radius,
+                    _LazyTimeSeries(
+                        self._cached_multipole_from_h5dataset,
+                        path,
+                        entry,
+                        prefetch=self._read_h5datasets,
+                    ),
+                )
+                for path, index in zip(paths, indices)
+                for mult_l, mult_m, radius, entry in index
+            ]
+        )
 
     @lru_cache(128)
     def __getitem__(self, key):
@@ -23,18 +23,31 @@ The data loaded by this module is represented as
 :py:class:`~.TimeSeries` objects.
 """
 
+import io
 import os
 import re
+import warnings
 from bz2 import open as bopen
 from functools import lru_cache
 from gzip import open as gopen
+from operator import methodcaller
 
 import numpy as np
 
 from postcactus import simdir
 from postcactus import timeseries as ts
 from postcactus.attr_dict import pythonize_name_dict
-from postcactus.cactus_ascii_utils import scan_header
+from postcactus.cactus_ascii_utils import load_ascii, scan_header
+from postcactus.parallel_utils import _map_in_pool
+from postcactus.series import _frozen
+
+# In incremental mode, what was read from each file is kept here, so that also
+# new OneScalar (e.g., from a new SimDir) read only the lines that were
+# appended to the file since the last time. The keys are the absolute paths of
+# the files, the values are tuples with the modification time and the number
+# of bytes of the file that were read, the last line read (to detect files that
+# are rewritten), and the columns (as in OneScalar._columns).
+_incremental_reads = {}
 
 
 class OneScalar:
@@ -51,6 +64,32 @@ class OneScalar:
     OneScalar represents one scalar file, there can be multiple variables inside,
     (if it was one_file_per_group).
 
+    Files with all the reductions (written with the option
+    all_reductions_in_one_file) are supported too. In this case, the keys are
+    the columns as described in the header, e.g. ``rho(minimum)``. Usually,
+    these files are read through :py:class:`~.AllScalars`, which serves each
+    reduction from the same OneScalar, so the file is parsed only once.
+
+    The file is parsed only once: the first time that a variable is requested,
+    all the columns are read and kept in memory, so that the other variables
+    in the same file are immediately available. If keep_all_columns is False,
+    only the columns requested so far are read and kept instead (this saves
+    memory, but the file is parsed again for each new variable).
+
+    If incremental is True, every time that a variable is requested, the file
+    is checked, and only the lines that were appended since the last time are
+    read. This is useful to follow simulations that are running. What was
+    read is remembered for each file, so also a new OneScalar for the same
+    file (e.g., in a new SimDir) reads only the new lines. Compressed files
+    are read again entirely when they change. In this mode, all the columns
+    are always kept.
+
+    If use_npy_cache is True, the first time that the data is read, the content
+    of the file is converted to a binary ``.npy`` file next to the ASCII file
+    (with the same name, plus ``.npy``). Then, the TimeSeries are memory-mapped
+    to this file, so only the parts of the data that are actually used are read
+    from disk. The cache is regenerated when the ASCII file is more recent.
+
     """
 
     # What is this pattern?
@@ -99,8 +138,27 @@ class OneScalar:
         "bz2": (bopen, "rt"),
     }
 
-    def __init__(self, path):
+    def __init__(
+        self,
+        path,
+        use_npy_cache=False,
+        keep_all_columns=True,
+        incremental=False,
+    ):
+        if use_npy_cache and incremental:
+            raise ValueError(
+                "use_npy_cache and incremental cannot be used together"
+            )
+
         self.path = str(path)
+        self.use_npy_cache = use_npy_cache
+        self.keep_all_columns = keep_all_columns
+        self.incremental = incremental
+        # Columns read so far (with the duplicated iterations removed), as a
+        # dictionary that maps the column number to the data
+        self._columns = {}
+        # Data read from the .npy cache (see _load_npy_cache)
+        self._npy_table = None
         # The _vars dictionary contains a mapping between the various variables
         # and the column numbers in which they are stored.
         self._vars = {}
@@ -130,21 +188,24 @@ class OneScalar:
             reduction_type if reduction_type is not None else "scalar"
         )
 
-        # If the file contains multiple variables, we will scan the header
-        # immediately to understand the content. If not, we scan the header
-        # only when needed
+        # If the file contains multiple variables (or multiple reductions), we
+        # have to scan the header to know the content. We do it only when the
+        # variables are listed or requested, so that creating many OneScalar
+        # is cheap.
         self._is_one_file_per_group = variable_name2 is not None
+        self._all_reductions_in_one_file = self.reduction_type == "scalars"
         self._was_header_scanned = False
 
-        if self._is_one_file_per_group:
-            # We need the variable names
-            self._scan_header()
-        else:
+        if not self._has_multiple_columns:
             variable_name = variable_name1
             if index_in_brackets is not None:
                 variable_name += index_in_brackets
             self._vars = {variable_name: None}
 
+    @property
+    def _has_multiple_columns(self):
+        return self._is_one_file_per_group or self._all_reductions_in_one_file
+
     def _scan_header(self):
         # Call scan_header with the right argument
 
@@ -157,13 +218,13 @@ class OneScalar:
 
         self._time_column, columns_info = scan_header(
             self.path,
-            self._is_one_file_per_group,
+            self._has_multiple_columns,
             file_has_column_format,
             opener=opener,
             opener_mode=opener_mode,
         )
 
-        if self._is_one_file_per_group:
+        if self._has_multiple_columns:
             self._vars.update(columns_info)
         else:
             # There is only one data_column
@@ -171,16 +232,47 @@ class OneScalar:
 
         self._was_header_scanned = True
 
-    @lru_cache(128)
+    def _scan_header_if_variables_unknown(self):
+        """Scan the header if the file contains multiple variables and we do
+        not know them yet.
+
+        This function is not meant to be called directly.
+
+        """
+        if self._has_multiple_columns and not self._was_header_scanned:
+            self._scan_header()
+
     def load(self, variable):
         """Read file and return a TimeSeries with the requested variable.
 
+        In incremental mode, the lines appended to the file since the last
+        call are read.
+
         :param variable: Requested variable
         :type variable: str
 
         :returns: TimeSeries with requested variable as read from file
         :rtype:        :py:class:`~.TimeSeries`
 
+        """
+        if self.incremental:
+            return self._load(variable)
+        return self._load_cached(variable)
+
+    @lru_cache(128)
+    def _load_cached(self, variable):
+        """Same as _load, but the result is saved.
+
+        This function is not meant to be called directly.
+
+        """
+        return self._load(variable)
+
+    def _load(self, variable):
+        """Read file and return a TimeSeries with the requested variable.
+
+        This function is not meant to be called directly.
+
         """
         if not self._was_header_scanned:
             self._scan_header()
@@ -189,19 +281,239 @@ class OneScalar:
             raise ValueError(f"{variable} not available")
 
         column_number = self._vars[variable]
-        t, y = np.loadtxt(
-            self.path,
-            unpack=True,
-            ndmin=2,
-            usecols=(self._time_column, column_number),
+
+        if self.use_npy_cache:
+            # The rows of the table are the columns of the file, with the
+            # duplicate iterations already removed
+            table = self._load_npy_cache()
+            return ts.TimeSeries._from_validated(
+                table[self._time_column], table[column_number]
+            )
+
+        if self.incremental:
+            self._read_new_lines()
+            if not self._columns:
+                raise RuntimeError(f"No data in {self.path}")
+        elif column_number not in self._columns:
+            if self.keep_all_columns:
+                self._read_columns()
+            else:
+                self._read_columns([column_number])
+
+        # The columns are read-only, so they can be shared among all the
+        # TimeSeries
+        return ts.TimeSeries._from_validated(
+            self._columns[self._time_column], self._columns[column_number]
         )
 
-        return ts.remove_duplicate_iters(t, y)
+    def _read_table(self, column_numbers=None):
+        """Read the time and the given columns (all the columns if None) from
+        the file and remove the duplicated iterations.
+
+        This function is not meant to be called directly.
+
+        :param column_numbers: Columns to read, excluding the time
+        :type column_numbers: list of int or None
+
+        :returns: Column numbers, and data with one row for each column
+        :rtype: tuple of list of int and 2D numpy array
+
+        """
+        if column_numbers is None:
+            table = load_ascii(self.path).T
+            column_numbers = list(range(len(table)))
+        else:
+            column_numbers = [self._time_column] + list(column_numbers)
+            table = load_ascii(self.path, usecols=column_numbers).T
+
+        time_row = column_numbers.index(self._time_column)
+        msk = ts._remove_duplicate_iters_mask(table[time_row])
+
+        # With the mask, we make a new array, which is contiguous
+        return column_numbers, table[:, msk]
+
+    def _read_columns(self, column_numbers=None):
+        """Read the time and the given columns (all the columns if None) from
+        the file and save them in self._columns.
+
+        This function is not meant to be called directly.
+
+        :param column_numbers: Columns to read, excluding the time
+        :type column_numbers: list of int or None
+
+        """
+        self._store_columns(self._read_table(column_numbers))
+
+    def _store_columns(self, columns):
+        """Save in self._columns the columns as returned by _read_table.
+
+        This function is not meant to be called directly.
+
+        :param columns: Column numbers, and data with one row for each column
+        :type columns: tuple of list of int and 2D numpy array
+
+        """
+        column_numbers, table = columns
+        # The table is not used anywhere else, so we make it read-only and
+        # share its rows
+        for column_number, data in zip(column_numbers, _frozen(table)):
+            self._columns[column_number] = data
+
+    def _read_new_lines(self):
+        """Read the lines appended to the file since the last time that it was
+        read and add them to self._columns.
+
+        As in :py:func:`~.remove_duplicate_iters`, if the new lines have times
+        that are earlier than the ones already read, the old points are
+        discarded.
+
+        This function is not meant to be called directly.
+
+        """
+        key = os.path.abspath(self.path)
+        mtime, offset, last_line, self._columns = _incremental_reads.get(
+            key, (None, 0, b"", {})
+        )
+
+        stat = os.stat(self.path)
+
+        if stat.st_size == offset and stat.st_mtime == mtime:
+            return
+
+        if self._compression_method is not None:
+            # Compressed files cannot be read incrementally, so we read
+            # everything again
+            opener, opener_mode = self._decompressor[self._compression_method]
+            with opener(self.path, mode=opener_mode) as file_:
+                text = file_.read()
+            offset, last_line, self._columns = stat.st_size, b"", {}
+        else:
+            # We read again the last line, to check that the file was not
+            # rewritten (in which case we read everything again)
+            start = offset - len(last_line)
+            with open(self.path, "rb") as file_:
+                file_.seek(start)
+                new_bytes = file_.read()
+            if new_bytes.startswith(last_line):
+                new_bytes = new_bytes[len(last_line) :]
+            else:
+                with open(self.path, "rb") as file_:
+                    new_bytes = file_.read()
+                offset, self._columns = 0, {}
+            # The last line may be incomplete, if the file is being written.
+            # We will read it the next time.
+            new_bytes = new_bytes[: new_bytes.rfind(b"\n") + 1]
+            offset += len(new_bytes)
+            if new_bytes:
+                last_line = new_bytes[new_bytes.rfind(b"\n", 0, -1) + 1 :]
+            text = new_bytes.decode()
+
+        _incremental_reads[key] = (
+            stat.st_mtime,
+            offset,
+            last_line,
+            self._columns,
+        )
+
+        with warnings.catch_warnings():
+            # np.loadtxt warns when there are only comments
+            warnings.simplefilter("ignore", UserWarning)
+            new_table = load_ascii(io.StringIO(text)).T
+
+        if new_table.size == 0:
+            return
+
+        new_table = new_table[
+            :, ts._remove_duplicate_iters_mask(new_table[self._time_column])
+        ]
+
+        # The old points are monotonically increasing, we keep only those that
+        # are before all the new ones
+        num_old = 0
+        if self._columns:
+            num_old = np.searchsorted(
+                self._columns[self._time_column],
+                new_table[self._time_column][0],
+            )
+
+        for column_number, new_data in enumerate(new_table):
+            old_data = self._columns.get(column_number, new_data[:0])
+            self._columns[column_number] = _frozen(
+                np.concatenate((old_data[:num_old], new_data))
+            )
+
+    @property
+    def npy_cache_path(self):
+        """Return the path of the ``.npy`` cache of the file.
+
+        :returns: Path of the cache
+        :rtype: str
+
+        """
+        return self.path + ".npy"
+
+    def _load_npy_cache(self):
+        """Return the data in the file as a read-only memory-mapped array with
+        one row for each column of the file. Create the ``.npy`` cache, if it
+        does not exist or if it is older than the file.
+
+        If the cache cannot be written, the data is kept in memory.
+
+        This function is not meant to be called directly.
+
+        :returns: Data in the file, with one row for each column
+        :rtype: 2D numpy array (possibly memory-mapped)
+
+        """
+        if self._npy_table is not None:
+            return self._npy_table
+
+        self._npy_table = self._read_or_write_npy_cache()
+        return self._npy_table
+
+    def _read_or_write_npy_cache(self):
+        """Read the ``.npy`` cache, writing it first if needed.
+
+        This function is not meant to be called directly.
+
+        :returns: Data in the file, with one row for each column
+        :rtype: 2D numpy array (possibly memory-mapped)
+
+        """
+        cache_path = self.npy_cache_path
+
+        if os.path.exists(cache_path) and os.path.getmtime(
+            cache_path
+        ) >= os.path.getmtime(self.path):
+            return np.load(cache_path, mmap_mode="r")
+
+        # We store the columns as rows, so that each of them is contiguous in
+        # the file
+        _, table = self._read_table()
+
+        # We first write to a temporary file, and then we rename it, so that
+        # we never leave half-written caches around
+        temp_path = cache_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as cache_file:
+                np.save(cache_file, table)
+            os.replace(temp_path, cache_path)
+        except OSError as error:
+            warnings.warn(
+                f"Could not write cache {cache_path} ({error}). "
+                "Keeping data in memory.",
+                RuntimeWarning,
+            )
+            table.setflags(write=False)
+            return table
+
+        return np.load(cache_path, mmap_mode="r")
 
     def __getitem__(self, key):
         return self.load(key)
 
     def __contains__(self, key):
+        self._scan_header_if_variables_unknown()
         return key in self._vars
 
     def keys(self):
@@ -211,9 +523,123 @@ class OneScalar:
         :rtype:   list
 
         """
+        self._scan_header_if_variables_unknown()
         return list(self._vars.keys())
 
 
+class _OneReductionInScalarsFile:
+    """Dictionary-like view on the columns of one reduction in a file with all
+    the reductions (all_reductions_in_one_file).
+
+    All the reductions are served from the same :py:class:`~.OneScalar`, so
+    the file is parsed only once.
+
+    Not intended for direct use.
+
+    """
+
+    def __init__(self, one_scalar, reduction_type):
+        """one_scalar is the :py:class:`~.OneScalar` of the file,
+        reduction_type is the name of the reduction as in the header of the
+        file (e.g. norm_inf).
+
+        """
+        self.one_scalar = one_scalar
+        self.reduction_type = reduction_type
+        self.folder = one_scalar.folder
+        self._suffix = f"({reduction_type})"
+
+    def load(self, variable):
+        """Read file and return a TimeSeries with the requested variable.
+
+        :param variable: Requested variable
+        :type variable: str
+
+        :returns: TimeSeries with requested variable as read from file
+        :rtype:        :py:class:`~.TimeSeries`
+
+        """
+        return self.one_scalar.load(variable + self._suffix)
+
+    def __getitem__(self, key):
+        return self.load(key)
+
+    def __contains__(self, key):
+        return key + self._suffix in self.one_scalar
+
+    def keys(self):
+        """Return the list of variables available with this reduction.
+
+        :returns: List of variables in the file
+        :rtype:   list
+
+        """
+        return [
+            key[: -len(self._suffix)]
+            for key in self.one_scalar.keys()
+            if key.endswith(self._suffix)
+        ]
+
+
+# Names of the reductions in the files and in AllScalars, when they are
+# different
+_ALLSCALARS_REDUCTIONS = {"norm_inf": "infnorm"}
+
+
+def _classify_scalar_files(
+    allfiles, use_npy_cache=False, incremental=False, keep_all_columns=True
+):
+    """Group the scalar files in allfiles by reduction type (as named in
+    :py:class:`~.ScalarsDir`).
+
+    Only the names of the files are considered, the files are not opened.
+    Files that are not recognized as scalar files are skipped. Elements of
+    allfiles that are already :py:class:`~.OneScalar` are used as they are.
+    Files with all the reductions are added to every reduction, as views on
+    the same :py:class:`~.OneScalar`.
+
+    This function is not meant to be called directly.
+
+    :param allfiles: Files to classify.
+    :type allfiles: list of str or :py:class:`~.OneScalar`
+    :param use_npy_cache: Passed to :py:class:`~.OneScalar`.
+    :type use_npy_cache: bool
+    :param incremental: Passed to :py:class:`~.OneScalar`.
+    :type incremental: bool
+    :param keep_all_columns: Passed to :py:class:`~.OneScalar`.
+    :type keep_all_columns: bool
+
+    :returns: Dictionary that maps reduction types to the
+              :py:class:`~.OneScalar` with that reduction.
+    :rtype: dict
+
+    """
+    files = {}
+    for file_ in allfiles:
+        if not isinstance(file_, (OneScalar, _OneReductionInScalarsFile)):
+            try:
+                file_ = OneScalar(
+                    file_,
+                    use_npy_cache,
+                    keep_all_columns=keep_all_columns,
+                    incremental=incremental,
+                )
+            except RuntimeError:
+                continue
+        if isinstance(file_, OneScalar) and file_._all_reductions_in_one_file:
+            for reduction in OneScalar._reduction_types:
+                if reduction is not None:
+                    files.setdefault(
+                        _ALLSCALARS_REDUCTIONS.get(reduction, reduction), []
+                    ).append(_OneReductionInScalarsFile(file_, reduction))
+        else:
+            reduction = file_.reduction_type
+            files.setdefault(
+                _ALLSCALARS_REDUCTIONS.get(reduction, reduction), []
+            ).append(file_)
+    return files
+
+
 class AllScalars:
     """Helper class to read various types of scalar data in a list of files and
     properly order them. The core of this object is the _vars dictionary which
@@ -228,13 +654,57 @@ class AllScalars:
 
     """
 
-    def __init__(self, allfiles, reduction_type):
-        """allfiles is a list of files, reduction_type has to be a reduction or
-        scalar.
+    def __init__(
+        self,
+        allfiles,
+        reduction_type,
+        use_npy_cache=False,
+        incremental=False,
+        num_workers=1,
+        use_processes=False,
+        keep_all_columns=True,
+    ):
+        """allfiles is a list of files (paths or :py:class:`~.OneScalar`),
+        reduction_type has to be a reduction or scalar. If use_npy_cache is
+        True, the data is memory-mapped from binary caches of the files (see
+        :py:class:`~.OneScalar`). If incremental is True, every time that a
+        variable is requested, only the new lines in the files are read (see
+        :py:class:`~.OneScalar`). If keep_all_columns is False, only the
+        columns requested so far are read from files with multiple variables
+        (see :py:class:`~.OneScalar`).
+
+        If num_workers is not 1, the files of a variable (e.g., from different
+        restarts) are read concurrently by num_workers threads (or processes,
+        if use_processes is True). If num_workers is None, the number of
+        workers is chosen based on the number of CPUs. With processes, the
+        columns read are not kept in the :py:class:`~.OneScalar`, so processes
+        cannot be used in incremental mode.
+
+        The headers of the files are scanned only when the variables are
+        listed or requested for the first time.
 
         """
+        if incremental and use_processes:
+            raise ValueError(
+                "incremental and use_processes cannot be used together"
+            )
+
         self.reduction_type = str(reduction_type)
+        self.incremental = incremental
+        self.num_workers = num_workers
+        self.use_processes = use_processes
 
+        self._files = _classify_scalar_files(
+            allfiles, use_npy_cache, incremental, keep_all_columns
+        ).get(self.reduction_type, [])
+
+        # _vars and fields are computed when they are needed for the first
+        # time
+        self.__vars = None
+        self.__fields = None
+
+    @property
+    def _vars(self):
         # TODO: Is it necessary to have the folder level?
         # Probably not, so remove it
 
@@ -242,33 +712,103 @@ class AllScalars:
         # _vars['variable'] is a dictionary with as keys the folders where
         # to find the files associated to the variable and the reduction
         # reduction_type
-        self._vars = {}
-        for file_ in allfiles:
-            # We only save those that variables are well-behaved
-            try:
-                cactusascii_file = OneScalar(file_)
-                if cactusascii_file.reduction_type == reduction_type:
-                    for var in list(cactusascii_file.keys()):
-                        # We add to the _vars dictionary the mapping:
-                        # [var][folder] to OneScalar(f)
-                        folder = cactusascii_file.folder
-                        self._vars.setdefault(var, {})[
-                            folder
-                        ] = cactusascii_file
-            except RuntimeError:
-                pass
-
+        if self.__vars is None:
+            self.__vars = {}
+            for cactusascii_file in self._files:
+                # We only save those that variables are well-behaved
+                try:
+                    variables = cactusascii_file.keys()
+                except RuntimeError:
+                    continue
+                for var in variables:
+                    # We add to the _vars dictionary the mapping:
+                    # [var][folder] to OneScalar(f)
+                    folder = cactusascii_file.folder
+                    folders = self.__vars.setdefault(var, {})
+                    # If a variable is both in a file with all the
+                    # reductions and in a file with only this one, we use the
+                    # latter
+                    if isinstance(cactusascii_file, OneScalar) or (
+                        folder not in folders
+                    ):
+                        folders[folder] = cactusascii_file
+        return self.__vars
+
+    @property
+    def fields(self):
         # What pythonize_name_dict does is to make the various variables
         # accessible as attributes, e.g. self.fields.rho
-        self.fields = pythonize_name_dict(list(self.keys()), self.__getitem__)
+        if self.__fields is None:
+            self.__fields = pythonize_name_dict(
+                list(self.keys()), self.__getitem__
+            )
+        return self.__fields
 
-    @lru_cache(128)
     def __getitem__(self, key):
-        # We read all the files associated to variable key
+        if self.incremental:
+            return self._load(key)
+        return self._load_cached(key)
+
+    @lru_cache(128)
+    def _load_cached(self, key):
+        """Same as _load, but the result is saved.
+
+        This function is not meant to be called directly.
+
+        """
+        return self._load(key)
+
+    def _load(self, key):
+        """Read all the files associated to the variable key and combine
+        them.
+
+        This function is not meant to be called directly.
+
+        """
         folders = self._vars[key]
-        series = [f.load(key) for f in folders.values()]
+        series = _map_in_pool(
+            methodcaller("load", key),
+            folders.values(),
+            self.num_workers,
+            self.use_processes,
+        )
         return ts.combine_ts(series)
 
+    def _files_to_preload(self, key):
+        """Return the :py:class:`~.OneScalar` that have to be parsed to load
+        the variable key, with the number of the column of the variable.
+        Files in which the column was already read, or that are memory-mapped
+        or read incrementally are not included.
+
+        The headers of the files are scanned, so that
+        :py:meth:`~.OneScalar._read_table` can be called on the returned
+        objects.
+
+        This function is not meant to be called directly.
+
+        :param key: Variable.
+        :type key: str
+
+        :returns: Files to parse and columns to read.
+        :rtype: list of tuples of :py:class:`~.OneScalar` and int
+
+        """
+        files = []
+        for file_ in self._vars[key].values():
+            # Files with all the reductions are views on a OneScalar, in which
+            # the names of the variables have the reduction as suffix
+            one_scalar = getattr(file_, "one_scalar", file_)
+            if one_scalar.use_npy_cache or one_scalar.incremental:
+                continue
+            if not one_scalar._was_header_scanned:
+                one_scalar._scan_header()
+            column_number = one_scalar._vars[
+                key + getattr(file_, "_suffix", "")
+            ]
+            if column_number not in one_scalar._columns:
+                files.append((one_scalar, column_number))
+        return files
+
     def __contains__(self, key):
         return key in self._vars
 
@@ -282,6 +822,29 @@ class AllScalars:
         """
         return list(self._vars.keys())
 
+    def to_TimeSeriesBundle(self, keys=None):
+        """Return multiple variables as a single
+        :py:class:`~.TimeSeriesBundle`, with channels labeled by the name of
+        the variables.
+
+        This is useful to apply the same operations to all the variables at
+        once. All the variables have to be defined on the same times.
+
+        :param keys: Variables to collect. If None, all the available
+                     variables are collected.
+        :type keys: list of str
+
+        :returns: Bundle with the requested variables
+        :rtype: :py:class:`~.TimeSeriesBundle`
+
+        """
+        if keys is None:
+            keys = self.keys()
+
+        return ts.TimeSeriesBundle.from_timeseries(
+            {key: self[key] for key in keys}
+        )
+
     def get(self, key, default=None):
         """Return variable if available, else return the default value.
 
@@ -321,6 +884,24 @@ class ScalarsDir:
     Each of those works as a dictionary mapping variable names to
     :py:class:`~.TimeSeries` instances.
 
+    If use_npy_cache is True, the ASCII files are converted to binary ``.npy``
+    files the first time they are read, and the timeseries are memory-mapped
+    to those (see :py:class:`~.OneScalar`). This is useful for very long
+    outputs.
+
+    If incremental is True, every time that a variable is requested, only the
+    lines appended to the files since the last time are read (see
+    :py:class:`~.OneScalar`). This is useful to follow running simulations.
+
+    If num_workers is not 1, the files of each variable are read concurrently
+    by num_workers threads (or processes, if use_processes is True), see
+    :py:class:`~.AllScalars`.
+
+    If keep_all_columns is False, only the columns requested so far are read
+    from files with multiple variables, instead of all the columns (see
+    :py:class:`~.OneScalar`). This saves memory, but a file is parsed again for
+    each new variable.
+
     """
 
     # TODO: Implement the following, possibly in a clean way
@@ -329,24 +910,68 @@ class ScalarsDir:
     #    infnorm is reconstructed from min and max if infnorm
     #    itself is not available.
 
-    def __init__(self, sd):
+    def __init__(
+        self,
+        sd,
+        use_npy_cache=False,
+        incremental=False,
+        num_workers=1,
+        use_processes=False,
+        keep_all_columns=True,
+    ):
         """The constructor is not intended for direct use.
 
         :param sd: Simulation directory
         :type sd:  :py:class:`~.SimDir` instance.
+        :param use_npy_cache: Whether to memory-map the data from binary
+                              caches of the files.
+        :type use_npy_cache: bool
+        :param incremental: Whether to read only the new lines in the files
+                            every time that a variable is requested.
+        :type incremental: bool
+        :param num_workers: Number of threads or processes used to read the
+                            files of a variable (None to use all the CPUs).
+        :type num_workers: int or None
+        :param use_processes: Whether to use processes instead of threads.
+        :type use_processes: bool
+        :param keep_all_columns: Whether to read all the columns of a file
+                                 with multiple variables when one is
+                                 requested.
+        :type keep_all_columns: bool
         """
         if not isinstance(sd, simdir.SimDir):
             raise TypeError("Input is not SimDir")
 
         self.path = sd.path
-        self.point = AllScalars(sd.allfiles, "scalar")
-        self.scalar = AllScalars(sd.allfiles, "scalar")
-        self.minimum = AllScalars(sd.allfiles, "minimum")
-        self.maximum = AllScalars(sd.allfiles, "maximum")
-        self.norm1 = AllScalars(sd.allfiles, "norm1")
-        self.norm2 = AllScalars(sd.allfiles, "norm2")
-        self.average = AllScalars(sd.allfiles, "average")
-        self.infnorm = AllScalars(sd.allfiles, "infnorm")
+
+        # We look at the file names only once, and we give to each AllScalars
+        # only the files with the corresponding reduction
+        files = _classify_scalar_files(
+            sd._files_by_kind["scalars"],
+            use_npy_cache,
+            incremental,
+            keep_all_columns,
+        )
+
+        def all_scalars(reduction_type):
+            return AllScalars(
+                files.get(reduction_type, []),
+                reduction_type,
+                use_npy_cache,
+                incremental,
+                num_workers,
+                use_processes,
+                keep_all_columns,
+            )
+
+        self.scalar = all_scalars("scalar")
+        self.point = self.scalar
+        self.minimum = all_scalars("minimum")
+        self.maximum = all_scalars("maximum")
+        self.norm1 = all_scalars("norm1")
+        self.norm2 = all_scalars("norm2")
+        self.average = all_scalars("average")
+        self.infnorm = all_scalars("infnorm")
 
         # Aliases
         self.max = self.maximum
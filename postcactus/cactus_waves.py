@@ -599,8 +599,10 @@ class WavesDir(mp.MultipoleAllDets):
             # Now we have to prepare the data for the constructor of the base class
             # The data has format:
             # (multipole_l, multipole_m, extraction_radius, timeseries)
+            # We use det.data so that the timeseries that have not been read
+            # yet are read only when needed
             for radius, det in psi4_mpalldets._dets.items():
-                for mult_l, mult_m, tts in det:
+                for mult_l, mult_m, tts in det.data:
                     if mult_l >= l_min:
                         data.append((mult_l, mult_m, radius, tts))
 
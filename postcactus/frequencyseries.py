@@ -25,6 +25,7 @@ import numpy as np
 from scipy.signal import argrelextrema
 
 from postcactus import timeseries
+from postcactus.cactus_ascii_utils import load_ascii
 from postcactus.series import BaseSeries, sample_common
 
 
@@ -32,7 +33,8 @@ def load_FrequencySeries(path, *args, complex_on_two_columns=False, **kwargs):
     """Load a text file as a FrequencySeries.
 
     The backend is np.loadtxt, so you can pass args or kwargs (for example to
-    specify the columns).
+    specify the columns). If only the columns are specified (with usecols), the
+    faster :py:func:`~.load_ascii` is used instead.
 
     :param path: Path of the file to be loaded
     :type path: str
@@ -46,13 +48,16 @@ def load_FrequencySeries(path, *args, complex_on_two_columns=False, **kwargs):
     :rtype: :py:mod:`~.FrequencySeries`
 
     """
+    if args or set(kwargs) - {"usecols"}:
+        data = np.loadtxt(path, unpack=True, ndmin=2, *args, **kwargs)
+    else:
+        data = load_ascii(path, **kwargs).T
+
     if complex_on_two_columns:
-        f, fft_real, fft_imag = np.loadtxt(
-            path, unpack=True, ndmin=2, *args, **kwargs
-        )
+        f, fft_real, fft_imag = data
         fft = fft_real + 1j * fft_imag
     else:
-        f, fft = np.loadtxt(path, unpack=True, ndmin=2, *args, **kwargs)
+        f, fft = data
     return FrequencySeries(f, fft)
 
 
@@ -179,10 +184,12 @@ class FrequencySeries(BaseSeries):
         :rtype: float
 
         """
-        if not self.is_regularly_sampled():
+        df = self._regular_dx()
+
+        if df is None:
             raise ValueError("Frequencyseries is not regularly sampled")
 
-        return self.f[1] - self.f[0]
+        return df
 
     def normalized(self):
         """Return a new frequencyseries with maximum amplitude of 1.
@@ -213,7 +220,7 @@ class FrequencySeries(BaseSeries):
 
         """
         msk = np.abs(self.f) <= f
-        return FrequencySeries(self.f[msk], self.fft[msk])
+        return self._from_validated(self.f[msk], self.fft[msk])
 
     def low_pass(self, f):
         """Remove frequencies higher or equal than f (absolute value)."""
@@ -229,7 +236,7 @@ class FrequencySeries(BaseSeries):
 
         """
         msk = np.abs(self.f) >= f
-        return FrequencySeries(self.f[msk], self.fft[msk])
+        return self._from_validated(self.f[msk], self.fft[msk])
 
     def high_pass(self, f):
         """Remove all the frequencies smaller than f
@@ -248,7 +255,7 @@ class FrequencySeries(BaseSeries):
 
         """
         msk = self.f >= 0
-        return FrequencySeries(self.f[msk], self.fft[msk])
+        return self._from_validated(self.f[msk], self.fft[msk])
 
     def negative_frequencies_remove(self):
         """Remove all the frequencies smaller than 0"""
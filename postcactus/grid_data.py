@@ -23,6 +23,12 @@ from scipy import interpolate, linalg
 
 from postcactus.numerical import BaseNumerical
 
+# When we evaluate data on all the points of a UniformGrid, we do not build the
+# coordinates of all the points at the same time (this would require
+# num_dimensions times the memory of the output). Instead, we work with chunks
+# of approximately this number of points.
+_POINTS_PER_CHUNK = 2 ** 18
+
 
 class UniformGrid:
     """Describes the geometry of a regular rectangular dataset, as well as
@@ -64,7 +70,10 @@ class UniformGrid:
 
     This is the same convention that Carpet has.
 
-    This class is supposed to be immutable.
+    This class is immutable: the arrays describing the grid are read-only,
+    and quantities derived from them (x1, the coordinates, the hash, ...) are
+    computed once and cached. Hence, UniformGrids are cheap to copy and can
+    be used as keys for caches.
 
     :ivar shape:     Number of points in each dimension.
     :type shape:      1d numpy arrary or list of int.
@@ -92,6 +101,28 @@ class UniformGrid:
 
     """
 
+    # UniformGrids are created in large numbers (e.g., when working with
+    # HierarchicalGridData), so we use slots to make them lighter. Names
+    # starting with __ are mangled, like the attributes.
+    __slots__ = (
+        "__shape",
+        "__x0",
+        "__dx",
+        "__num_ghost",
+        "__ref_level",
+        "__component",
+        "__time",
+        "__iteration",
+        "__num_dimensions",
+        "__x1",
+        "__lowest_vertex",
+        "__highest_vertex",
+        "__coordinates_1d",
+        "__coordinates_meshgrid",
+        "__coordinates_same_shape",
+        "__hash",
+    )
+
     def _check_dims(self, var, name):
         """Check that the dimensions are consistent with the shape of the object."""
         if len(var.shape) != 1:
@@ -170,21 +201,54 @@ class UniformGrid:
                     raise ValueError("Incompatible x1 and dx")
 
         if num_ghost is None:
-            self.__num_ghost = np.zeros_like(self.shape)
+            num_ghost = np.zeros_like(self.shape)
         else:
-            self.__num_ghost = np.atleast_1d(np.array(num_ghost, dtype=int))
-            self._check_dims(self.num_ghost, "num_ghost")
+            num_ghost = np.atleast_1d(np.array(num_ghost, dtype=int))
+            self._check_dims(num_ghost, "num_ghost")
 
-        self.__ref_level = int(ref_level)
-        self.__component = int(component)
-        self.__time = None if time is None else float(time)
-        self.__iteration = None if iteration is None else int(iteration)
+        self._set_members(
+            self.shape,
+            self.x0,
+            self.dx,
+            num_ghost,
+            int(ref_level),
+            int(component),
+            None if time is None else float(time),
+            None if iteration is None else int(iteration),
+        )
 
-        # The coordinates are a widely requested property, so the first time the
-        # coordinates 1d are computed, we save them here.
-        self.__coordinates_1d = None
-        # Same with x1
+    def _set_members(
+        self, shape, x0, dx, num_ghost, ref_level, component, time, iteration
+    ):
+        """Set the members of the grid and reset the cached quantities.
+
+        The input has to be already validated and the arrays must not be
+        shared with anything that is not another UniformGrid, because we make
+        them read-only.
+
+        This function is not meant to be called directly.
+
+        """
+        for array in (shape, x0, dx, num_ghost):
+            array.flags.writeable = False
+
+        self.__shape = shape
+        self.__x0 = x0
+        self.__dx = dx
+        self.__num_ghost = num_ghost
+        self.__ref_level = ref_level
+        self.__component = component
+        self.__time = time
+        self.__iteration = iteration
+        self.__num_dimensions = len(shape)
+
+        # The coordinates are a widely requested property, so the first time
+        # they are computed, we save them here. Same with x1 and the hash.
         self.__x1 = None
+        self.__coordinates_1d = None
+        self.__coordinates_meshgrid = None
+        self.__coordinates_same_shape = None
+        self.__hash = None
 
         # The method __contains__ is called extremely often when dealing with
         # HierachicalGridData (because it is used to find which subgrid
@@ -193,13 +257,50 @@ class UniformGrid:
         # is cell centered)
         self.__lowest_vertex = None
         self.__highest_vertex = None
-        # Same considerations for num_dimensions
-        self.__num_dimensions = len(self.shape)
+
+    @classmethod
+    def _from_validated(
+        cls,
+        shape,
+        x0,
+        dx,
+        num_ghost,
+        ref_level=-1,
+        component=-1,
+        time=None,
+        iteration=None,
+    ):
+        """Create a new UniformGrid skipping the checks and the conversions
+        done in the constructor.
+
+        This is used to derive new grids from existing ones. The arrays have to
+        be NumPy arrays with the correct type and dimensions.
+
+        This function is not meant to be called directly.
+
+        """
+        # We do not call __init__
+        grid = cls.__new__(cls)
+        # skipcq: PYL-W0212
+        grid._set_members(
+            shape, x0, dx, num_ghost, ref_level, component, time, iteration
+        )
+        return grid
 
     def __hash__(self):
         """UniformGrid is immutable, we can define an hash as the composition of
-        the hases of the members. This hash is quite slow to compute, so it
-        is not useful for caching small computations.
+        the hases of the members. This hash is computed only once, so it can be
+        used for caching.
+        """
+        if self.__hash is None:
+            self.__hash = self._compute_hash()
+        return self.__hash
+
+    def _compute_hash(self):
+        """Compute the hash of the grid.
+
+        This function is not meant to be called directly.
+
         """
         # We convert all the arrays in tuples (because they are hashable)
         hash_shape = hash(tuple(self.shape))
@@ -235,7 +336,9 @@ class UniformGrid:
     def x1(self):
         # We save x1 because it is computed a lot of times
         if self.__x1 is None:
-            self.__x1 = self.x0 + (self.shape - 1) * self.dx
+            x1 = self.x0 + (self.shape - 1) * self.dx
+            x1.flags.writeable = False
+            self.__x1 = x1
         return self.__x1
 
     @property
@@ -311,7 +414,9 @@ class UniformGrid:
         the grid is cell centered).
         """
         if self.__lowest_vertex is None:
-            self.__lowest_vertex = self.x0 - 0.5 * self.dx
+            lowest_vertex = self.x0 - 0.5 * self.dx
+            lowest_vertex.flags.writeable = False
+            self.__lowest_vertex = lowest_vertex
         return self.__lowest_vertex
 
     @property
@@ -320,7 +425,9 @@ class UniformGrid:
         the grid is cell centered).
         """
         if self.__highest_vertex is None:
-            self.__highest_vertex = self.x1 + 0.5 * self.dx
+            highest_vertex = self.x1 + 0.5 * self.dx
+            highest_vertex.flags.writeable = False
+            self.__highest_vertex = highest_vertex
         return self.__highest_vertex
 
     def indices_to_coordinates(self, indices):
@@ -411,11 +518,15 @@ class UniformGrid:
 
         """
         if self.__coordinates_1d is None:
-            self.__coordinates_1d = [
+            coordinates_1d = tuple(
                 np.linspace(x0, x1, n)
                 for n, x0, x1 in zip(self.shape, self.x0, self.x1)
-            ]
-        return self.__coordinates_1d
+            )
+            for coord in coordinates_1d:
+                coord.flags.writeable = False
+            self.__coordinates_1d = coordinates_1d
+        # We return a new list, so that the cached one cannot be modified
+        return list(self.__coordinates_1d)
 
     def coordinates(self, as_meshgrid=False, as_same_shape=False):
         """Return coordinates of the grid points.
@@ -443,18 +554,23 @@ class UniformGrid:
         if as_meshgrid and as_same_shape:
             raise ValueError("Cannot ask for both meshgrid and shaped array.")
 
+        # The returned arrays are read-only views of the coordinates_1d, so
+        # they do not require additional memory and can be cached.
+
         if as_meshgrid:
-            return np.meshgrid(*self.coordinates_1d)
+            if self.__coordinates_meshgrid is None:
+                self.__coordinates_meshgrid = tuple(
+                    np.meshgrid(*self.coordinates_1d, copy=False)
+                )
+            return list(self.__coordinates_meshgrid)
 
         if as_same_shape:
-            # np.indeces prepares an array in which each element has the value
-            # of its index
-            indices = np.indices(self.shape)
-            # Here we transform the index into coordinate, along each dimension
-            return [
-                indices[dim] * self.dx[dim] + self.x0[dim]
-                for dim in range(0, self.shape.size)
-            ]
+            if self.__coordinates_same_shape is None:
+                self.__coordinates_same_shape = tuple(
+                    np.broadcast_to(coord, self.shape)
+                    for coord in np.ix_(*self.coordinates_1d)
+                )
+            return list(self.__coordinates_same_shape)
 
         return self.coordinates_1d
 
@@ -464,29 +580,33 @@ class UniformGrid:
 
         # We need this infrastructure to slice GridData
 
-        copied = self.copy()
+        extended_dims = self.extended_dimensions
 
-        # We have to save this, otherwise it would be recomputed at every line,
-        # affecting the result.
-        extended_dims = copied.extended_dimensions
-
-        copied.__shape = copied.__shape[extended_dims]
-        copied.__x0 = copied.__x0[extended_dims]
-        copied.__dx = copied.__dx[extended_dims]
-        copied.__num_ghost = copied.__num_ghost[extended_dims]
-        return copied
+        return self._from_validated(
+            self.shape[extended_dims],
+            self.x0[extended_dims],
+            self.dx[extended_dims],
+            self.num_ghost[extended_dims],
+            ref_level=self.ref_level,
+            component=self.component,
+            time=self.time,
+            iteration=self.iteration,
+        )
 
     def ghost_zones_removed(self):
         """Return a new UniformGrid with ghostzones removed"""
-        copied = self.copy()
-
         # We remove twice the number of ghost zones because there are
-        # lower and upper ghostzones
-        copied.__shape = self.shape - 2 * self.num_ghost
-        # We "push x0 inside the grid"
-        copied.__x0 = copied.__x0 + self.num_ghost * self.dx
-        copied.__num_ghost = np.zeros_like(copied.shape)
-        return copied
+        # lower and upper ghostzones. Then, we "push x0 inside the grid".
+        return self._from_validated(
+            self.shape - 2 * self.num_ghost,
+            self.x0 + self.num_ghost * self.dx,
+            self.dx,
+            np.zeros_like(self.shape),
+            ref_level=self.ref_level,
+            component=self.component,
+            time=self.time,
+            iteration=self.iteration,
+        )
 
     def shifted(self, shift):
         """Return a new UniformGrid with coordinates shifted by some amount
@@ -495,31 +615,49 @@ class UniformGrid:
         shift = np.asarray(shift)
         self._check_dims(shift, "shift")
 
-        copied = self.copy()
-
         # We only need to shift x0 because x1 is computed from x0 using dx
-        copied.__x0 = copied.__x0 + shift
-        return copied
+        return self._from_validated(
+            self.shape,
+            self.x0 + shift,
+            self.dx,
+            self.num_ghost,
+            ref_level=self.ref_level,
+            component=self.component,
+            time=self.time,
+            iteration=self.iteration,
+        )
 
     def copy(self):
-        """Return a deep copy.
+        """Return a copy.
+
+        Since UniformGrid is immutable, the copy shares the (read-only) arrays
+        and the cached quantities with self.
 
-        :returns:  Deep copy of the UniformGrid
+        :returns:  Copy of the UniformGrid
         :rtype:    :py:class:`~.UniformGrid`
         """
-        return type(self)(
+        copied = self._from_validated(
             self.shape,
             self.x0,
-            dx=self.dx,
-            x1=self.x1,
+            self.dx,
+            self.num_ghost,
             ref_level=self.ref_level,
             component=self.component,
-            num_ghost=self.num_ghost,
             time=self.time,
             iteration=self.iteration,
         )
+        copied.__x1 = self.__x1
+        copied.__lowest_vertex = self.__lowest_vertex
+        copied.__highest_vertex = self.__highest_vertex
+        copied.__coordinates_1d = self.__coordinates_1d
+        copied.__coordinates_meshgrid = self.__coordinates_meshgrid
+        copied.__coordinates_same_shape = self.__coordinates_same_shape
+        copied.__hash = self.__hash
+        return copied
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
         # Time and iterations can be None, so we check them independently
@@ -565,6 +703,48 @@ Iteration        = {self.iteration}
 """
 
 
+def _evaluate_on_grid_in_chunks(function, grid):
+    """Evaluate function on all the points of grid, working on chunks along
+    the first dimension.
+
+    function has to take an array with shape (..., num_dimensions) with the
+    coordinates of the points and return an array with shape (...).
+
+    This function is not meant to be called directly.
+
+    :param function: Function to evaluate.
+    :type function: callable
+    :param grid: Grid with the points where to evaluate function.
+    :type grid: :py:class:`~.UniformGrid`
+
+    :returns: Values of function on the grid.
+    :rtype: numpy array with the same shape as grid
+
+    """
+    coordinates_1d = grid.coordinates_1d
+    points_per_row = int(np.prod(grid.shape[1:]))
+    rows_per_chunk = max(1, _POINTS_PER_CHUNK // points_per_row)
+
+    ret = None
+
+    for start in range(0, grid.shape[0], rows_per_chunk):
+        rows = slice(start, start + rows_per_chunk)
+        # We build the points from the sparse coordinates only for this chunk
+        points = np.stack(
+            np.broadcast_arrays(
+                *np.ix_(coordinates_1d[0][rows], *coordinates_1d[1:])
+            ),
+            axis=-1,
+        )
+        values = np.asarray(function(points))
+        # We find the type of the output from the first chunk
+        if ret is None:
+            ret = np.empty(grid.shape, dtype=values.dtype)
+        ret[rows] = values
+
+    return ret
+
+
 def common_bounding_box(grids):
     """Return corners of smallest common bounding box of regular grids.
 
@@ -776,6 +956,8 @@ class UniformGridData(BaseNumerical):
                 f"grid and data shapes differ {grid.shape} vs {data.shape}"
             )
 
+        # UniformGrid is immutable, so copying it is cheap (the arrays and the
+        # cached quantities are shared)
         self.grid = grid.copy()
         self.data = data.copy()
 
@@ -1090,11 +1272,14 @@ class UniformGridData(BaseNumerical):
                 raise ValueError(
                     "Incompatible dimensions between input and self"
                 )
-            # The way we want the coordinates is like as an array with the same
-            # shape of the grid and with values the coordines (as arrays). This
-            # is similar to as_same_shape, but the coordinates have to be the
-            # value, and not the first index.
-            x = np.moveaxis(x.coordinates(as_same_shape=True), 0, -1)
+            # We evaluate the grid in chunks, so that we never store the
+            # coordinates of all the points at the same time.
+            return _evaluate_on_grid_in_chunks(
+                lambda points: self.evaluate_with_spline(
+                    points, ext=ext, piecewise_constant=piecewise_constant
+                ),
+                x,
+            )
 
         x = np.atleast_1d(np.array(x))
         # x is now a new copy
@@ -1114,7 +1299,7 @@ class UniformGridData(BaseNumerical):
             # level
             old_shape = x.shape
             # np.prod(old_shape[:-1]) returns the total number of points
-            num_points = np.prod(old_shape[:-1], dtype=np.int)
+            num_points = np.prod(old_shape[:-1], dtype=int)
             # If we have only one point, we must transform it into a list that we
             # loop over
             new_shape = (num_points, old_shape[-1])
@@ -1349,13 +1534,18 @@ class UniformGridData(BaseNumerical):
         if self.grid == new_grid:
             return self.copy()
 
-        return type(self)(
-            new_grid,
-            self.evaluate_with_spline(
-                new_grid, ext=ext, piecewise_constant=piecewise_constant
-            ),
+        new_data = self.evaluate_with_spline(
+            new_grid, ext=ext, piecewise_constant=piecewise_constant
         )
 
+        # The splines always work in double precision. We do not want to
+        # silently change the precision of floating point data (e.g., if it
+        # was read as float32 to save memory).
+        if np.issubdtype(self.dtype, np.inexact):
+            new_data = new_data.astype(self.dtype, copy=False)
+
+        return type(self)(new_grid, new_data)
+
     def is_complex(self):
         """Return whether the data is complex.
 
@@ -1363,7 +1553,9 @@ class UniformGridData(BaseNumerical):
         :rtype:   bool
 
         """
-        return issubclass(self.data.dtype.type, complex)
+        # We do not use issubclass(dtype.type, complex) because it is False
+        # for complex64
+        return np.iscomplexobj(self.data)
 
     @property
     def dtype(self):
@@ -1875,15 +2067,22 @@ class UniformGridData(BaseNumerical):
         return type(self)(grid, fft_data)
 
 
-def sample_function_from_uniformgrid(function, grid):
+def sample_function_from_uniformgrid(function, grid, vectorized=False):
     """Create a regular dataset by sampling a scalar function of the form
     f(x, y, z, ...) on a grid.
 
+    If vectorized is True, function is assumed to work with NumPy arrays and to
+    support broadcasting. It is called once with sparse coordinates (as in
+    ``np.ogrid``), which is much faster than calling it on every point.
+
     :param function:  The function to sample.
     :type function:   A callable that takes as many arguments as the number
                       of dimensions (in shape).
     :param grid:   Grid over which to sample the function.
     :type grid:    :py:class:`~.UniformGrid`
+    :param vectorized: Whether function can be called with arrays that have
+                       to be broadcast together.
+    :type vectorized: bool
     :returns:     Sampled data.
     :rtype:       :py:class:`~.UniformGridData`
 
@@ -1891,13 +2090,21 @@ def sample_function_from_uniformgrid(function, grid):
     if not isinstance(grid, UniformGrid):
         raise TypeError("grid has to be a UniformGrid")
 
+    # We never need the coordinates of all the points: we pass the sparse
+    # coordinates and let NumPy broadcast them.
+    sparse_coordinates = np.ix_(*grid.coordinates_1d)
+
+    if not vectorized:
+        function = np.vectorize(function)
+
     # The try except block checks that the function supplied has the correct
     # signature for the grid provided. If you try to pass a function that takes
     # too many of too few arguments, you will get a TypeError
 
     try:
         ret = UniformGridData(
-            grid, np.vectorize(function)(*grid.coordinates(as_same_shape=True))
+            grid,
+            np.broadcast_to(function(*sparse_coordinates), grid.shape),
         )
     except TypeError as type_err:
         # Too few arguments, type_err = missing N required positional arguments: ....
@@ -1919,13 +2126,18 @@ def sample_function_from_uniformgrid(function, grid):
     return ret
 
 
-def sample_function(function, shape, x0, x1, *args, **kwargs):
+def sample_function(
+    function, shape, x0, x1, *args, vectorized=False, **kwargs
+):
     """Create a regular dataset by sampling a scalar function of the form
     f(x, y, z, ...) on a grid.
 
     You cannot use this function to initialize grids with flat dimensions
     (dimensions with only one grid point).
 
+    If vectorized is True, function is assumed to work with NumPy arrays and to
+    support broadcasting (see :py:func:`~.sample_function_from_uniformgrid`).
+
     :param function:  The function to sample.
     :type function:   A callable that takes as many arguments as the number
                       of dimensions (in shape).
@@ -1935,12 +2147,17 @@ def sample_function(function, shape, x0, x1, *args, **kwargs):
     :type x0:     1d numpy array or list of float
     :param x0:    Maximum corner of regular sample grid.
     :type x0:     1d numpy array or list of float
+    :param vectorized: Whether function can be called with arrays that have
+                       to be broadcast together.
+    :type vectorized: bool
     :returns:     Sampled data.
     :rtype:       :py:class:`~.UniformGridData`
 
     """
     grid = UniformGrid(shape, x0=x0, x1=x1, *args, **kwargs)
-    return sample_function_from_uniformgrid(function, grid)
+    return sample_function_from_uniformgrid(
+        function, grid, vectorized=vectorized
+    )
 
 
 class HierarchicalGridData(BaseNumerical):
@@ -1998,30 +2215,129 @@ class HierarchicalGridData(BaseNumerical):
         }
 
     @staticmethod
-    def _fill_grid_with_components(grid, components):
-        """Given a grid, try to fill it with the components Return a UniformGridData
-        and the indices that actually were used in filling the grid
+    def _index_boxes(grid, components):
+        """Return the indices of the lowest and highest corners (the highest
+        excluded) of the components in grid.
 
+        :returns: Two arrays with shape (num_components, num_dimensions)
+        :rtype: tuple of numpy arrays of int
         """
+        # We find the index corresponding to x0 and x1 of the components
+        index_x0 = np.array(
+            [((comp.x0 - grid.x0) / grid.dx + 0.5) for comp in components]
+        ).astype(np.int64)
+        index_x1 = index_x0 + np.array([comp.shape for comp in components])
+        return index_x0, index_x1
+
+    @staticmethod
+    def _fill_grid_with_components(grid, components):
+        """Given a grid, fill it with the components and return a
+        UniformGridData.
+
+        Points that are not covered by any component are set to zero.
 
-        # For filling the data, we prepare the array first, and we fill it with
-        # the single components. We fill a second array which we use to keep
-        # track of what indices have been filled with the input data.
+        """
         data = np.zeros(grid.shape, dtype=components[0].data.dtype)
-        indices_used = np.zeros(grid.shape, dtype=components[0].data.dtype)
 
-        for comp in components:
-            # We find the index corresponding to x0 and x1 of the component
-            index_x0 = ((comp.x0 - grid.x0) / grid.dx + 0.5).astype(np.int32)
-            index_x1 = index_x0 + comp.shape
+        index_x0, index_x1 = HierarchicalGridData._index_boxes(
+            grid, components
+        )
+
+        for comp, comp_index_x0, comp_index_x1 in zip(
+            components, index_x0, index_x1
+        ):
             slicer = tuple(
                 slice(index_j0, index_j1)
-                for index_j0, index_j1 in zip(index_x0, index_x1)
+                for index_j0, index_j1 in zip(comp_index_x0, comp_index_x1)
             )
             data[slicer] = comp.data
-            indices_used[slicer] = np.ones(comp.data.shape)
 
-        return UniformGridData(grid, data), indices_used
+        return UniformGridData(grid, data)
+
+    @staticmethod
+    def _boxes_overlap(index_x0, index_x1):
+        """Return whether any two of the given boxes overlap.
+
+        This function is not meant to be called directly.
+
+        Two boxes overlap if their intervals overlap along all the dimensions.
+        We sort the boxes along the first dimension and sweep through them,
+        keeping only the boxes whose interval along the first dimension is
+        still open. This way, each box is compared only with the boxes that
+        overlap with it along the first dimension, and we never need arrays
+        with one element per pair of boxes.
+
+        :param index_x0: Lower corners of the boxes (included), one per row
+        :type index_x0: 2D numpy array of int
+        :param index_x1: Upper corners of the boxes (excluded), one per row
+        :type index_x1: 2D numpy array of int
+
+        :returns: True if at least two boxes overlap
+        :rtype: bool
+        """
+        order = np.argsort(index_x0[:, 0], kind="stable")
+        index_x0, index_x1 = index_x0[order], index_x1[order]
+
+        active = np.empty(0, dtype=np.int64)
+        for index, (box_x0, box_x1) in enumerate(zip(index_x0, index_x1)):
+            # Boxes that end before this one starts cannot overlap with this
+            # one, nor with the ones that follow
+            active = active[index_x1[active, 0] > box_x0[0]]
+            if np.any(
+                np.all(
+                    np.maximum(index_x0[active], box_x0)
+                    < np.minimum(index_x1[active], box_x1),
+                    axis=-1,
+                )
+            ):
+                return True
+            active = np.append(active, index)
+
+        return False
+
+    @staticmethod
+    def _components_cover_grid(grid, components):
+        """Return whether the components fill the entire grid.
+
+        We work with the number of points covered by each component: if the
+        components do not overlap, they fill the grid if and only if the sum of
+        their points is the same as the number of points in the grid. Only if
+        there are overlaps, we have to keep track of what points are covered.
+
+        :returns: True if all the points of grid are in some component.
+        :rtype: bool
+        """
+        index_x0, index_x1 = HierarchicalGridData._index_boxes(
+            grid, components
+        )
+
+        # We only consider the points that are in the grid
+        index_x0 = np.clip(index_x0, 0, grid.shape)
+        index_x1 = np.clip(index_x1, 0, grid.shape)
+
+        num_points_grid = np.prod(grid.shape, dtype=np.int64)
+        num_points_components = np.prod(
+            index_x1 - index_x0, axis=1, dtype=np.int64
+        ).sum()
+
+        if num_points_components < num_points_grid:
+            return False
+
+        if not HierarchicalGridData._boxes_overlap(index_x0, index_x1):
+            return num_points_components == num_points_grid
+
+        # Here we have overlaps, so we have to check point by point. We use
+        # a boolean mask, which is the smallest type available.
+        covered = np.zeros(grid.shape, dtype=bool)
+        for comp_index_x0, comp_index_x1 in zip(index_x0, index_x1):
+            covered[
+                tuple(
+                    slice(index_j0, index_j1)
+                    for index_j0, index_j1 in zip(comp_index_x0, comp_index_x1)
+                )
+            ] = True
+
+        return covered.all()
 
     def _try_merge_components(self, components):
         """Try to merge a list of UniformGridData instances into one, assuming they all
@@ -2062,12 +2378,12 @@ class HierarchicalGridData(BaseNumerical):
             [comp.grid for comp in components_no_ghosts]
         )
 
-        merged_grid_data, indices_used = self._fill_grid_with_components(
-            grid, components_no_ghosts
-        )
-
-        if np.amin(indices_used) == 1:
-            return [merged_grid_data]
+        # We check first if the components can be merged, so that we don't
+        # fill the data when we cannot
+        if self._components_cover_grid(grid, components_no_ghosts):
+            return [
+                self._fill_grid_with_components(grid, components_no_ghosts)
+            ]
 
         return components
 
@@ -2334,11 +2650,14 @@ class HierarchicalGridData(BaseNumerical):
         """
 
         if isinstance(x, UniformGrid):
-            # The way we want the coordinates is like as an array with the same
-            # shape of the grid and with values the coordines (as arrays). This
-            # is similar to as_same_shape, but the coordinates have to be the
-            # value, and not the first index.
-            x = np.moveaxis(x.coordinates(as_same_shape=True), 0, -1)
+            # We evaluate the grid in chunks, so that we never store the
+            # coordinates of all the points at the same time.
+            return _evaluate_on_grid_in_chunks(
+                lambda points: self.evaluate_with_spline(
+                    points, ext=ext, piecewise_constant=piecewise_constant
+                ),
+                x,
+            )
 
         # If we consider the case that points is a single point
         points_arr = np.array(x)
@@ -2400,8 +2719,13 @@ class HierarchicalGridData(BaseNumerical):
         Optionally data from coarser refinement levels is resampled too (with a
         multilinear resampling)
 
+        The levels are combined starting from the coarsest one, which is
+        prolonged to the finest resolution and then overwritten by the finer
+        levels where those are available. This is done with array operations,
+        so it is fast, but it requires the refinement factors to be integers.
+
         For most practical purposes, using this function is an overkill.
-        This can be a very expensive operation and require a lot of memory.
+        The output grid can require a lot of memory.
         Prefer to_UniformGridData when possible.
 
         """
@@ -2417,16 +2741,124 @@ class HierarchicalGridData(BaseNumerical):
         new_shape = ((self.x1 - self.x0) / new_dx + 1.5).astype(np.int64)
         new_shape = np.array([s if s > 0 else 1 for s in new_shape])
 
-        return self.to_UniformGridData(
+        grid = UniformGrid(
             new_shape,
             self.x0,
-            x1=None,
             dx=new_dx,
             time=self.time,
             iteration=self.iteration,
-            resample=resample,
         )
 
+        # We work level by level, from the coarsest to the finest. Each
+        # component is prolonged to the resolution of the new grid and written
+        # in its footprint with a slice assignment, overwriting what was there
+        # from coarser levels. The result is the same as evaluating each point
+        # on the finest level that contains it, but we never loop over points.
+        data = np.zeros(grid.shape, dtype=self.dtype)
+
+        for ref_level in self.refinement_levels:
+            # When looking for points, the first component that contains them
+            # wins, so here the first one has to be written last.
+            for comp in reversed(self[ref_level]):
+                slicer, prolonged_data = self._prolonged_to_grid(
+                    comp, grid, resample=resample
+                )
+                if ref_level == self.num_coarsest_level and any(
+                    (sl.stop - sl.start) != num_points
+                    for sl, num_points in zip(slicer, grid.shape)
+                ):
+                    raise ValueError("Coarsest level does not cover the grid")
+                if prolonged_data is not None:
+                    data[slicer] = prolonged_data
+
+        return UniformGridData(grid, data)
+
+    @staticmethod
+    def _prolonged_to_grid(grid_data, grid, resample=False):
+        """Prolong grid_data to grid, which is assumed to have grid spacing
+        that is an integer fraction of the one of grid_data.
+
+        The prolongation is done one dimension at the time, either taking the
+        nearest neighbors (repeating the data) or with linear interpolation.
+        Points that are in the last half cell are set to the value of the
+        closest point, as in :py:meth:`~.UniformGridData.evaluate_with_spline`.
+
+        This function is not meant to be called directly.
+
+        :param grid_data: Data to prolong.
+        :type grid_data: :py:class:`~.UniformGridData`
+        :param grid: Grid over which to prolong the data.
+        :type grid: :py:class:`~.UniformGrid`
+        :param resample: Whether to use linear interpolation or the nearest
+                         neighbors.
+        :type resample: bool
+
+        :returns: Slicer of grid that contains grid_data (the footprint) and
+                  the prolonged data on the footprint (None if the footprint
+                  is empty).
+        :rtype: tuple of slices and numpy array
+
+        """
+        # We have to use nearest neighbors if there are flat dimensions, as
+        # evaluate_with_spline does.
+        linear = resample and (
+            grid_data.num_dimensions == grid_data.num_extended_dimensions
+        )
+
+        slicer = []
+        prolonged_data = grid_data.data
+
+        for dim, coords in enumerate(grid.coordinates_1d):
+            # The footprint is made by the points of grid in
+            # [lowest_vertex, highest_vertex). coords are sorted, so we
+            # can find the extrema with a binary search.
+            start, stop = np.searchsorted(
+                coords,
+                [
+                    grid_data.grid.lowest_vertex[dim],
+                    grid_data.grid.highest_vertex[dim],
+                ],
+            )
+            slicer.append(slice(start, stop))
+
+            if start == stop:
+                prolonged_data = None
+                continue
+
+            if prolonged_data is None:
+                continue
+
+            num_points = grid_data.shape[dim]
+            # Fractional index of the points of the footprint on grid_data
+            local_indices = (coords[start:stop] - grid_data.x0[dim]) / (
+                grid_data.dx[dim]
+            )
+
+            if not linear or num_points == 1:
+                nearest = np.clip(
+                    np.floor(local_indices + 0.5), 0, num_points - 1
+                ).astype(np.int64)
+                prolonged_data = np.take(prolonged_data, nearest, axis=dim)
+                continue
+
+            left = np.clip(np.floor(local_indices), 0, num_points - 2).astype(
+                np.int64
+            )
+            weights = np.clip(local_indices - left, 0, 1)
+            # We do not want to promote single precision data to double
+            if np.issubdtype(grid_data.dtype, np.inexact):
+                weights = weights.astype(grid_data.data.real.dtype)
+            # We reshape weights so that it can be broadcast along dim
+            weights_shape = [1] * grid_data.num_dimensions
+            weights_shape[dim] = len(weights)
+            weights = weights.reshape(weights_shape)
+
+            prolonged_data = (1 - weights) * np.take(
+                prolonged_data, left, axis=dim
+            ) + weights * np.take(prolonged_data, left + 1, axis=dim)
+
+        return tuple(slicer), prolonged_data
+
     def _apply_to_self(self, f, *args, **kwargs):
         """Apply the method f to self, modifying self.
         This is used to transform the commands from returning an object
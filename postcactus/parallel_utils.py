@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2020 Gabriele Bozzola, Wolfgang Kastaun
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, see <https://www.gnu.org/licenses/>.
+
+""" This module provides a helper function to evaluate a function on many
+items concurrently, with threads or processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _map_in_pool(function, items, num_workers=1, use_processes=False):
+    """Return ``[function(item) for item in items]``, evaluating function in a
+    pool of num_workers threads (or processes, if use_processes is True).
+
+    The results are in the same order as items. If num_workers is 1, or if
+    there is only one item, no pool is created. If num_workers is None, the
+    number of workers is chosen by :py:mod:`concurrent.futures` (based on the
+    number of CPUs).
+
+    With processes, function and items have to be picklable, and the changes
+    that function makes to the items are not seen by the caller.
+
+    This function is not meant to be called directly.
+
+    :param function: Function to evaluate on each item.
+    :type function: callable
+    :param items: Arguments of function.
+    :type items: iterable
+    :param num_workers: Number of threads or processes.
+    :type num_workers: int or None
+    :param use_processes: Whether to use processes instead of threads.
+    :type use_processes: bool
+
+    :returns: Results of function on each item.
+    :rtype: list
+
+    """
+    if num_workers is not None and num_workers < 1:
+        raise ValueError("num_workers has to be a positive integer or None")
+
+    items = list(items)
+
+    if num_workers == 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    with executor(max_workers=num_workers) as pool:
+        return list(pool.map(function, items))
@@ -27,6 +27,11 @@ from scipy import integrate, interpolate, signal
 from postcactus.attr_dict import AttributeDictionary
 from postcactus.numerical import BaseNumerical
 
+# When we resample with local interpolation, we do not process all the new
+# points at the same time (this would require several temporary arrays as large
+# as the output). Instead, we work with chunks of this number of points.
+_POINTS_PER_CHUNK = 2 ** 18
+
 
 # Note, we test this class testing its derived class TimeSeries
 class BaseSeries(BaseNumerical):
@@ -137,8 +142,16 @@ class BaseSeries(BaseNumerical):
             x_array = self._return_array_if_monotonic(x_array)
 
         # The copy is because we don't want to change the input values
-        self.__data_x = x_array.copy()
-        self.__data_y = y_array.copy()
+        self.__initialize(x_array.copy(), y_array.copy())
+
+    def __initialize(self, x_array, y_array):
+        """Set the data and the initial state of the series.
+
+        This function is not meant to be called directly.
+
+        """
+        self.__data_x = x_array
+        self.__data_y = y_array
 
         # The data is stored in the members self.data_x and self.data_y. We
         # will never access these directly. We have setters and getters to that
@@ -152,6 +165,75 @@ class BaseSeries(BaseNumerical):
         # that they are attributes of the class and they are not uninitialized
         self.spline_real = None
         self.spline_imag = None
+        # Splines computed with different parameters (k, s) are saved here,
+        # so that we can switch among them without recomputing them. Copies of
+        # the series take the same splines, together with immutable copies of
+        # the x and y that they were computed from (see copy), so that they
+        # can check that their data was not modified before using them.
+        self._splines = {}
+        self.__spline_data = None
+
+        # Checking if the series is regularly sampled is expensive, so we
+        # save the result as a tuple with the x that was checked (as an
+        # immutable array) and the step, or None if the series is not regular
+        # (see _regular_dx). None means that we have not checked yet. The
+        # result is used only if x still has the same elements as the checked
+        # one, so that modifying x in place is detected.
+        self.__regularly_sampled = None
+
+    @classmethod
+    def _from_validated(cls, x, y):
+        """Return a new series with the given x and y, without checking them
+        and without copying them.
+
+        This function is not meant to be called directly.
+
+        This is used internally when the data is known to be good. x and y are
+        used as they are, so arrays that are shared with other series have to
+        be immutable (see :py:func:`~._shared_view`). Only the length of x
+        is checked, because an empty series is an error (e.g., when all the
+        points are filtered out).
+
+        :param x: Independent variable, monotonically increasing
+        :type x:  1D numpy array
+        :param y: Dependent variable, with the same length as x
+        :type y:  1D numpy array
+
+        :returns: New series
+        :rtype:   :py:class:`~.BaseSeries` or derived class
+
+        """
+        if len(x) == 0:
+            raise ValueError("Trying to construct empty Series.")
+
+        series = cls.__new__(cls)
+        series.__initialize(x, y)
+        return series
+
+    def _with_same_x(self, y):
+        """Return a new series with the same x as this one and the given y.
+
+        This function is not meant to be called directly.
+
+        x is copied, unless it cannot be modified (see
+        :py:func:`~._shared_view`). The same is done with y, if it shares
+        memory with the y of this series.
+
+        :param y: Dependent variable, with the same length as x
+        :type y:  1D numpy array
+
+        :returns: New series
+        :rtype:   :py:class:`~.BaseSeries` or derived class
+
+        """
+        y = self._make_array(y)
+        if np.may_share_memory(y, self.y):
+            y = _shared_view(y)
+        series = self._from_validated(_shared_view(self.x), y)
+        # x is the same, so we know whether it is regularly sampled (the
+        # result is still checked against the new x when it is used)
+        series.__regularly_sampled = self.__regularly_sampled
+        return series
 
     @property
     def x(self):
@@ -171,8 +253,9 @@ class BaseSeries(BaseNumerical):
         # z will change (if we don't copy)
         self.__data_x = x_array.copy()
 
-        # Invalidate the spline
+        # Invalidate the spline and the regular sampling check
         self.invalid_spline = True
+        self.__regularly_sampled = None
 
     @property
     def y(self):
@@ -239,13 +322,21 @@ class BaseSeries(BaseNumerical):
         """
         return self.x[-1]
 
-    def is_regularly_sampled(self):
-        """Return whether the series is regularly sampled.
+    def _regular_dx(self):
+        """Return the step of x if the series is regularly sampled, otherwise
+        return None.
 
         If the series is only one point, an error is raised.
 
-        :returns:  Is the series regularly sampled?
-        :rtype:    bool
+        The result is saved together with an immutable copy of x (or with x
+        itself, if it cannot be modified), and it is reused as long as x has
+        the same elements. Comparing the elements is much faster than checking
+        the step again.
+
+        This function is not meant to be called directly.
+
+        :returns: Step of x, or None if the series is not regularly sampled
+        :rtype: float or None
         """
         if len(self) == 1:
             raise RuntimeError(
@@ -253,9 +344,31 @@ class BaseSeries(BaseNumerical):
                 "it does not make sense to compute dx"
             )
 
+        if self.__regularly_sampled is not None:
+            checked_x, regular_dx = self.__regularly_sampled
+            if _has_same_elements(self.x, checked_x):
+                return regular_dx
+
         dx = self.x[1:] - self.x[:-1]
+        is_regular = np.allclose(dx, dx[0], atol=1e-14)
+        self.__regularly_sampled = (
+            _immutable_copy(self.x),
+            dx[0] if is_regular else None,
+        )
+
+        return self.__regularly_sampled[1]
 
-        return np.allclose(dx, dx[0], atol=1e-14)
+    def is_regularly_sampled(self):
+        """Return whether the series is regularly sampled.
+
+        If the series is only one point, an error is raised.
+
+        The result is saved and recomputed only when x changes.
+
+        :returns:  Is the series regularly sampled?
+        :rtype:    bool
+        """
+        return self._regular_dx() is not None
 
     def __len__(self):
         """The number of data points."""
@@ -276,11 +389,11 @@ class BaseSeries(BaseNumerical):
 
     def x_at_abs_maximum_y(self):
         """Return the value of x when abs(y) is maximum."""
-        return self.x[np.argmax(np.abs(self.y))]
+        return self.x[_chunked_abs_argextremum(self.y, np.argmax)]
 
     def x_at_abs_minimum_y(self):
         """Return the value of x when abs(y) is minimum."""
-        return self.x[np.argmin(np.abs(self.y))]
+        return self.x[_chunked_abs_argextremum(self.y, np.argmin)]
 
     def _make_spline(self, *args, k=3, s=0, **kwargs):
         """Private function to make spline representation of the data.
@@ -291,6 +404,10 @@ class BaseSeries(BaseNumerical):
         splines. Even values of k should be avoided especially with small s
         values. 1 <= k <= 5
 
+        Splines are saved for each pair of (k, s) and are reused until the
+        data changes. Splines computed with additional arguments are not
+        saved.
+
         :param k: Order of the spline representation
         :type k:  int
         :param s: Smoothing of the spline
@@ -302,17 +419,54 @@ class BaseSeries(BaseNumerical):
                 f"Too few points to compute a spline of order {k}"
             )
 
-        self.spline_real = interpolate.splrep(
-            self.x, self.y.real, k=k, s=s, *args, **kwargs
-        )
+        if self.invalid_spline and not self.__has_spline_data():
+            # The data changed, so the saved splines are not good anymore
+            self._splines = {}
+            self.__spline_data = None
+
+        save_spline = not (args or kwargs)
+
+        if save_spline and (k, s) in self._splines:
+            self.spline_real, self.spline_imag = self._splines[(k, s)]
+            self.invalid_spline = False
+            return
+
+        def make_immutable_spline(y):
+            spline = interpolate.splrep(self.x, y, k=k, s=s, *args, **kwargs)
+            # The splines are shared among copies, so we make sure that they
+            # cannot be modified
+            for array in spline[:2]:
+                array.setflags(write=False)
+            return spline
+
+        self.spline_real = make_immutable_spline(self.y.real)
 
         if self.is_complex():
-            self.spline_imag = interpolate.splrep(
-                self.x, self.y.imag, k=k, s=s, *args, **kwargs
-            )
+            self.spline_imag = make_immutable_spline(self.y.imag)
+        else:
+            self.spline_imag = None
+
+        if save_spline:
+            self._splines[(k, s)] = (self.spline_real, self.spline_imag)
 
         self.invalid_spline = False
 
+    def __has_spline_data(self):
+        """Return whether the saved splines were computed from the current
+        data, as it was when the series was copied.
+
+        This function is not meant to be called directly.
+
+        :returns: Whether the data is the same
+        :rtype:   bool
+        """
+        if self.__spline_data is None:
+            return False
+        spline_x, spline_y = self.__spline_data
+        return _has_same_elements(self.x, spline_x) and _has_same_elements(
+            self.y, spline_y
+        )
+
     def evaluate_with_spline(self, x, ext=2):
         """Evaluate the spline on the points x.
 
@@ -357,32 +511,27 @@ class BaseSeries(BaseNumerical):
     def __call__(self, x):
         """Evaluate the spline on the points x. If the value is outside the
         range, a ValueError will be raised.
+
+        Points that are in the series (within a tolerance of 1e-14) are not
+        evaluated with the spline, the value of y is returned.
         """
-        # We call the spline only if we need to.
+        x_array = np.atleast_1d(x)
+
+        # We find the points that are already in the series
+        closest = _closest_indices(self.x, x_array)
+        hits = np.abs(self.x[closest] - x_array) <= 1e-14
+
+        ret = np.empty(len(x_array), dtype=self.y.dtype)
+        ret[hits] = self.y[closest[hits]]
 
-        # TODO: This is not a Pythonic way to write this function.
-        #       The main problem is that it is is not vectorized.
-        #       It is also not efficient, we are going over the array a lot
-        #       of times, re-checking the same elements over and over. Also,
-        #       we are not considering the floating point arithmetic, we should
-        #       allow for some tolerance.
+        # We call the spline only if we need to, once for all the points.
+        misses = ~hits
+        if misses.any():
+            ret[misses] = self.evaluate_with_spline(x_array[misses], ext=2)
 
-        # First we consider the scalar case
+        # Scalar input, scalar output
         if not hasattr(x, "__len__"):
-            if x in self.x:
-                return self.y[np.searchsorted(self.x, x)]
-            return self.evaluate_with_spline(x, ext=2)
-
-        ret = np.zeros(len(x), dtype=type(self.y[0]))
-        # Hash-maps are more efficient than searching every time through the
-        # array, but there is some overhead cost in defining the dictionary.
-        # Experiments show that it is sill more performant.
-        dic_data = dict(zip(self.x, self.y))
-        for index, elem in enumerate(x):
-            if elem in self.x:
-                ret[index] = dic_data[elem]
-            else:
-                ret[index] = self.evaluate_with_spline(elem, ext=2)
+            return ret[0]
 
         return ret
 
@@ -399,17 +548,28 @@ class BaseSeries(BaseNumerical):
         # We don't use the setters
         copied.__data_x = self.__data_x.copy()
         copied.__data_y = self.__data_y.copy()
-        if not self.invalid_spline:
-            # splines are tuples, with a direct call to the function
-            # tuple() we make a deep copy
-            copied.spline_real = tuple(self.spline_real)
-            if self.is_complex():
-                copied.spline_imag = tuple(self.spline_imag)
-            copied.invalid_spline = False
+        copied.__regularly_sampled = self.__regularly_sampled
+        # Splines cannot be modified, so we can share them. The copy has its
+        # own dictionary, and it checks that its data is still the one of the
+        # splines before using them, because its data may be modified in place.
+        copied.spline_real = self.spline_real
+        copied.spline_imag = self.spline_imag
+        copied._splines = {}
+        copied.__spline_data = None
         copied.invalid_spline = True
+        if self._splines and not self.invalid_spline:
+            if not self.__has_spline_data():
+                self.__spline_data = (
+                    _immutable_copy(self.x),
+                    _immutable_copy(self.y),
+                )
+            copied._splines = dict(self._splines)
+            copied.__spline_data = self.__spline_data
         return copied
 
-    def resampled(self, new_x, ext=2, piecewise_constant=False):
+    def resampled(
+        self, new_x, ext=2, piecewise_constant=False, method="spline"
+    ):
         """Return a new series resampled from this to new_x.
 
         You can specify the details of the spline with the method make_spline.
@@ -419,6 +579,17 @@ class BaseSeries(BaseNumerical):
         This may be a good choice for data with large discontinuities, where the
         splines are ineffective.
 
+        Other methods can be selected with the keyword method:
+
+        - ``spline`` (default): global spline (see make_spline).
+        - ``nearest``: nearest neighbor (same as piecewise_constant=True).
+        - ``linear``: linear interpolation.
+        - ``local_cubic``: cubic polynomial through the four closest points.
+
+        Global splines are accurate, but fitting them on long series is slow
+        and requires a lot of memory. The ``linear`` and ``local_cubic``
+        methods take a time proportional to the number of points.
+
         :param new_x: New independent variable
         :type new_x:  1D numpy array or list of float
         :param ext: How to handle points outside the data interval
@@ -426,28 +597,90 @@ class BaseSeries(BaseNumerical):
                    3 for extending the boundary
         :param piecewise_constant: Do not use splines, use the nearest neighbors.
         :type piecewise_constant: bool
+        :param method: Resampling method
+        :type method: str
         :returns: Resampled series.
         :rtype:   :py:class:`~.BaseSeries` or derived class
 
         """
+        new_x = np.asarray(new_x)
+
         # If x is the same, there's no need to resample
         if len(self.x) == len(new_x):
             if np.allclose(self.x, new_x, atol=1e-14):
                 return self.copy()
 
+        # If the series is regularly sampled, and new_x is a contiguous subset
+        # of x, there's no need to resample either: we can just slice the data.
+        # For regular series, we can find where new_x would start with a
+        # division, and we only have to check that the points coincide (up to
+        # floating-point roundoff).
+        if len(self) > 1 and new_x.ndim == 1 and len(new_x) > 0:
+            sliced = self._sliced_if_subset(new_x)
+            if sliced is not None:
+                return sliced
+
+        if piecewise_constant:
+            method = "nearest"
+
         # Unfortunately there is no nearest neighor resampling in SciPy's splines.
         # Hence, we use directly the method interp1d.
-        if piecewise_constant:
+        if method == "nearest":
             interp_function = interpolate.interp1d(
                 self.x, self.y, kind="nearest", assume_sorted=True
             )
             new_y = interp_function(new_x)
-        else:
+        elif method == "spline":
             new_y = self.evaluate_with_spline(new_x, ext=ext)
+        elif method == "linear":
+            new_y = _locally_interpolated(
+                self.x, self.y, new_x, num_points=2, ext=ext
+            )
+        elif method == "local_cubic":
+            new_y = _locally_interpolated(
+                self.x, self.y, new_x, num_points=4, ext=ext
+            )
+        else:
+            raise ValueError(f"Unknown resampling method {method}")
 
         return type(self)(new_x, new_y)
 
-    def resample(self, new_x, ext=2, piecewise_constant=False):
+    def _sliced_if_subset(self, new_x):
+        """Return a series with the points of this series at new_x, if the
+        series is regularly sampled and new_x is a contiguous subset of x,
+        otherwise return None.
+
+        The data is copied, unless it cannot be modified (see
+        :py:func:`~._shared_view`).
+
+        This function is not meant to be called directly.
+
+        :param new_x: New independent variable
+        :type new_x:  1D numpy array
+        :returns: Sliced series, or None
+        :rtype: :py:class:`~.BaseSeries` or derived class, or None
+        """
+        dx = self._regular_dx()
+        if dx is None:
+            return None
+
+        start = int(np.rint((new_x[0] - self.xmin) / dx))
+        stop = start + len(new_x)
+
+        if start < 0 or stop > len(self):
+            return None
+
+        if not np.allclose(self.x[start:stop], new_x, rtol=1e-12, atol=1e-14):
+            return None
+
+        return type(self)._from_validated(
+            _shared_view(self.x[start:stop]),
+            _shared_view(self.y[start:stop]),
+        )
+
+    def resample(
+        self, new_x, ext=2, piecewise_constant=False, method="spline"
+    ):
         """Resample the series to new independent variable new_x.
 
         If you want to resample without using the spline, and you want a nearest
@@ -455,6 +688,8 @@ class BaseSeries(BaseNumerical):
         This may be a good choice for data with large discontinuities, where the
         splines are ineffective.
 
+        See :py:meth:`~.resampled` for the available methods.
+
         :param new_x: New independent variable
         :type new_x:  1D numpy array or list of float
         :param ext: How to handle points outside the interval
@@ -462,6 +697,8 @@ class BaseSeries(BaseNumerical):
                    3 for extending the boundary
         :param piecewise_constant: Do not use splines, use the nearest neighbors.
         :type piecewise_constant: bool
+        :param method: Resampling method
+        :type method: str
 
         """
         self._apply_to_self(
@@ -469,6 +706,7 @@ class BaseSeries(BaseNumerical):
             new_x,
             ext=ext,
             piecewise_constant=piecewise_constant,
+            method=method,
         )
 
     def _apply_binary(self, other, function):
@@ -497,14 +735,10 @@ class BaseSeries(BaseNumerical):
                 not np.allclose(other.x, self.x, atol=1e-14)
             ):
                 raise ValueError("The objects do not have the same x!")
-            return type(self)(
-                self.x,
-                function(self.y, other.y),
-                True,
-            )
+            return self._with_same_x(function(self.y, other.y))
         # If it is a number
         if isinstance(other, (int, float, complex)):
-            return type(self)(self.x, function(self.y, other), True)
+            return self._with_same_x(function(self.y, other))
 
         # If we are here, it is because we cannot add the two objects
         raise TypeError("I don't know how to combine these objects")
@@ -525,10 +759,20 @@ class BaseSeries(BaseNumerical):
         """
         ret = f(*args, **kwargs)
         # We avoid the setters to avoid checking for consistency because this
-        # was already done
-        self.__data_x, self.__data_y = ret.x, ret.y
-        # We have to recompute the splines
-        self.invalid_spline = True
+        # was already done. The new data may be read-only because it is shared
+        # with other series: in that case, we have to copy it so that this
+        # series owns its data.
+        self.__data_x, self.__data_y = (
+            array if array.flags.writeable else array.copy()
+            for array in (ret.x, ret.y)
+        )
+        # We take the splines from the new object (if it has any, e.g. if it
+        # is a copy of self, otherwise they will be recomputed)
+        self.spline_real, self.spline_imag = ret.spline_real, ret.spline_imag
+        self._splines = ret._splines
+        self.__spline_data = ret.__spline_data
+        self.invalid_spline = ret.invalid_spline
+        self.__regularly_sampled = ret.__regularly_sampled
 
     def save(self, file_name, *args, **kwargs):
         """Saves into simple ASCII format with 2 columns (x, y)
@@ -562,7 +806,7 @@ class BaseSeries(BaseNumerical):
         :rtype: :py:class:`~.BaseSeries` or derived class
         """
         msk = np.isfinite(self.y)
-        return type(self)(self.x[msk], self.y[msk], True)
+        return self._from_validated(self.x[msk], self.y[msk])
 
     def nans_remove(self):
         """Filter out nans/infinite values."""
@@ -581,10 +825,8 @@ class BaseSeries(BaseNumerical):
         """
         # We pass self.x only if dx was not provided
         passing_x = self.x if dx is None else None
-        return type(self)(
-            self.x,
-            integrate.cumtrapz(self.y, x=passing_x, dx=dx, initial=0),
-            True,
+        return self._with_same_x(
+            integrate.cumtrapz(self.y, x=passing_x, dx=dx, initial=0)
         )
 
     def integrate(self):
@@ -616,7 +858,7 @@ class BaseSeries(BaseNumerical):
         else:
             ret_value = interpolate.splev(self.x, self.spline_real, der=order)
 
-        return type(self)(self.x, ret_value, True)
+        return self._with_same_x(ret_value)
 
     def spline_derive(self, order=1):
         """Derive the series current one using the spline interpolation.
@@ -648,7 +890,7 @@ class BaseSeries(BaseNumerical):
         ret_value = self.y
         for _num_deriv in range(order):
             ret_value = np.gradient(ret_value, self.x, edge_order=2)
-        return type(self)(self.x, ret_value, True)
+        return self._with_same_x(ret_value)
 
     def derive(self, order=1):
         """Derive with the numerical order-differentiation. (order = number of
@@ -686,17 +928,13 @@ class BaseSeries(BaseNumerical):
 
         """
         if self.is_complex():
-            return type(self)(
-                self.x,
+            return self._with_same_x(
                 signal.savgol_filter(self.y.imag, window_size, order)
                 + 1j * signal.savgol_filter(self.y.real, window_size, order),
-                True,
             )
 
-        return type(self)(
-            self.x,
+        return self._with_same_x(
             signal.savgol_filter(self.y, window_size, order),
-            True,
         )
 
     def savgol_smooth(self, window_size, order=3):
@@ -732,17 +970,18 @@ class BaseSeries(BaseNumerical):
         :returns:  Series with enforced minimum and maximum
         :rtype:    :py:class:`~.BaseSeries` or derived class
         """
-        x = self.x
-        y = self.y
-        if init is not None:
-            m = x >= init
-            x = x[m]
-            y = y[m]
-        if end is not None:
-            m = x <= end
-            x = x[m]
-            y = y[m]
-        return type(self)(x, y, True)
+        # x is sorted, so the data to keep is a contiguous slice, which we can
+        # share if it cannot be modified
+        start = 0 if init is None else np.searchsorted(self.x, init, "left")
+        stop = (
+            len(self) if end is None else np.searchsorted(self.x, end, "right")
+        )
+        if start >= stop:
+            raise ValueError("Trying to construct empty Series.")
+        return self._from_validated(
+            _shared_view(self.x[start:stop]),
+            _shared_view(self.y[start:stop]),
+        )
 
     def crop(self, init=None, end=None):
         """Remove data outside the intarval [init, end]. If init or end
@@ -772,7 +1011,7 @@ class BaseSeries(BaseNumerical):
         """
         # TODO: Turn this into a decorator
 
-        return type(self)(self.x, function(self.y), True)
+        return self._with_same_x(function(self.y))
 
     def _apply_reduction(self, reduction):
         """Apply a reduction to the data.
@@ -789,6 +1028,284 @@ class BaseSeries(BaseNumerical):
         return reduction(self.y)
 
 
+def _is_immutable(array):
+    """Return whether the data of the given array cannot be changed.
+
+    This function is not meant to be called directly.
+
+    A read-only array can still change if it is a view of a writeable array,
+    so we check all the arrays that it is a view of. Memory-mapped files
+    opened in read-only mode are immutable.
+
+    :param array: Array to check
+    :type array:  numpy array
+
+    :returns: Whether the data cannot be changed
+    :rtype:   bool
+    """
+    while isinstance(array, np.ndarray):
+        if array.flags.writeable:
+            return False
+        array = array.base
+    return True
+
+
+def _frozen(array):
+    """Make the given array read-only and return it.
+
+    This function is not meant to be called directly.
+
+    Use this only with new arrays that are not available elsewhere, so that
+    they can be shared among series (see :py:func:`~._shared_view`). New
+    arrays can be views of other new arrays (e.g., the output of
+    ``np.linspace``), so those are made read-only too.
+
+    :param array: Array to freeze
+    :type array:  numpy array
+
+    :returns: The same array, read-only
+    :rtype:   numpy array
+    """
+    base = array
+    while isinstance(base, np.ndarray):
+        base.setflags(write=False)
+        base = base.base
+    return array
+
+
+def _immutable_copy(array):
+    """Return a read-only copy of the given array, or the array itself if its
+    data cannot be changed.
+
+    This function is not meant to be called directly.
+
+    :param array: Array to copy
+    :type array:  numpy array
+
+    :returns: Array with the same elements that cannot be changed
+    :rtype:   numpy array
+    """
+    if _is_immutable(array):
+        return array
+    return _frozen(array.copy())
+
+
+def _has_same_elements(array, immutable_array):
+    """Return whether the given array has the same elements as the immutable
+    one (e.g., as returned by :py:func:`~._immutable_copy`).
+
+    This function is not meant to be called directly.
+
+    If array is also immutable and it views the same memory, the elements are
+    not compared.
+
+    :param array: Array to check
+    :type array:  numpy array
+    :param immutable_array: Array that cannot be changed
+    :type immutable_array:  numpy array
+
+    :returns: Whether the two arrays have the same elements
+    :rtype:   bool
+    """
+    if array.shape != immutable_array.shape:
+        return False
+    if (
+        array.dtype == immutable_array.dtype
+        and array.strides == immutable_array.strides
+        and array.ctypes.data == immutable_array.ctypes.data
+        and _is_immutable(array)
+    ):
+        return True
+    return np.array_equal(array, immutable_array)
+
+
+def _shared_view(array):
+    """Return a read-only view of the given array if its data cannot be
+    changed, otherwise return a copy.
+
+    This function is not meant to be called directly.
+
+    Series derived from other series use this to avoid copying immutable data
+    (e.g., memory-mapped files), without being affected when the data of the
+    original series is modified in place.
+
+    :param array: Array to share
+    :type array:  numpy array
+
+    :returns: Read-only view or copy of array
+    :rtype:   numpy array
+    """
+    if _is_immutable(array):
+        return array.view()
+    return array.copy()
+
+
+def _chunked_abs_argextremum(array, argfunction):
+    """Return argfunction(np.abs(array)), without computing the absolute value
+    of the entire array at once.
+
+    The array is processed in chunks of _POINTS_PER_CHUNK points. This is
+    important when the array is memory-mapped: only one chunk at the time has
+    to be in memory.
+
+    This function is not meant to be called directly.
+
+    :param array: Array
+    :type array: 1D numpy array
+    :param argfunction: np.argmax or np.argmin
+    :type argfunction: callable
+
+    :returns: Index of the extremum of the absolute value of the array
+    :rtype: int
+    """
+    best_index, best_value = None, None
+    for start in range(0, len(array), _POINTS_PER_CHUNK):
+        chunk_abs = np.abs(array[start : start + _POINTS_PER_CHUNK])
+        index = argfunction(chunk_abs)
+        # argfunction returns the first occurrence of the extremum, so we
+        # update best_index only if the new value is strictly better
+        if best_index is None or argfunction([best_value, chunk_abs[index]]):
+            best_index, best_value = start + index, chunk_abs[index]
+    return best_index
+
+
+def _lagrange_interpolated(x, y, new_x, num_points):
+    """Evaluate on new_x the polynomials that go through the num_points points
+    of (x, y) around each of the new_x.
+
+    Near the boundaries, the points are shifted inside the interval, so values
+    outside the interval are extrapolated.
+
+    This function is not meant to be called directly.
+
+    :param x: Sorted independent variable
+    :type x: 1D numpy array
+    :param y: Dependent variable
+    :type y: 1D numpy array
+    :param new_x: Points where to evaluate the polynomials
+    :type new_x: 1D numpy array
+    :param num_points: Number of points to use (degree of the polynomial
+                       plus one)
+    :type num_points: int
+
+    :returns: Interpolated values
+    :rtype: 1D numpy array
+    """
+    # x[index - 1] <= new_x < x[index], so the stencil is centered between
+    # index - 1 and index
+    first = np.searchsorted(x, new_x, side="right") - num_points // 2
+    first = np.clip(first, 0, len(x) - num_points)
+    stencil = first[:, np.newaxis] + np.arange(num_points)
+    x_stencil = x[stencil]
+    y_stencil = y[stencil]
+
+    ret = np.zeros(len(new_x), dtype=np.result_type(y, float))
+    for j in range(num_points):
+        weight = np.ones(len(new_x))
+        for m in range(num_points):
+            if m != j:
+                weight *= (new_x - x_stencil[:, m]) / (
+                    x_stencil[:, j] - x_stencil[:, m]
+                )
+        ret += weight * y_stencil[:, j]
+    return ret
+
+
+def _locally_interpolated(x, y, new_x, num_points, ext=2):
+    """Evaluate (x, y) on new_x with linear (num_points=2) or local
+    polynomial interpolation.
+
+    new_x is processed in chunks of _POINTS_PER_CHUNK points, so the time is
+    proportional to the number of points, and the memory used for temporary
+    arrays is bounded.
+
+    This function is not meant to be called directly.
+
+    :param x: Sorted independent variable
+    :type x: 1D numpy array
+    :param y: Dependent variable
+    :type y: 1D numpy array
+    :param new_x: Points where to evaluate the series
+    :type new_x: 1D numpy array
+    :param num_points: Number of points used for each interpolating polynomial
+    :type num_points: int
+    :param ext: How to handle points outside the data interval
+    :type ext: 0 for extrapolation, 1 for returning zero, 2 for ValueError,
+               3 for extending the boundary
+
+    :returns: Interpolated values
+    :rtype: 1D numpy array
+    """
+    new_x = np.atleast_1d(np.asarray(new_x, dtype=float))
+    num_points = min(num_points, len(x))
+
+    below = new_x < x[0]
+    above = new_x > x[-1]
+
+    if ext == 2 and (np.any(below) or np.any(above)):
+        raise ValueError("new_x is outside the interval of the data")
+
+    new_y = np.empty(len(new_x), dtype=np.result_type(y, float))
+
+    for start in range(0, len(new_x), _POINTS_PER_CHUNK):
+        chunk = new_x[start : start + _POINTS_PER_CHUNK]
+        if num_points == 2:
+            # np.interp is much faster than the general algorithm, but it
+            # only works with real numbers
+            new_y[start : start + len(chunk)] = np.interp(chunk, x, y.real)
+            if np.iscomplexobj(y):
+                new_y[start : start + len(chunk)] += 1j * np.interp(
+                    chunk, x, y.imag
+                )
+        else:
+            new_y[start : start + len(chunk)] = _lagrange_interpolated(
+                x, y, chunk, num_points
+            )
+
+    outside = below | above
+    if ext == 0 and num_points == 2:
+        # np.interp does not extrapolate
+        new_y[outside] = _lagrange_interpolated(x, y, new_x[outside], 2)
+    elif ext == 1:
+        new_y[outside] = 0
+    elif ext == 3:
+        new_y[below] = y[0]
+        new_y[above] = y[-1]
+
+    return new_y
+
+
+def _closest_indices(sorted_array, values):
+    """Return the indices of the elements of sorted_array that are closest to
+    each of the values.
+
+    This function is not meant to be called directly.
+
+    np.searchsorted returns the index where each value would be inserted to
+    keep sorted_array sorted, so the closest element is either that one, or
+    the one before. This takes O(m log n) operations and O(m) memory, where n
+    is the length of sorted_array and m the number of values.
+
+    :param sorted_array: Array sorted in increasing order
+    :type sorted_array: 1D numpy array
+    :param values: Values to look up in sorted_array
+    :type values: 1D numpy array
+
+    :returns: Indices of the closest elements in sorted_array
+    :rtype: 1D numpy array of int
+    """
+    right = np.clip(
+        np.searchsorted(sorted_array, values), 0, len(sorted_array) - 1
+    )
+    left = np.clip(right - 1, 0, len(sorted_array) - 1)
+    return np.where(
+        np.abs(sorted_array[left] - values)
+        < np.abs(sorted_array[right] - values),
+        left,
+        right,
+    )
+
+
 def sample_common(series, resample=False, piecewise_constant=False):
     """Take a list of series and return on so that they are all defined on the
     same points. If resample is True, resample a list of series to the largest
@@ -825,13 +1342,22 @@ def sample_common(series, resample=False, piecewise_constant=False):
     # resample. If the series are regularly sampled, it is easy to check
     # if the are the same. We also need to check that they are regularly
     # sampled, to do this, we check that the first is regularly sampled,
-    # and that all the other ones have the same x.
+    # and that all the other ones have the same x. Since is_regularly_sampled
+    # is saved, for regular series we only have to compare the extrema, so
+    # calling this function again with the same series is inexpensive.
     s1, *s_others = series
     if s1.is_regularly_sampled():
         for s in s_others:
             if not (len(s) == len(s1)):
                 break
-            if not np.allclose(s1.x, s.x, atol=1e-14):
+            if s.x is s1.x:
+                continue
+            if not (
+                s.is_regularly_sampled()
+                and np.allclose(
+                    (s1.xmin, s1.xmax), (s.xmin, s.xmax), atol=1e-14
+                )
+            ):
                 break
             # This is an else to the for loop
         else:
@@ -852,13 +1378,15 @@ def sample_common(series, resample=False, piecewise_constant=False):
         ]
 
     def float_intersection(array_1, array_2):
-        """Here we find the intersection between the two arrays also
+        """Here we find the intersection between the two sorted arrays also
         considering the floating points.
+
+        Since both the arrays are sorted, a point of array_2 can only be close
+        to the point of array_1 closest to it, so we never have to compare all
+        the possible pairs.
         """
-        # https://stackoverflow.com/a/32516182
-        return array_2[
-            np.isclose(array_1[:, None], array_2, atol=1e-14).any(0)
-        ]
+        closest = _closest_indices(array_1, array_2)
+        return array_2[np.isclose(array_1[closest], array_2, atol=1e-14)]
 
     # Here we find the common intersection between all the x, starting with
     # the first one
@@ -868,4 +1396,6 @@ def sample_common(series, resample=False, piecewise_constant=False):
         if len(x) == 0:
             raise ValueError("Series do not have any point in common")
 
-    return [s.resampled(x) for s in series]
+    # All the points in x are in all the series, so we take the values
+    # directly instead of evaluating the splines
+    return [type(s)(x, s.y[_closest_indices(s.x, x)], True) for s in series]
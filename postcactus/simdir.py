@@ -27,6 +27,7 @@ import os
 # We ideally would like to use cached_property, but it is in Python 3.8
 # which is quite new
 from functools import lru_cache
+from operator import methodcaller
 
 from postcactus import (
     cactus_grid_functions,
@@ -35,6 +36,85 @@ from postcactus import (
     cactus_scalars,
     cactus_waves,
 )
+from postcactus.parallel_utils import _map_in_pool
+
+
+# Names of the reductions in the files written by CarpetIOScalar. The empty
+# string is for files without reduction (e.g., carpet-timing..asc), scalars
+# is for files with all the reductions.
+_SCALAR_REDUCTIONS = {
+    "",
+    "minimum",
+    "maximum",
+    "norm1",
+    "norm2",
+    "norm_inf",
+    "average",
+    "scalars",
+}
+
+
+def _classify_files(allfiles):
+    """Sort the files by the type of data that they can contain, looking only
+    at the extensions and at the beginning of the file names.
+
+    This is done only once for each :py:class:`~.SimDir`, then each class that
+    reads data (e.g., :py:class:`~.ScalarsDir`) receives only the files of its
+    type, and it matches them against its (stricter) patterns.
+
+    This function is not meant to be called directly.
+
+    :param allfiles: Paths of the files.
+    :type allfiles: list of str
+
+    :returns: Dictionary with keys ``scalars``, ``multipoles``,
+              ``grid_functions``, and ``horizons``, and values the lists of
+              the corresponding files.
+    :rtype: dict
+
+    """
+    files = {
+        "scalars": [],
+        "multipoles": [],
+        "grid_functions": [],
+        "horizons": [],
+    }
+
+    for path in allfiles:
+        filename = os.path.basename(path)
+        name, ext = os.path.splitext(filename)
+        if ext in (".gz", ".bz2"):
+            name, ext = os.path.splitext(name)
+
+        if ext == ".asc":
+            if filename.startswith("mp_"):
+                files["multipoles"].append(path)
+            else:
+                # rho.maximum.asc is a scalar, rho.xy.asc is a grid function
+                _, dot, reduction = name.rpartition(".")
+                if dot and reduction in _SCALAR_REDUCTIONS:
+                    files["scalars"].append(path)
+                else:
+                    files["grid_functions"].append(path)
+        elif ext == ".h5":
+            if filename.startswith("mp_"):
+                files["multipoles"].append(path)
+            else:
+                files["grid_functions"].append(path)
+        elif ext == ".gp" and filename.startswith(("BH_diagnostics", "h.t")):
+            files["horizons"].append(path)
+
+    return files
+
+
+def _call_with_argument(function_and_argument):
+    """Return function(argument) for the given tuple (function, argument).
+
+    This function is not meant to be called directly.
+
+    """
+    function, argument = function_and_argument
+    return function(argument)
 
 
 class SimDir:
@@ -125,6 +205,10 @@ class SimDir:
 
         walk_rec(self.path)
 
+        # Files for ScalarsDir, MultipolesDir, GridFunctionsDir, and
+        # HorizonsDir
+        self._files_by_kind = _classify_files(self.allfiles)
+
         self.logfiles = filter_ext(self.allfiles, ".out")
         self.errfiles = filter_ext(self.allfiles, ".err")
         self.parfiles = filter_ext(self.allfiles, ".par")
@@ -151,7 +235,18 @@ class SimDir:
         # else:
         #     self.initial_params = cpar.Parfile()
 
-    def __init__(self, path, max_depth=8, ignore=None):
+    def __init__(
+        self,
+        path,
+        max_depth=8,
+        ignore=None,
+        use_npy_cache=False,
+        incremental=False,
+        num_workers=1,
+        use_processes=False,
+        keep_all_columns=True,
+        dtype=None,
+    ):
         """Constructor.
 
         :param path:      Path to simulation directory.
@@ -160,6 +255,35 @@ class SimDir:
         :type max_depth:  int
         :param ignore: Folders to ignore
         :type ignore:  set
+        :param use_npy_cache: Convert scalar ASCII files to binary ``.npy``
+                              files (saved next to them) and memory-map the
+                              timeseries to those, see
+                              :py:class:`~.ScalarsDir`.
+        :type use_npy_cache: bool
+        :param incremental: Every time that a scalar is requested, read only
+                            the lines appended to the files since the last
+                            time, see :py:class:`~.ScalarsDir`. This is useful
+                            to follow running simulations.
+        :type incremental: bool
+        :param num_workers: Number of threads (or processes) used to read
+                            concurrently the files of a variable (e.g., from
+                            different restarts) in :py:class:`~.ScalarsDir`
+                            and :py:class:`~.MultipolesDir`. If None, use
+                            all the CPUs.
+        :type num_workers: int or None
+        :param use_processes: Use processes instead of threads to read the
+                              files concurrently.
+        :type use_processes: bool
+        :param keep_all_columns: When a scalar is requested from a file with
+                                 multiple variables, read all the columns
+                                 (if False, only the columns requested so
+                                 far), see :py:class:`~.ScalarsDir`.
+        :type keep_all_columns: bool
+        :param dtype: Type used to store the grid functions in memory (e.g.,
+                      np.float32 to halve the memory needed), see
+                      :py:class:`~.GridFunctionsDir`. If None, use the type
+                      in the files.
+        :type dtype: NumPy dtype or None
 
         Parfiles (``*.par``) will be searched in all data directories and the
         top-level SIMFACTORY/par folder, if it exists. The parfile in the
@@ -172,6 +296,12 @@ class SimDir:
             ignore = {"SIMFACTORY", "report", "movies", "tmp", "temp"}
 
         self.ignore = ignore
+        self.use_npy_cache = use_npy_cache
+        self.incremental = incremental
+        self.num_workers = num_workers
+        self.use_processes = use_processes
+        self.keep_all_columns = keep_all_columns
+        self.dtype = dtype
         self._sanitize_path(str(path))
         self._scan_folders(int(max_depth))
 
@@ -179,14 +309,23 @@ class SimDir:
     # We only need to keep it 1 in memory: it is the only possible!
     @lru_cache(1)
     def ts(self):
-        return cactus_scalars.ScalarsDir(self)
+        return cactus_scalars.ScalarsDir(
+            self,
+            self.use_npy_cache,
+            self.incremental,
+            self.num_workers,
+            self.use_processes,
+            self.keep_all_columns,
+        )
 
     timeseries = ts
 
     @property
     @lru_cache(1)
     def multipoles(self):
-        return cactus_multipoles.MultipolesDir(self)
+        return cactus_multipoles.MultipolesDir(
+            self, self.num_workers, self.use_processes
+        )
 
     @property
     @lru_cache(1)
@@ -205,7 +344,7 @@ class SimDir:
     @property
     @lru_cache(1)
     def gridfunctions(self):
-        return cactus_grid_functions.GridFunctionsDir(self)
+        return cactus_grid_functions.GridFunctionsDir(self, self.dtype)
 
     gf = gridfunctions
 
@@ -214,6 +353,122 @@ class SimDir:
     def horizons(self):
         return cactus_horizons.HorizonsDir(self)
 
+    def preload(self, spec, num_workers=None, use_processes=False):
+        """Read in advance the data described by spec.
+
+        spec is a dictionary with (optional) keys:
+
+        - ``ts``: dictionary that maps reductions (as in
+          :py:class:`~.ScalarsDir`) to lists of variables,
+        - ``multipoles``: dictionary that maps variables to lists of radii (as
+          in the names of the files), or to None for all the radii,
+        - ``horizons``: if True, load the data of the horizons.
+
+        First, all the files that have to be read are collected, so that each
+        file is read only once, even if it contains multiple variables. Then,
+        the files are read concurrently by num_workers threads (or processes,
+        if use_processes is True). The data is saved in :py:attr:`ts`,
+        :py:attr:`multipoles`, and :py:attr:`horizons`, so the following
+        accesses do not read the files again.
+
+        Example:
+
+        .. code-block:: python
+
+            sim.preload(
+                {
+                    "ts": {"maximum": ["rho", "press"]},
+                    "multipoles": {"psi4": [110.69]},
+                    "horizons": True,
+                }
+            )
+
+        :param spec: Description of the data to load.
+        :type spec: dict
+        :param num_workers: Number of threads or processes (None to use all
+                            the CPUs).
+        :type num_workers: int or None
+        :param use_processes: Whether to use processes instead of threads.
+        :type use_processes: bool
+
+        """
+        unknown_keys = set(spec) - {"ts", "multipoles", "horizons"}
+        if unknown_keys:
+            raise ValueError(f"Unknown keys in spec: {sorted(unknown_keys)}")
+
+        scalars = {
+            reduction: list(variables)
+            for reduction, variables in spec.get("ts", {}).items()
+        }
+        multipoles = spec.get("multipoles", {})
+
+        # The horizons need all the QuasiLocalMeasures scalars
+        if spec.get("horizons", False):
+            scalars.setdefault("scalar", []).extend(
+                var for var in self.ts.scalar.keys() if var.startswith("qlm_")
+            )
+
+        # Each job is a tuple (function, argument, callback): callback is
+        # called with function(argument), and it saves the result
+        jobs = []
+
+        # A file can contain multiple variables and reductions, so we collect
+        # the columns needed from each file and read each file only once
+        scalar_files = {}
+
+        for reduction, variables in scalars.items():
+            reader = self.ts.get(reduction)
+            if reader is None:
+                raise ValueError(f"Unknown reduction {reduction}")
+            for var in variables:
+                if var not in reader:
+                    raise KeyError(f"{reduction} {var} not available")
+                for one_scalar, column_number in reader._files_to_preload(var):
+                    scalar_files.setdefault(one_scalar, set()).add(
+                        column_number
+                    )
+
+        for one_scalar, column_numbers in scalar_files.items():
+            # As when the variables are loaded, we read all the columns unless
+            # keep_all_columns is False
+            if one_scalar.keep_all_columns:
+                column_numbers = None
+            else:
+                column_numbers = sorted(column_numbers)
+            jobs.append(
+                (
+                    methodcaller("_read_table", column_numbers),
+                    one_scalar,
+                    one_scalar._store_columns,
+                )
+            )
+
+        for var, radii in multipoles.items():
+            jobs.extend(self.multipoles._jobs_to_preload(var, radii))
+
+        if spec.get("horizons", False):
+            jobs.extend(self.horizons._jobs_to_preload())
+
+        results = _map_in_pool(
+            _call_with_argument,
+            [(function, argument) for function, argument, _ in jobs],
+            num_workers,
+            use_processes,
+        )
+
+        for (_, _, callback), result in zip(jobs, results):
+            callback(result)
+
+        # Finally, we fill the caches of the Dir classes (without reading the
+        # files again)
+        for reduction, variables in scalars.items():
+            for var in variables:
+                self.ts[reduction][var]
+
+        for var, radii in multipoles.items():
+            if radii is None:
+                self.multipoles[var]
+
     def __str__(self):
         header = f"Indexed {len(self.allfiles)} files"
         header += f" and {len(self.dirs)} subdirectories\n"
@@ -21,12 +21,24 @@ and convenience functions to create timeseries.
 """
 
 import warnings
+from fractions import Fraction
 
 import numpy as np
-from scipy import signal
+from scipy import interpolate, signal
 
-from postcactus import frequencyseries
-from postcactus.series import BaseSeries
+from postcactus import frequencyseries, grid_data
+from postcactus.series import BaseSeries, _frozen, _shared_view
+
+
+# In polyphase resampling, the ratio between the old and the new timestep is
+# approximated with a fraction up/down, where down is at most this number. The
+# cost of the filter grows with up and down.
+_MAX_POLYPHASE_FACTOR = 1000
+
+# When we compute spectrograms, we Fourier transform this number of segments at
+# the same time, so that the temporary windowed copies of the segments do not
+# take too much memory.
+_SEGMENTS_PER_BATCH = 256
 
 
 def remove_duplicate_iters(t, y):
@@ -52,6 +64,29 @@ def remove_duplicate_iters(t, y):
     :returns:  Strictly monotonic time series
     :rtype:    :py:class:`~.TimeSeries`
 
+    """
+    # First, we make sure that we are dealing with arrays and not lists
+    t = np.array(t)
+    y = np.array(y)
+
+    msk = _remove_duplicate_iters_mask(t)
+
+    # Each of the times we keep is smaller than all the following ones, so
+    # they are monotonically increasing
+    return TimeSeries._from_validated(t[msk], y[msk])
+
+
+def _remove_duplicate_iters_mask(t):
+    """Return the mask that selects the points that remove_duplicate_iters
+    would keep.
+
+    This function is not meant to be called directly.
+
+    :param t:  Times
+    :type t:   1D numpy array
+
+    :returns:  Mask of the points to keep
+    :rtype:    1D numpy array of bool
     """
     # Let's unpack this code.
     # First, we define a new variable t2.
@@ -76,15 +111,9 @@ def remove_duplicate_iters(t, y):
     # are those subtracted with the following are positive.
     # (t[:-1] < t2[1:])
 
-    # First, we make sure that we are dealing with arrays and not lists
-    t = np.array(t)
-    y = np.array(y)
-
     t2 = np.minimum.accumulate(t[::-1])[::-1]
     # Here we append [True] because the last point is always included
-    msk = np.hstack((t[:-1] < t2[1:], [True]))
-
-    return TimeSeries(t[msk], y[msk])
+    return np.hstack((t[:-1] < t2[1:], [True]))
 
 
 def unfold_phase(phase):
@@ -118,23 +147,23 @@ def unfold_phase(phase):
     return phase + (2 * np.pi) * wind
 
 
-def combine_ts(series, prefer_late=True):
-    """Combine several overlapping time series into one.
+def _combine_ts_masks(times, prefer_late=True):
+    """Find which points of each segment have to be kept to combine several
+    overlapping segments with the given times into one.
 
-    In intervals covered by two or more time series, which data is used depends
-    on the parameter prefer_late. If two segments start at the same time, the
-    longer one gets used.
+    This function is not meant to be called directly.
 
-    :param series: The timeseries to combine
-    :type series:  list of :py:class:`~.TimeSeries`
+    :param times: Times of the segments
+    :type times:  list of 1D numpy arrays
     :param prefer_late: Prefer data that starts later for overlapping segments
     :type prfer_late:   bool
 
-    :returns:      The combined time series
-    :rtype:        :py:class:`~.TimeSeries`
+    :returns: List of (index of the segment, mask of the points to keep), in
+              the order in which the segments have to be concatenated.
+              Segments with no points to keep are not included.
+    :rtype:   list of tuples
 
     """
-
     # Late and early can be implemented in one shot by implementing one and
     # sending t -> -t for the other. For the "straight" way we implement
     # combine_ts_early.
@@ -142,13 +171,17 @@ def combine_ts(series, prefer_late=True):
     # Let's consider a simple example for the reversed case
     # t1 = [1, 2, 3], t2 = [2, 3, 4], we want to have t = [1, 2, 3, 4]
     # sign = -1
-    # timeseries = [t2, t1]
-    # times = t2[::-1] = [4, 3, 2]
+    # segments = [t2, t1]
+    # We keep all of t2, and the boundary is t2[0] = 2
     # Next we walk through the remaining elements of the list
-    # We want only to keep those with t < times[-1] = 2 (hence the switch)
-    # In this case msk = [3, 2, 1] < 2 = [False, False, True], so
-    # s_t[msk] = [1] and times = [4, 3, 2, 1].
-    # At the end, we need to reverse the order again
+    # We want only to keep those with t < boundary = 2 (hence the switch)
+    # In this case msk = [1, 2, 3] < 2 = [True, False, False], so we keep
+    # t1[msk] = [1] and the boundary becomes 1.
+    # At the end, we need to reverse the order of the segments.
+    #
+    # The boundary is the only information we need from the previous
+    # segments, so we find all the masks first and concatenate the arrays
+    # only once at the end.
 
     # sign is responsible of inverting the sorting key
     sign = -1 if prefer_late else 1
@@ -156,20 +189,124 @@ def combine_ts(series, prefer_late=True):
     # Tuples are compared lexicographically; the first items are compared; if
     # they are the same then the second items are compared, and so on.
     # So here we sort by tmin and tmax
-    timeseries = sorted(series, key=lambda x: (sign * x.tmin, sign * x.tmax))
-    # Now we are going to build up the t and y array, starting with the first
-    times = timeseries[0].t[::sign]
-    values = timeseries[0].y[::sign]
-    for s in timeseries[1:]:
-        # We need to walk backwards for "prefer_late"
-        s_t = s.t[::sign]
-        s_y = s.y[::sign]
-        # We only keep those times that we don't have yet in the array times
-        msk = s_t < times[-1] if prefer_late else s_t > times[-1]
-        times = np.append(times, s_t[msk])
-        values = np.append(values, s_y[msk])
-
-    return TimeSeries(times[::sign], values[::sign])
+    order = sorted(
+        range(len(times)),
+        key=lambda i: (sign * times[i][0], sign * times[i][-1]),
+    )
+
+    # The first segment is taken entirely
+    masks = [(order[0], slice(None))]
+    boundary = times[order[0]][0 if prefer_late else -1]
+
+    for index in order[1:]:
+        t = times[index]
+        # We only keep those times that we don't have yet
+        msk = t < boundary if prefer_late else t > boundary
+        if msk.any():
+            boundary = t[0] if prefer_late else t[-1]
+            masks.append((index, msk))
+
+    # For prefer_late, the segments are ordered from the last to the first
+    return masks[::-1] if prefer_late else masks
+
+
+def combine_ts(series, prefer_late=True):
+    """Combine several overlapping time series into one.
+
+    In intervals covered by two or more time series, which data is used depends
+    on the parameter prefer_late. If two segments start at the same time, the
+    longer one gets used.
+
+    This function can also combine :py:class:`~.TimeSeriesBundle` with the
+    same channels, in which case all the channels are combined at once.
+
+    If the other series do not add any point to one of them, and the data of
+    that series cannot be modified (e.g., it is memory-mapped), the result
+    shares the data instead of copying it.
+
+    :param series: The timeseries to combine
+    :type series:  list of :py:class:`~.TimeSeries` or
+                   :py:class:`~.TimeSeriesBundle`
+    :param prefer_late: Prefer data that starts later for overlapping segments
+    :type prfer_late:   bool
+
+    :returns:      The combined time series
+    :rtype:        :py:class:`~.TimeSeries` or :py:class:`~.TimeSeriesBundle`
+
+    """
+    bundles = [isinstance(s, TimeSeriesBundle) for s in series]
+
+    if any(bundles):
+        if not all(bundles):
+            raise TypeError("Cannot combine TimeSeries and TimeSeriesBundle")
+        channels = series[0].channels
+        if any(s.channels != channels for s in series):
+            raise ValueError("The bundles do not have the same channels")
+
+    masks = _combine_ts_masks([s.t for s in series], prefer_late)
+
+    # If only one segment is needed, it is taken entirely, so we do not copy
+    # it if the data cannot change (e.g., the data stays memory-mapped).
+    if len(masks) == 1:
+        t = _shared_view(series[masks[0][0]].t)
+        y = _shared_view(series[masks[0][0]].y)
+    else:
+        # The output is monotonic by construction. The last axis of y is
+        # always the time, both for TimeSeries and TimeSeriesBundle.
+        t = np.concatenate([series[index].t[msk] for index, msk in masks])
+        y = np.concatenate(
+            [series[index].y[..., msk] for index, msk in masks], axis=-1
+        )
+
+    if any(bundles):
+        return TimeSeriesBundle._from_validated(t, y, channels)
+
+    return TimeSeries._from_validated(t, y)
+
+
+def combine_many_ts(times, values, prefer_late=True):
+    """Combine several overlapping segments of multiple variables that share
+    the same times (e.g., different columns in the same files) into one
+    time series for each variable.
+
+    This is equivalent to calling :py:func:`~.combine_ts` for each variable,
+    but which points to keep is computed only once.
+
+    :param times: Times of the segments
+    :type times:  list of 1D numpy arrays
+    :param values: Dictionary that maps the name of each variable to the list
+                   of its values in the segments (in the same order as times)
+    :type values:  dict
+    :param prefer_late: Prefer data that starts later for overlapping segments
+    :type prfer_late:   bool
+
+    :returns:      Dictionary with the combined time series of each variable
+    :rtype:        dict of :py:class:`~.TimeSeries`
+
+    """
+    for name, var_values in values.items():
+        if len(var_values) != len(times):
+            raise ValueError(
+                f"{name} does not have the same number of segments as times"
+            )
+
+    masks = _combine_ts_masks(times, prefer_late)
+
+    combined_t = np.concatenate([times[index][msk] for index, msk in masks])
+
+    # All the variables share the same times, so we check them only once and
+    # share them as read-only arrays
+    if np.any(combined_t[1:] <= combined_t[:-1]):
+        raise ValueError("Time not monotonically increasing")
+    combined_t = _frozen(combined_t)
+
+    return {
+        name: TimeSeries._from_validated(
+            combined_t,
+            np.concatenate([var_values[index][msk] for index, msk in masks]),
+        )
+        for name, var_values in values.items()
+    }
 
 
 class TimeSeries(BaseSeries):
@@ -277,10 +414,12 @@ class TimeSeries(BaseSeries):
         :rtype: float
 
         """
-        if not self.is_regularly_sampled():
+        dt = self._regular_dx()
+
+        if dt is None:
             raise ValueError("Timeseries is not regularly sampled")
 
-        return self.t[1] - self.t[0]
+        return dt
 
     @property
     def time_length(self):
@@ -335,25 +474,122 @@ class TimeSeries(BaseSeries):
         """Time shift the series so that the absolute maximum is at t=0."""
         self._apply_to_self(self.aligned_at_maximum)
 
-    def regular_resampled(self):
+    def resampled(
+        self, new_t, ext=2, piecewise_constant=False, method="spline"
+    ):
+        """Return a new timeseries resampled from this to new_t.
+
+        In addition to the methods described in
+        :py:meth:`~.BaseSeries.resampled`, timeseries can be resampled with
+        ``method="polyphase"``, which uses a polyphase filter
+        (:py:func:`scipy.signal.resample_poly`) to change the sampling rate.
+        This is only possible when both the timeseries and new_t are regularly
+        spaced, new_t is within the interval of the timeseries, and the ratio
+        between the two timesteps is a simple fraction. ext is ignored with
+        this method.
+
+        :param new_t: New times
+        :type new_t:  1D numpy array or list of float
+        :param ext: How to handle points outside the data interval
+        :type ext: 0 for extrapolation, 1 for returning zero, 2 for ValueError,
+                   3 for extending the boundary
+        :param piecewise_constant: Do not use splines, use the nearest
+                                   neighbors.
+        :type piecewise_constant: bool
+        :param method: Resampling method
+        :type method: str
+        :returns: Resampled timeseries.
+        :rtype:   :py:class:`~.TimeSeries`
+
+        """
+        if method == "polyphase" and not piecewise_constant:
+            return self._polyphase_resampled(new_t)
+
+        return super().resampled(
+            new_t,
+            ext=ext,
+            piecewise_constant=piecewise_constant,
+            method=method,
+        )
+
+    def _polyphase_resampled(self, new_t):
+        """Return a new timeseries resampled to new_t with a polyphase filter.
+
+        This function is not meant to be called directly.
+
+        :param new_t: New times, regularly spaced
+        :type new_t:  1D numpy array or list of float
+        :returns: Resampled timeseries.
+        :rtype:   :py:class:`~.TimeSeries`
+
+        """
+        new_t = np.array(new_t, dtype=float)
+
+        if len(new_t) < 2:
+            raise ValueError("Polyphase resampling requires at least 2 points")
+
+        # This raises an error if the timeseries is not regularly sampled
+        dt = self.dt
+        new_dt = new_t[1] - new_t[0]
+
+        if not np.allclose(np.diff(new_t), new_dt, atol=1e-14):
+            raise ValueError(
+                "Polyphase resampling requires regularly spaced new times"
+            )
+
+        ratio = Fraction(dt / new_dt).limit_denominator(_MAX_POLYPHASE_FACTOR)
+        up, down = ratio.numerator, ratio.denominator
+
+        if up == 0 or not np.isclose(
+            dt * down / up, new_dt, rtol=1e-9, atol=0
+        ):
+            raise ValueError(
+                "Ratio of timesteps is not a simple fraction, "
+                "cannot use polyphase resampling"
+            )
+
+        # The output of resample_poly is at tmin + k * new_dt
+        first = (new_t[0] - self.tmin) / new_dt
+        start = int(np.rint(first))
+        if (
+            start < 0
+            or not np.isclose(first, start, atol=1e-6)
+            or new_t[-1] > self.tmax + 1e-6 * new_dt
+        ):
+            raise ValueError(
+                "Polyphase resampling requires new times within the timeseries"
+                " and aligned with tmin"
+            )
+
+        # padtype="line" reduces the artifacts at the boundaries compared to
+        # padding with zeros
+        new_y = signal.resample_poly(self.y, up, down, padtype="line")
+
+        return self._from_validated(new_t, new_y[start : start + len(new_t)])
+
+    def regular_resampled(self, method="spline"):
         """Return a new timeseries resampled to regularly spaced times,
         with the
         same number of points.
 
+        :param method: Resampling method (see :py:meth:`~.resampled`)
+        :type method: str
         :returns: Regularly resampled time series
         :rtype:   :py:class:`~.TimeSeries`
         """
         t = np.linspace(self.tmin, self.tmax, len(self))
-        return self.resampled(t)
+        return self.resampled(t, method=method)
 
-    def regular_resample(self):
+    def regular_resample(self, method="spline"):
         """Resample the timeseries to regularly spaced times,
         with the same number of points.
 
+        :param method: Resampling method (see :py:meth:`~.resampled`)
+        :type method: str
         """
-        self._apply_to_self(self.regular_resampled)
+        self._apply_to_self(self.regular_resampled, method=method)
 
-    def fixed_frequency_resampled(self, frequency):
+    def fixed_frequency_resampled(self, frequency, method="spline"):
         """Return a TimeSeries with same tmin and tmax but resampled at a fixed
         frequency.
 
@@ -362,6 +598,8 @@ class TimeSeries(BaseSeries):
 
         :param frequency: Sampling rate
         :type frequency: float
+        :param method: Resampling method (see :py:meth:`~.resampled`)
+        :type method: str
         :returns:  Time series resampled with given frequency
         :rtype:   :py:class:`~.TimeSeries`
         """
@@ -372,9 +610,9 @@ class TimeSeries(BaseSeries):
         # We have to add one to n, so that we can include the tmax point
         new_times = self.tmin + np.arange(0, n + 1) * dt
 
-        return self.resampled(new_times)
+        return self.resampled(new_times, method=method)
 
-    def fixed_frequency_resample(self, frequency):
+    def fixed_frequency_resample(self, frequency, method="spline"):
         """Resample the timeseries to regularly spaced times
         with given frequency.
 
@@ -383,10 +621,14 @@ class TimeSeries(BaseSeries):
 
         :param frequency: Sampling rate
         :type frequency: float
+        :param method: Resampling method (see :py:meth:`~.resampled`)
+        :type method: str
         """
-        self._apply_to_self(self.fixed_frequency_resampled, frequency)
+        self._apply_to_self(
+            self.fixed_frequency_resampled, frequency, method=method
+        )
 
-    def fixed_timestep_resample(self, timestep):
+    def fixed_timestep_resample(self, timestep, method="spline"):
         """Resample the timeseries to regularly spaced times
         with given timestep.
 
@@ -395,17 +637,21 @@ class TimeSeries(BaseSeries):
 
         :param timestep: New timestep
         :type timestep: float
+        :param method: Resampling method (see :py:meth:`~.resampled`)
+        :type method: str
         :returns:  Time series resampled with given timestep
         :rtype:   :py:class:`~.TimeSeries`
 
         """
-        self._apply_to_self(self.fixed_timestep_resampled, timestep)
+        self._apply_to_self(
+            self.fixed_timestep_resampled, timestep, method=method
+        )
 
-    def fixed_timestep_resampled(self, timestep):
+    def fixed_timestep_resampled(self, timestep, method="spline"):
         if timestep > self.time_length:
             raise ValueError("Timestep larger then duration of the TimeSeries")
         frequency = 1.0 / float(timestep)
-        return self.fixed_frequency_resampled(frequency)
+        return self.fixed_frequency_resampled(frequency, method=method)
 
     def zero_padded(self, N):
         """Return a timeseries that is zero-padded and that has in total
@@ -432,7 +678,7 @@ class TimeSeries(BaseSeries):
             self.tmax + N_new_zeros * self.dt,
             N_new_zeros,
         )
-        return TimeSeries(
+        return self._from_validated(
             np.append(self.t, new_zeros_t),
             np.append(self.y, np.zeros(N_new_zeros)),
         )
@@ -455,7 +701,7 @@ class TimeSeries(BaseSeries):
         :returns: A new timeseries with zero mean
         :rtype: :py:class:`~.TimeSeries`
         """
-        return TimeSeries(self.t, self.y - self.y.mean())
+        return self._with_same_x(self.y - self.y.mean())
 
     def mean_remove(self):
         """Remove the mean value from the data."""
@@ -523,7 +769,7 @@ class TimeSeries(BaseSeries):
         :returns: A new timeseries with time shifted
         :rtype: :py:class:`~.TimeSeries`
         """
-        return TimeSeries(self.t + tshift, self.y)
+        return self._from_validated(self.t + tshift, _shared_view(self.y))
 
     def time_shift(self, tshift):
         """Shift the timeseries by tshift (what was t = 0 will be tshift).
@@ -544,7 +790,7 @@ class TimeSeries(BaseSeries):
         :returns: A new timeseries with phase shifted
         :rtype: :py:class:`~.TimeSeries`
         """
-        return TimeSeries(self.t, self.y * np.exp(1j * pshift))
+        return self._with_same_x(self.y * np.exp(1j * pshift))
 
     def phase_shift(self, pshift):
         """Shift the complex phase timeseries by pshift. If the signal is real,
@@ -585,7 +831,10 @@ class TimeSeries(BaseSeries):
 
         """
         factor = unit if inverse else 1 / unit
-        return TimeSeries(self.t * factor, self.y)
+        return self._from_validated(
+            self._return_array_if_monotonic(self.t * factor),
+            _shared_view(self.y),
+        )
 
     def time_unit_change(self, unit, inverse=False):
         """Rescale time units by unit.
@@ -648,7 +897,7 @@ class TimeSeries(BaseSeries):
         :rtype:     :py:class:`~.TimeSeries`
 
         """
-        ret = TimeSeries(self.t, unfold_phase(np.angle(self.y)))
+        ret = self._with_same_x(unfold_phase(np.angle(self.y)))
         if t_of_zero_phase is not None:
             ret -= ret(t_of_zero_phase)
         return ret
@@ -724,7 +973,7 @@ class TimeSeries(BaseSeries):
 
         if callable(window_function):
             window_array = window_function(len(self), *args, **kwargs)
-            return TimeSeries(self.t, self.y * window_array)
+            return self._with_same_x(self.y * window_array)
 
         if isinstance(window_function, str):
             window_function_method = f"{window_function}_windowed"
@@ -806,7 +1055,7 @@ class TimeSeries(BaseSeries):
         """
         if not self.is_regularly_sampled():
             warnings.warn(
-                "TimeSeries is not regularly samples. Resampling.",
+                "TimeSeries is not regularly sampled. Resampling.",
                 RuntimeWarning,
             )
             ts = self.regular_resampled()
@@ -851,7 +1100,7 @@ class TimeSeries(BaseSeries):
         """
         if not self.is_regularly_sampled():
             warnings.warn(
-                "TimeSeries is not regularly samples. Resampling.",
+                "TimeSeries is not regularly sampled. Resampling.",
                 RuntimeWarning,
             )
             regular_ts = self.regular_resampled()
@@ -876,3 +1125,523 @@ class TimeSeries(BaseSeries):
         # transform this into an integral (true Fourier transform), we have to
         # multiply this by the measure of integration.
         return frequencyseries.FrequencySeries(f, fft * dt)
+
+    def spectrogram(
+        self,
+        segment_time,
+        overlap=0.5,
+        window_function="hamming",
+        *args,
+        **kwargs,
+    ):
+        """Return the short-time Fourier transform of the timeseries.
+
+        The timeseries is divided in segments of duration segment_time that
+        overlap by the given fraction of their length. Each segment is windowed
+        with window_function (as in :py:meth:`~.windowed`, additional
+        arguments are passed to the window function) and Fourier
+        transformed (as in :py:meth:`~.to_FrequencySeries`, so, if the signal
+        is real, only positive frequencies are kept).
+
+        The output is a 2D :py:class:`~.UniformGridData` with the time of the
+        center of the segments as first coordinate and the frequency as second
+        one. The values are complex, take the absolute value to obtain the
+        amplitude.
+
+        The timeseries is regularly sampled before transforming.
+
+        :param segment_time: Duration of each segment
+        :type segment_time: float
+        :param overlap: Fraction of the segments that overlaps with the next
+                        one
+        :type overlap: float
+        :param window_function: Window function to apply to each segment
+        :type window_function: callable or str
+
+        :returns: Short-time Fourier transform
+        :rtype: :py:class:`~.UniformGridData`
+
+        """
+        if not 0 <= overlap < 1:
+            raise ValueError("overlap has to be in [0, 1)")
+
+        if not self.is_regularly_sampled():
+            warnings.warn(
+                "TimeSeries is not regularly sampled. Resampling.",
+                RuntimeWarning,
+            )
+            regular_ts = self.regular_resampled()
+        else:
+            regular_ts = self
+
+        dt = regular_ts.dt
+
+        segment_length = int(np.rint(segment_time / dt))
+
+        if not 2 <= segment_length <= len(regular_ts):
+            raise ValueError(
+                f"Invalid segment_time {segment_time} for this timeseries"
+            )
+
+        step = max(segment_length - int(np.rint(overlap * segment_length)), 1)
+
+        # We compute the window only once
+        window_array = (
+            self._from_validated(
+                regular_ts.t[:segment_length], np.ones(segment_length)
+            )
+            .windowed(window_function, *args, **kwargs)
+            .y
+        )
+
+        # segments is a read-only view of the data with shape
+        # (number of segments, segment_length), no data is copied. Segment i
+        # starts at the point i * step. (sliding_window_view would be simpler,
+        # but it requires NumPy 1.20.)
+        y = regular_ts.y
+        num_segments = (len(y) - segment_length) // step + 1
+        segments = np.lib.stride_tricks.as_strided(
+            y,
+            shape=(num_segments, segment_length),
+            strides=(step * y.strides[0], y.strides[0]),
+            writeable=False,
+        )
+
+        if self.is_complex():
+            frequencies = np.fft.fftshift(np.fft.fftfreq(segment_length, d=dt))
+            num_frequencies = segment_length
+        else:
+            frequencies = np.fft.rfftfreq(segment_length, d=dt)
+            num_frequencies = len(frequencies)
+
+        stft = np.empty((len(segments), num_frequencies), dtype=complex)
+
+        for start in range(0, len(segments), _SEGMENTS_PER_BATCH):
+            batch = (
+                segments[start : start + _SEGMENTS_PER_BATCH] * window_array
+            )
+            if self.is_complex():
+                stft[start : start + len(batch)] = np.fft.fftshift(
+                    np.fft.fft(batch, axis=1), axes=1
+                )
+            else:
+                stft[start : start + len(batch)] = np.fft.rfft(batch, axis=1)
+
+        # See to_FrequencySeries for the normalization
+        stft *= dt
+
+        grid = grid_data.UniformGrid(
+            stft.shape,
+            x0=[
+                regular_ts.tmin + (segment_length - 1) * dt / 2,
+                frequencies[0],
+            ],
+            dx=[step * dt, frequencies[1] - frequencies[0]],
+        )
+
+        return grid_data.UniformGridData(grid, stft)
+
+
+class TimeSeriesBundle:
+    """This class represents multiple time series (channels) defined on the
+    same times.
+
+    The values are stored in a 2D array with one row for each channel, so
+    operations like resampling, windowing, or taking the Fourier transform are
+    performed on all the channels at once. This is much faster than working
+    with many :py:class:`~.TimeSeries` separately (e.g., all the multipoles
+    at a given radius).
+
+    A :py:class:`~.TimeSeriesBundle` works as a dictionary that maps the
+    labels of the channels to :py:class:`~.TimeSeries`.
+
+    .. code-block:: python
+
+        bundle = TimeSeriesBundle(times, [values1, values2], ["a", "b"])
+        bundle["a"]  # TimeSeries(times, values1)
+
+    :ivar t: Times
+    :vartype t: 1D numpy array
+    :ivar y: Values, one row for each channel
+    :vartype y: 2D numpy array
+    :ivar channels: Labels of the channels
+    :vartype channels: list
+
+    """
+
+    def __init__(self, t, y, channels=None, guarantee_t_is_monotonic=False):
+        """Create a TimeSeriesBundle providing times, values, and optionally
+        the labels of the channels (by default, the channels are labeled by
+        their index).
+
+        When guarantee_t_is_monotonic is True no checks will be perform to make
+        sure that t is monotonically increasing (increasing performance).
+
+        :param t: Times
+        :type t: 1D numpy array or list
+        :param y: Values, one row for each channel
+        :type y: 2D numpy array or list of lists
+        :param channels: Labels of the channels
+        :type channels: list
+        :param guarantee_t_is_monotonic: The code will assume that t is
+                                         monotonically incresasing
+        :type guarantee_t_is_monotonic: bool
+
+        """
+        # The copy is because we don't want to change the input values
+        t = np.array(t, ndmin=1)
+        y = np.array(y, ndmin=2)
+
+        if t.ndim != 1 or y.ndim != 2:
+            raise ValueError("t has to be 1D and y has to be 2D")
+
+        if len(t) != y.shape[1]:
+            raise ValueError("Data length mismatch")
+
+        if len(t) == 0:
+            raise ValueError("Trying to construct empty TimeSeriesBundle.")
+
+        if not guarantee_t_is_monotonic:
+            if np.any(t[1:] <= t[:-1]):
+                raise ValueError("Time not monotonically increasing")
+
+        if channels is None:
+            channels = range(len(y))
+
+        self.__initialize(t, y, channels)
+
+    def __initialize(self, t, y, channels):
+        """Set the data and the labels of the channels.
+
+        This function is not meant to be called directly.
+
+        """
+        channels = list(channels)
+
+        if len(channels) != len(y):
+            raise ValueError("Number of channels mismatch")
+
+        # Here we store the row of y corresponding to each channel
+        self._channel_index = {
+            channel: index for index, channel in enumerate(channels)
+        }
+
+        if len(self._channel_index) != len(channels):
+            raise ValueError("Channels have to be unique")
+
+        self.t = t
+        self.y = y
+        self.channels = channels
+
+    @classmethod
+    def _from_validated(cls, t, y, channels):
+        """Return a new TimeSeriesBundle with the given data, without checking
+        the times and without copying the data.
+
+        This function is not meant to be called directly.
+
+        """
+        bundle = cls.__new__(cls)
+        bundle.__initialize(t, y, channels)
+        return bundle
+
+    @classmethod
+    def from_timeseries(cls, series):
+        """Create a TimeSeriesBundle from multiple :py:class:`~.TimeSeries`
+        with the same times.
+
+        :param series: Timeseries to collect, either as a dictionary that maps
+                       the labels of the channels to the timeseries, or as a
+                       list (in which case the channels are labeled by their
+                       index)
+        :type series: dict or list of :py:class:`~.TimeSeries`
+
+        :returns: Bundle with one channel for each timeseries
+        :rtype: :py:class:`~.TimeSeriesBundle`
+
+        """
+        if isinstance(series, dict):
+            channels, series = list(series.keys()), list(series.values())
+        else:
+            channels = range(len(series))
+
+        if len(series) == 0:
+            raise ValueError("Trying to construct empty TimeSeriesBundle.")
+
+        first, *others = series
+        for other in others:
+            if (len(other) != len(first)) or (
+                not np.allclose(other.t, first.t, atol=1e-14)
+            ):
+                raise ValueError("The timeseries do not have the same times")
+
+        # np.array creates new arrays, so we don't have to copy them again
+        return cls._from_validated(
+            first.t.copy(), np.array([s.y for s in series]), channels
+        )
+
+    def __getitem__(self, channel):
+        # The TimeSeries shares the data with the bundle only if the data
+        # cannot be modified
+        return TimeSeries._from_validated(
+            _shared_view(self.t),
+            _shared_view(self.y[self._channel_index[channel]]),
+        )
+
+    def __contains__(self, channel):
+        return channel in self._channel_index
+
+    def __len__(self):
+        """The number of times."""
+        return len(self.t)
+
+    def keys(self):
+        """Return the labels of the channels.
+
+        :returns: Labels of the channels
+        :rtype: list
+
+        """
+        return list(self.channels)
+
+    def to_TimeSeries(self):
+        """Return a dictionary that maps the labels of the channels to the
+        corresponding :py:class:`~.TimeSeries`.
+
+        :returns: Timeseries of each channel
+        :rtype: dict of :py:class:`~.TimeSeries`
+
+        """
+        return {channel: self[channel] for channel in self.channels}
+
+    def __eq__(self, other):
+        """Check for equality up to numerical precision."""
+        if not isinstance(other, type(self)):
+            return False
+        return (
+            self.channels == other.channels
+            and self.y.shape == other.y.shape
+            and np.allclose(self.t, other.t, atol=1e-14)
+            and np.allclose(self.y, other.y, atol=1e-14)
+        )
+
+    def copy(self):
+        """Return a deep copy.
+
+        :returns:  Deep copy of the bundle
+        :rtype:    :py:class:`~.TimeSeriesBundle`
+        """
+        return self._from_validated(
+            self.t.copy(), self.y.copy(), self.channels
+        )
+
+    @property
+    def tmin(self):
+        """Return the starting time.
+
+        :returns:  Initial time of the bundle
+        :rtype:    float
+        """
+        return self.t[0]
+
+    @property
+    def tmax(self):
+        """Return the final time.
+
+        :returns:  Final time of the bundle
+        :rtype:    float
+        """
+        return self.t[-1]
+
+    def is_regularly_sampled(self):
+        """Return whether the times are regularly spaced.
+
+        If the bundle is only one point, an error is raised.
+
+        :returns:  Is the bundle regularly sampled?
+        :rtype:    bool
+        """
+        if len(self) == 1:
+            raise RuntimeError(
+                "Bundle is only one point, "
+                "it does not make sense to compute dt"
+            )
+
+        dt = self.t[1:] - self.t[:-1]
+
+        return np.allclose(dt, dt[0], atol=1e-14)
+
+    @property
+    def dt(self):
+        """Return the delta t if the bundle is regularly sampled,
+        otherwise raise error.
+
+        :returns: Delta t
+        :rtype: float
+
+        """
+        if not self.is_regularly_sampled():
+            raise ValueError("TimeSeriesBundle is not regularly sampled")
+
+        return self.t[1] - self.t[0]
+
+    def resampled(self, new_t, ext=2, piecewise_constant=False):
+        """Return a new bundle with all the channels resampled to new_t.
+
+        The resampling is performed with a cubic interpolating spline, which is
+        the same as the default in :py:class:`~.TimeSeries`. If you want a
+        nearest neighbor resampling, pass the keyword piecewise_constant=True.
+
+        :param new_t: New times
+        :type new_t:  1D numpy array or list of float
+        :param ext: How to handle points outside the data interval
+        :type ext: 0 for extrapolation, 1 for returning zero, 2 for ValueError,
+                   3 for extending the boundary
+        :param piecewise_constant: Do not use splines, use the nearest
+                                   neighbors.
+        :type piecewise_constant: bool
+        :returns: Resampled bundle
+        :rtype:   :py:class:`~.TimeSeriesBundle`
+
+        """
+        new_t = np.array(new_t, dtype=float, ndmin=1)
+
+        # If t is the same, there's no need to resample
+        if len(self) == len(new_t):
+            if np.allclose(self.t, new_t, atol=1e-14):
+                return self.copy()
+
+        if piecewise_constant:
+            interp_function = interpolate.interp1d(
+                self.t, self.y, kind="nearest", axis=1, assume_sorted=True
+            )
+            new_y = interp_function(new_t)
+        else:
+            outside = (new_t < self.tmin) | (new_t > self.tmax)
+
+            if ext == 2 and outside.any():
+                raise ValueError("Cannot resample outside the time interval")
+
+            # One spline for all the channels
+            spline = interpolate.make_interp_spline(
+                self.t, self.y, k=3, axis=1
+            )
+
+            if ext == 3:
+                new_y = spline(np.clip(new_t, self.tmin, self.tmax))
+            else:
+                new_y = spline(new_t)
+
+            if ext == 1:
+                new_y[:, outside] = 0
+
+        return type(self)(new_t, new_y, self.channels)
+
+    def resample(self, new_t, ext=2, piecewise_constant=False):
+        """Resample all the channels to new_t.
+
+        :param new_t: New times
+        :type new_t:  1D numpy array or list of float
+        :param ext: How to handle points outside the data interval
+        :type ext: 0 for extrapolation, 1 for returning zero, 2 for ValueError,
+                   3 for extending the boundary
+        :param piecewise_constant: Do not use splines, use the nearest
+                                   neighbors.
+        :type piecewise_constant: bool
+
+        """
+        resampled = self.resampled(new_t, ext, piecewise_constant)
+        self.t, self.y = resampled.t, resampled.y
+
+    def regular_resampled(self):
+        """Return a new bundle resampled to regularly spaced times, with the
+        same number of points.
+
+        :returns: Regularly resampled bundle
+        :rtype:   :py:class:`~.TimeSeriesBundle`
+
+        """
+        return self.resampled(np.linspace(self.tmin, self.tmax, len(self)))
+
+    def windowed(self, window_function, *args, **kwargs):
+        """Return a bundle with all the channels windowed with
+        window_function.
+
+        The window is the same as in :py:meth:`~.TimeSeries.windowed`, so
+        window_function can be a function that takes as first argument the
+        number of points, or the name of a window implemented in
+        :py:class:`~.TimeSeries` (e.g., ``tukey``).
+
+        :param window_function: Window function to apply
+        :type window_function: callable or str
+
+        :returns:  New windowed bundle
+        :rtype:    :py:class:`~.TimeSeriesBundle`
+
+        """
+        # We compute the window only once using TimeSeries
+        window_array = (
+            TimeSeries._from_validated(self.t, np.ones(len(self)))
+            .windowed(window_function, *args, **kwargs)
+            .y
+        )
+        return self._from_validated(
+            self.t.copy(), self.y * window_array, self.channels
+        )
+
+    def window(self, window_function, *args, **kwargs):
+        """Apply window_function to all the channels.
+
+        :param window_function: Window function to apply
+        :type window_function: callable or str
+
+        """
+        self.y = self.windowed(window_function, *args, **kwargs).y
+
+    def to_FrequencySeries(self):
+        """Return the Fourier transform of all the channels.
+
+        The Fourier transform is the same as in
+        :py:meth:`~.TimeSeries.to_FrequencySeries`, but it is computed for all
+        the channels at once. If any of the channels is complex, all of them
+        are treated as complex (so, negative frequencies are kept).
+
+        :returns: Dictionary that maps the labels of the channels to their
+                  Fourier transform
+        :rtype: dict of :py:class:`~.FrequencySeries`
+
+        """
+        if not self.is_regularly_sampled():
+            warnings.warn(
+                "TimeSeriesBundle is not regularly sampled. Resampling.",
+                RuntimeWarning,
+            )
+            regular_bundle = self.regular_resampled()
+        else:
+            regular_bundle = self
+
+        dt = regular_bundle.dt
+
+        if np.iscomplexobj(self.y):
+            frequencies = np.fft.fftfreq(len(regular_bundle), d=dt)
+            fft = np.fft.fft(regular_bundle.y, axis=1)
+
+            f = np.fft.fftshift(frequencies)
+            fft = np.fft.fftshift(fft, axes=1)
+        else:
+            # Note the "r"
+            f = np.fft.rfftfreq(len(regular_bundle), d=dt)
+            fft = np.fft.rfft(regular_bundle.y, axis=1)
+
+        # See TimeSeries.to_FrequencySeries for the normalization
+        fft *= dt
+
+        # All the FrequencySeries share the frequencies
+        f = _frozen(f)
+
+        return {
+            channel: frequencyseries.FrequencySeries._from_validated(
+                f, fft[index]
+            )
+            for index, channel in enumerate(self.channels)
+        }
@@ -17,6 +17,7 @@
 
 import os
 import unittest
+import warnings
 from unittest import mock
 
 import h5py
@@ -61,6 +62,39 @@ class TestGridFunctionsDir(unittest.TestCase):
 
         self.assertIn("xyz", self.gd)
 
+    def test_dtype(self):
+
+        gd_single = cg.GridFunctionsDir(self.sim, dtype=np.float32)
+        gd_single.xy.num_ghost = (3, 3)
+        self.gd.xy.num_ghost = (3, 3)
+
+        # HDF5
+        P_single = gd_single.xy["P"][0]
+        P_double = self.gd.xy["P"][0]
+        self.assertEqual(P_single.dtype, np.float32)
+        self.assertEqual(P_double.dtype, np.float64)
+        for (_, _, comp_single), (_, _, comp_double) in zip(
+            P_single, P_double
+        ):
+            self.assertTrue(
+                np.allclose(comp_single.data, comp_double.data, rtol=1e-6)
+            )
+
+        # Merging the components does not change the type
+        self.assertEqual(P_single.merge_refinement_levels().dtype, np.float32)
+
+        # ASCII
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rho_single = gd_single.xy["rho_star"][0]
+        self.assertEqual(rho_single.dtype, np.float32)
+
+        # Through SimDir
+        sim_single = sd.SimDir(self.sim.path, dtype=np.float32)
+        self.assertEqual(sim_single.gf.xy.dtype, np.float32)
+        sim_single.gf.xy.num_ghost = (3, 3)
+        self.assertEqual(sim_single.gf.xy["P"][0].dtype, np.float32)
+
     def test__getitem(self):
 
         self.assertIs(self.gd["xy"], self.gd._all_griddata[(0, 1)])
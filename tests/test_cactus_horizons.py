@@ -18,6 +18,7 @@
 
 import os
 import unittest
+from unittest import mock
 
 import numpy as np
 
@@ -207,6 +208,44 @@ class TestHorizonsDir(unittest.TestCase):
                 self.qlm_shape._shape_files[1],
             )
 
+    def test_lazy_loading(self):
+
+        expected_area = self.hor._ah_vars[1]["area"]
+        expected_centroid_x = self.hor._ah_vars[1]["centroid_x"]
+        expected_mass = self.hor[0, 1].mass
+
+        with mock.patch.object(
+            ch, "load_ascii", wraps=ch.load_ascii
+        ) as load_ascii, mock.patch.object(
+            sd.cactus_scalars.OneScalar,
+            "load",
+            autospec=True,
+            side_effect=sd.cactus_scalars.OneScalar.load,
+        ) as load_scalar:
+            hor = sd.SimDir(self.files_dir).horizons
+            self.assertCountEqual(hor.available_apparent_horizons, [1, 2])
+            self.assertCountEqual(hor.available_qlm_horizons, [0, 1, 2])
+            # No data is read to find the horizons
+            load_ascii.assert_not_called()
+            load_scalar.assert_not_called()
+
+            area = hor._ah_vars[1]["area"]
+            # Each file of the horizon is read once for all the variables
+            self.assertEqual(load_ascii.call_count, len(hor._ah_files[1]))
+            self.assertEqual(area, expected_area)
+            self.assertEqual(
+                hor._ah_vars[1]["centroid_x"], expected_centroid_x
+            )
+            self.assertIs(hor._ah_vars[1]["area"], area)
+            self.assertEqual(load_ascii.call_count, len(hor._ah_files[1]))
+            self.assertNotIn(2, hor._ah_timeseries)
+            self.assertNotIn("hey", hor._ah_vars[1])
+
+            # Only mass is read
+            self.assertEqual(hor._qlm_vars[0]["mass"], expected_mass)
+            self.assertGreater(load_scalar.call_count, 0)
+            self.assertNotIn("spin", hor._qlm_vars[0]._cache)
+
 
 class TestOneHorizon(unittest.TestCase):
     def setUp(self):
@@ -272,6 +311,29 @@ class TestOneHorizon(unittest.TestCase):
         self.assertIs(self.sh.shape_time_min, None)
         self.assertIs(self.sh.shape_time_max, None)
 
+    def test_lazy_shape_times(self):
+
+        expected_times = self.ho.shape_times
+
+        with mock.patch.object(
+            ch, "load_ascii", wraps=ch.load_ascii
+        ) as load_ascii:
+            ho = sd.SimDir(self.files_dir).horizons[(0, 1)]
+            # The AH data is not read to build the horizon
+            load_ascii.assert_not_called()
+            self.assertCountEqual(ho.shape_times, expected_times)
+            self.assertGreater(load_ascii.call_count, 0)
+            self.assertEqual(ho.shape_time_min, expected_times[0])
+            self.assertEqual(ho.shape_time_max, expected_times[-1])
+
+        # The times can be set manually when there is no AH data
+        self.sh.shape_times = expected_times
+        self.assertEqual(self.sh.shape_time_min, expected_times[0])
+        self.assertEqual(self.sh.shape_time_max, expected_times[-1])
+
+        # Shape attributes are not defined without shape files
+        self.assertFalse(hasattr(self.ah, "shape_times"))
+
     def test__getitem(self):
 
         # Test key not available
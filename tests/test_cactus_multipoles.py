@@ -15,7 +15,9 @@
 # You should have received a copy of the GNU General Public License along with
 # this program; if not, see <https://www.gnu.org/licenses/>.
 
+import os
 import unittest
+from unittest import mock
 
 import h5py
 import numpy as np
@@ -105,6 +107,16 @@ class TestCactusMultipoles(unittest.TestCase):
         self.assertIn("(2, 2)", mult1.__str__())
         self.assertIn("missing", mult3.__str__())
 
+        # test to_TimeSeriesBundle()
+        data4 = [(2, 2, self.ts1), (2, -2, self.ts1 * 2)]
+        bundle = mp.MultipoleOneDet(100, data4).to_TimeSeriesBundle()
+        self.assertEqual(bundle.channels, [(2, -2), (2, 2)])
+        self.assertEqual(bundle[(2, -2)], self.ts1 * 2)
+
+        # Different times
+        with self.assertRaises(ValueError):
+            mult2.to_TimeSeriesBundle()
+
     def test_total_function_on_available_lm(self):
 
         # The two series must have the same times
@@ -261,3 +273,83 @@ class TestCactusMultipoles(unittest.TestCase):
 
         # test __str__()
         self.assertIn("harmonic", cacdir.__str__())
+
+        # h5 files are read lazily, one dataset at the time
+        cacdir_lazy = mp.MultipolesDir(sim)
+        with mock.patch.object(
+            mp.MultipolesDir,
+            "_multipole_from_h5dataset",
+            side_effect=mp.MultipolesDir._multipole_from_h5dataset,
+        ) as read_dataset:
+            harmonic = cacdir_lazy["harmonic"]
+            read_dataset.assert_not_called()
+            self.assertCountEqual(harmonic.radii, [4.0, 8.0])
+            self.assertEqual(harmonic[8.00](2, 2), ts_h5)
+            read_dataset.assert_called_once_with(
+                os.path.abspath(path_h5), "l2_m2_r8.00"
+            )
+            # Repeated reads are served from the cache
+            self.assertEqual(harmonic[8.00](2, 2), ts_h5)
+            read_dataset.assert_called_once()
+            # Copies do not read the data
+            harmonic.copy()
+            read_dataset.assert_called_once()
+        self.assertEqual(harmonic, cacdir["harmonic"])
+
+        # When all the multipoles are needed, each file is opened only once
+        cacdir_batch = mp.MultipolesDir(sim)
+        with mock.patch.object(
+            mp.MultipolesDir,
+            "_multipoles_from_h5datasets",
+            side_effect=mp.MultipolesDir._multipoles_from_h5datasets,
+        ) as read_datasets, mock.patch.object(
+            mp.h5py, "File", wraps=mp.h5py.File
+        ) as h5file:
+            harmonic = cacdir_batch["harmonic"]
+            # Only the index
+            self.assertEqual(h5file.call_count, 1)
+            self.assertEqual(len(list(harmonic[4.0])), 9)
+            read_datasets.assert_called_once()
+            self.assertEqual(h5file.call_count, 2)
+            self.assertEqual(harmonic, cacdir["harmonic"])
+            # The other detector
+            self.assertEqual(read_datasets.call_count, 2)
+            self.assertEqual(h5file.call_count, 3)
+
+        # Jobs for SimDir.preload, only what was not read is included. There
+        # is one job for each file, with all the needed datasets.
+        cacdir_jobs = mp.MultipolesDir(sim)
+        jobs = cacdir_jobs._jobs_to_preload("harmonic", [4.0])
+        self.assertEqual(len(jobs), 1)
+        function, argument, callback = jobs[0]
+        self.assertEqual(len(argument[1]), 9)
+        callback(function(argument))
+        self.assertEqual(len(cacdir_jobs._h5datasets_data), 9)
+        jobs = cacdir_jobs._jobs_to_preload("harmonic")
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(len(jobs[0][1][1]), 9)
+        # The data is removed from the cache when it is used
+        list(cacdir_jobs["harmonic"][4.0])
+        self.assertEqual(len(cacdir_jobs._h5datasets_data), 0)
+        # and it is not read again, only the 9 multipoles at r = 8 are left
+        self.assertEqual(
+            len(cacdir_jobs._jobs_to_preload("harmonic")[0][1][1]), 9
+        )
+        self.assertEqual(
+            len(cacdir_jobs._jobs_to_preload("phi2", [110.69])), 5
+        )
+        with self.assertRaises(KeyError):
+            cacdir_jobs._jobs_to_preload("bubu")
+
+        # Reading the files concurrently gives the same result
+        for use_processes in (False, True):
+            cacdir_parallel = mp.MultipolesDir(
+                sim, num_workers=2, use_processes=use_processes
+            )
+            self.assertEqual(cacdir_parallel["psi4"], cacdir["psi4"])
+            self.assertEqual(cacdir_parallel["harmonic"], cacdir["harmonic"])
+
+        # The option is passed from SimDir
+        self.assertEqual(
+            sd.SimDir("tests/tov", num_workers=3).multipoles.num_workers, 3
+        )
@@ -17,7 +17,10 @@
 
 import os
 import re
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 
@@ -52,6 +55,9 @@ class TestCactusScalar(unittest.TestCase):
         asc_carp = cs.OneScalar(path)
 
         self.assertTrue(asc_carp._is_one_file_per_group)
+        # The header is scanned only when the variables are needed
+        self.assertFalse(asc_carp._was_header_scanned)
+        self.assertIn("time_total", asc_carp.keys())
         self.assertTrue(asc_carp._was_header_scanned)
         self.assertIn("current_physical_time_per_hour", asc_carp._vars)
         self.assertEqual(asc_carp._vars["current_physical_time_per_hour"], 13)
@@ -64,6 +70,8 @@ class TestCactusScalar(unittest.TestCase):
         asc_gz = cs.OneScalar(path)
 
         self.assertTrue(asc_gz._is_one_file_per_group)
+        self.assertFalse(asc_gz._was_header_scanned)
+        self.assertIn("eps", asc_gz)
         self.assertTrue(asc_gz._was_header_scanned)
         self.assertEqual(asc_gz.reduction_type, "minimum")
         self.assertEqual(asc_gz._compression_method, "gz")
@@ -73,6 +81,7 @@ class TestCactusScalar(unittest.TestCase):
         path = "tests/tov/output-0000/static_tov/hydrobase-eps.minimum.asc.bz2"
         asc_bz = cs.OneScalar(path)
         self.assertEqual(asc_bz._compression_method, "bz2")
+        self.assertEqual(asc_bz.keys(), ["eps"])
         self.assertDictEqual(asc_bz._vars, {"eps": 2})
 
     def test_OneScalar_magic_methods(self):
@@ -106,11 +115,87 @@ class TestCactusScalar(unittest.TestCase):
             {"press": 2},
         )
 
+    def test_load_ascii(self):
+
+        path = "tests/tov/output-0000/static_tov/carpet-timing..asc"
+        path_gz = (
+            "tests/tov/output-0000/static_tov/hydrobase-eps.minimum.asc.gz"
+        )
+        path_bz = (
+            "tests/tov/output-0000/static_tov/hydrobase-eps.minimum.asc.bz2"
+        )
+
+        with tempfile.TemporaryDirectory() as folder:
+            # File with blank lines, comments in the middle and at the end of
+            # lines
+            path_comments = os.path.join(folder, "comments.asc")
+            with open(path_comments, "w") as test_file:
+                test_file.write("# header\n1 2 3\n\n  \n# comment\n4 5 6\n")
+            path_inline = os.path.join(folder, "inline.asc")
+            with open(path_inline, "w") as test_file:
+                test_file.write("1 2 3 # comment\n4 5 6\n")
+            # Files with lines that are too short (e.g., the last line of a
+            # file that is being written), which have the same number of
+            # values as a file with complete lines
+            path_short_last = os.path.join(folder, "short_last.asc")
+            with open(path_short_last, "w") as test_file:
+                test_file.write("1 2 3\n4 5 6\n7 8 9 10\n11 12")
+            path_short_middle = os.path.join(folder, "short_middle.asc")
+            with open(path_short_middle, "w") as test_file:
+                test_file.write("1 2 3\n4 5\n6 7 8 9\n10 11 12\n")
+
+            def check_all_backends():
+                for file_ in (
+                    path,
+                    path_gz,
+                    path_bz,
+                    path_comments,
+                    path_inline,
+                ):
+                    for usecols in (None, (2, 0)):
+                        with self.subTest(file_=file_, usecols=usecols):
+                            self.assertTrue(
+                                np.array_equal(
+                                    cau.load_ascii(file_, usecols=usecols),
+                                    np.loadtxt(
+                                        file_, ndmin=2, usecols=usecols
+                                    ),
+                                )
+                            )
+                # Lines that are too short are an error
+                for file_ in (path_short_last, path_short_middle):
+                    with self.subTest(file_=file_):
+                        with self.assertRaises(ValueError):
+                            cau.load_ascii(file_)
+
+            check_all_backends()
+
+            # Old versions of NumPy, without pandas
+            with mock.patch.object(cau, "_NUMPY_HAS_FAST_LOADTXT", False):
+                with mock.patch.object(cau, "pandas", None):
+                    check_all_backends()
+
+                    # np.fromstring is used when possible
+                    with mock.patch(
+                        "numpy.loadtxt", wraps=np.loadtxt
+                    ) as mock_loadtxt:
+                        cau.load_ascii(path_comments)
+                        mock_loadtxt.assert_not_called()
+                        cau.load_ascii(path_inline)
+                        mock_loadtxt.assert_called_once()
+
+                    # Errors are the same as np.loadtxt
+                    with self.assertRaises(ValueError):
+                        cau.load_ascii(path_comments, usecols=(10,))
+
+                # With pandas, if available
+                if cau.pandas is not None:
+                    check_all_backends()
+
     def test__scan_header(self):
         # This also tests the module scan_header
 
-        # __init__ scans the header for some files, so to debug this it may be
-        # useful to comment that section temporarily
+        # The header is scanned when the variables are listed
 
         # Here we test if the errors are raised
 
@@ -120,7 +205,7 @@ class TestCactusScalar(unittest.TestCase):
             test_file.write("# column format: 1:data")
 
         with self.assertRaises(RuntimeError):
-            cs.OneScalar(path)
+            cs.OneScalar(path).keys()
         os.remove(path)
 
         path = "no-data..asc"
@@ -129,7 +214,7 @@ class TestCactusScalar(unittest.TestCase):
             test_file.write("# column format: 1:time")
 
         with self.assertRaises(RuntimeError):
-            cs.OneScalar(path)
+            cs.OneScalar(path).keys()
 
         os.remove(path)
 
@@ -159,6 +244,223 @@ class TestCactusScalar(unittest.TestCase):
         asc = cs.OneScalar(path)
         vel = asc.load("vel[0]")
 
+    def test_load_columns_once(self):
+
+        path = "tests/tov/output-0000/static_tov/carpet-timing..asc"
+        t, y1, y2 = np.loadtxt(path, ndmin=2, unpack=True, usecols=(8, 13, 14))
+
+        # The file is parsed only once
+        asc = cs.OneScalar(path)
+        with mock.patch("numpy.loadtxt", wraps=np.loadtxt) as mock_loadtxt:
+            self.assertEqual(
+                asc["current_physical_time_per_hour"], ts.TimeSeries(t, y1)
+            )
+            self.assertEqual(asc["time_total"], ts.TimeSeries(t, y2))
+            self.assertEqual(mock_loadtxt.call_count, 1)
+
+        # The data is shared and cannot be modified
+        self.assertTrue(
+            np.shares_memory(
+                asc["time_total"].t, asc["current_physical_time_per_hour"].t
+            )
+        )
+        with self.assertRaises(ValueError):
+            asc["time_total"].y[0] = 1
+
+        # Keeping only the requested columns
+        asc = cs.OneScalar(path, keep_all_columns=False)
+        with mock.patch("numpy.loadtxt", wraps=np.loadtxt) as mock_loadtxt:
+            self.assertEqual(
+                asc["current_physical_time_per_hour"], ts.TimeSeries(t, y1)
+            )
+            self.assertCountEqual(asc._columns.keys(), [8, 13])
+            self.assertEqual(asc["time_total"], ts.TimeSeries(t, y2))
+            self.assertCountEqual(asc._columns.keys(), [8, 13, 14])
+            self.assertEqual(mock_loadtxt.call_count, 2)
+
+        # The option is passed from SimDir
+        sim = sd.SimDir("tests/tov", keep_all_columns=False)
+        self.assertEqual(sim.ts.scalar["time_total"], ts.TimeSeries(t, y2))
+        for one_scalar in sim.ts.scalar._vars["time_total"].values():
+            self.assertFalse(one_scalar.keep_all_columns)
+            self.assertCountEqual(one_scalar._columns.keys(), [8, 14])
+
+        # Preloading reads only the requested columns too
+        sim = sd.SimDir("tests/tov", keep_all_columns=False)
+        sim.preload({"ts": {"scalar": ["time_total"]}})
+        for one_scalar in sim.ts.scalar._vars["time_total"].values():
+            self.assertCountEqual(one_scalar._columns.keys(), [8, 14])
+        sim.preload({"ts": {"scalar": ["current_physical_time_per_hour"]}})
+        for one_scalar in sim.ts.scalar._vars["time_total"].values():
+            self.assertCountEqual(one_scalar._columns.keys(), [8, 13, 14])
+
+    def test_incremental(self):
+
+        with self.assertRaises(ValueError):
+            cs.OneScalar(
+                "hydrobase-rho.maximum.asc",
+                use_npy_cache=True,
+                incremental=True,
+            )
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "hydrobase-rho.maximum.asc")
+
+            with open(path, "w") as test_file:
+                test_file.write("# 1:iteration 2:time 3:data\n")
+                test_file.write("# data columns: 3:rho\n")
+
+            asc = cs.OneScalar(path, incremental=True)
+
+            # No data yet
+            with self.assertRaises(RuntimeError):
+                asc["rho"]
+
+            with open(path, "a") as test_file:
+                test_file.write("0 0 10\n1 1 11\n2 2 12\n3 3")
+
+            # The last line is incomplete, so it is not read
+            self.assertEqual(
+                asc["rho"], ts.TimeSeries([0, 1, 2], [10, 11, 12])
+            )
+
+            with open(path, "a") as test_file:
+                test_file.write(" 13\n4 4 14\n")
+
+            # Only the new lines are read
+            with mock.patch(
+                "postcactus.cactus_scalars.load_ascii", wraps=cs.load_ascii
+            ) as mock_load:
+                self.assertEqual(
+                    asc["rho"],
+                    ts.TimeSeries([0, 1, 2, 3, 4], [10, 11, 12, 13, 14]),
+                )
+                self.assertEqual(
+                    mock_load.call_args[0][0].getvalue(), "3 3 13\n4 4 14\n"
+                )
+                # Nothing new
+                asc["rho"]
+                mock_load.assert_called_once()
+
+            # Restart from an earlier time
+            with open(path, "a") as test_file:
+                test_file.write("# restart\n3 3 23\n4 4 24\n5 5 25\n")
+            self.assertEqual(
+                asc["rho"],
+                ts.TimeSeries([0, 1, 2, 3, 4, 5], [10, 11, 12, 23, 24, 25]),
+            )
+
+            # Same as reading the file from scratch
+            self.assertEqual(asc["rho"], cs.OneScalar(path)["rho"])
+
+            # The file is rewritten
+            with open(path, "w") as test_file:
+                test_file.write("# 1:iteration 2:time 3:data\n")
+                test_file.write("# data columns: 3:rho\n")
+                test_file.write("0 0 30\n")
+            self.assertEqual(asc["rho"], ts.TimeSeries([0], [30]))
+
+            # A new SimDir reads only the lines appended since the last time
+            sd.SimDir(folder, incremental=True).ts.maximum["rho"]
+            with open(path, "a") as test_file:
+                test_file.write("1 1 31\n")
+            with mock.patch(
+                "postcactus.cactus_scalars.load_ascii", wraps=cs.load_ascii
+            ) as mock_load:
+                self.assertEqual(
+                    sd.SimDir(folder, incremental=True).ts.maximum["rho"],
+                    ts.TimeSeries([0, 1], [30, 31]),
+                )
+                mock_load.assert_called_once()
+                self.assertEqual(
+                    mock_load.call_args[0][0].getvalue(), "1 1 31\n"
+                )
+                # Nothing new
+                sd.SimDir(folder, incremental=True).ts.maximum["rho"]
+                mock_load.assert_called_once()
+
+        # Through SimDir, the data is updated every time it is requested
+        sim = sd.SimDir("tests/tov", incremental=True)
+        self.assertTrue(sim.ts.maximum.incremental)
+        self.assertIsNot(sim.ts.maximum["rho"], sim.ts.maximum["rho"])
+        self.assertEqual(
+            sim.ts.maximum["rho"], sd.SimDir("tests/tov").ts.maximum["rho"]
+        )
+
+    def test_npy_cache(self):
+
+        # We work on a copy of the file, with duplicated iterations
+        original = "tests/tov/output-0000/static_tov/carpet-timing..asc"
+        path = "carpet-timing..asc"
+        with open(original) as original_file:
+            lines = original_file.readlines()
+        data_lines = [line for line in lines if not line.startswith("#")]
+        with open(path, "w") as test_file:
+            test_file.writelines(lines + data_lines[-3:])
+
+        var = "current_physical_time_per_hour"
+        expected = cs.OneScalar(original)[var]
+
+        asc = cs.OneScalar(path, use_npy_cache=True)
+        self.assertEqual(asc.npy_cache_path, path + ".npy")
+        self.assertFalse(os.path.exists(asc.npy_cache_path))
+
+        loaded = asc[var]
+        self.assertTrue(os.path.exists(asc.npy_cache_path))
+        self.assertIsInstance(loaded.y, np.memmap)
+        self.assertEqual(loaded, expected)
+        self.assertEqual(
+            asc["time_total"], cs.OneScalar(original)["time_total"]
+        )
+
+        # The data cannot be modified, but derived series can
+        with self.assertRaises(ValueError):
+            loaded.y[0] = 1
+        self.assertEqual(
+            loaded.cropped(init=1).tmin, expected.cropped(init=1).tmin
+        )
+        self.assertEqual(loaded.time_at_maximum(), expected.time_at_maximum())
+        loaded.time_shift(1)
+        loaded.y[0] = 1
+
+        # The cache is used the next time
+        with mock.patch("numpy.loadtxt") as mock_loadtxt:
+            self.assertEqual(
+                cs.OneScalar(path, use_npy_cache=True)[var], expected
+            )
+            mock_loadtxt.assert_not_called()
+
+        # The cache is recreated if the file is more recent
+        with open(path, "w") as test_file:
+            test_file.writelines(lines[:-1])
+        cache_time = os.path.getmtime(asc.npy_cache_path)
+        os.utime(path, (cache_time + 10, cache_time + 10))
+        self.assertEqual(
+            len(cs.OneScalar(path, use_npy_cache=True)[var]), len(expected) - 1
+        )
+
+        os.remove(path)
+        os.remove(path + ".npy")
+
+        # The option is passed from SimDir
+        sim = sd.SimDir("tests/tov", use_npy_cache=True)
+        for one_scalar in sim.ts.average._vars["rho"].values():
+            self.assertTrue(one_scalar.use_npy_cache)
+
+        # The data read through SimDir is still memory-mapped when there is
+        # only one file (combine_ts does not copy it)
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copy(original, folder)
+            sim = sd.SimDir(folder, use_npy_cache=True)
+            loaded = sim.ts.scalar[var]
+            self.assertTrue(
+                os.path.exists(os.path.join(folder, path + ".npy"))
+            )
+            self.assertIsInstance(loaded.y.base, np.memmap)
+            self.assertFalse(loaded.t.flags.writeable)
+            self.assertFalse(loaded.y.flags.writeable)
+            self.assertEqual(loaded, expected)
+
     def test_AllScalars(self):
 
         sim = sd.SimDir("tests/tov")
@@ -217,6 +519,15 @@ class TestCactusScalar(unittest.TestCase):
 
         self.assertEqual(1, reader.get("bubu", default=1))
 
+        bundle = reader.to_TimeSeriesBundle(["eps", "press"])
+        self.assertEqual(bundle.channels, ["eps", "press"])
+        self.assertEqual(bundle["eps"], reader["eps"])
+        self.assertEqual(bundle["press"], reader["press"])
+
+        # Different times
+        with self.assertRaises(ValueError):
+            reader.to_TimeSeriesBundle()
+
     def test_ScalarsDir(self):
 
         # Not a SimDir
@@ -236,3 +547,124 @@ class TestCactusScalar(unittest.TestCase):
         # Check string representation
         # (this is a very weak check...)
         self.assertIn("io_count", scaldir.__str__())
+
+    def test_all_reductions_in_one_file(self):
+
+        path = "tests/tov/output-0000/static_tov/alp.scalars.asc"
+        asc = cs.OneScalar(path)
+        self.assertTrue(asc._all_reductions_in_one_file)
+        self.assertEqual(asc.reduction_type, "scalars")
+        self.assertEqual(
+            asc.keys(),
+            [
+                "alp(minimum)",
+                "alp(maximum)",
+                "alp(average)",
+                "alp(norm1)",
+                "alp(norm2)",
+            ],
+        )
+        t, y = np.loadtxt(path, ndmin=2, unpack=True, usecols=(1, 3))
+        self.assertEqual(asc["alp(maximum)"], ts.TimeSeries(t, y))
+
+        # In the tov folder, there are also the files with one reduction for
+        # alp, which take precedence
+        scaldir = cs.ScalarsDir(sd.SimDir("tests/tov"))
+        for one_scalar in scaldir.maximum._vars["alp"].values():
+            self.assertIsInstance(one_scalar, cs.OneScalar)
+
+        folder = "all_reductions_test"
+        os.mkdir(folder)
+        with open(os.path.join(folder, "hydrobase-rho.scalars.asc"), "w") as f:
+            f.write("# 1:iteration 2:time 3:data\n")
+            f.write(
+                "# data columns: 3:rho(minimum) 4:rho(maximum) "
+                "5:rho(norm_inf) 6:press(minimum)\n"
+            )
+            f.write("0 0 1 2 3 4\n1 1 5 6 7 8\n")
+
+        scaldir = cs.ScalarsDir(sd.SimDir(folder))
+
+        # The file is parsed once for all the reductions
+        with mock.patch(
+            "postcactus.cactus_scalars.load_ascii", wraps=cs.load_ascii
+        ) as mock_load:
+            self.assertCountEqual(scaldir.minimum.keys(), ["rho", "press"])
+            self.assertEqual(scaldir.maximum.keys(), ["rho"])
+            self.assertEqual(scaldir.average.keys(), [])
+            self.assertIn("rho", scaldir.infnorm)
+            self.assertEqual(
+                scaldir.minimum["rho"], ts.TimeSeries([0, 1], [1, 5])
+            )
+            self.assertEqual(
+                scaldir.maximum["rho"], ts.TimeSeries([0, 1], [2, 6])
+            )
+            self.assertEqual(
+                scaldir.infnorm["rho"], ts.TimeSeries([0, 1], [3, 7])
+            )
+            self.assertEqual(
+                scaldir.minimum["press"], ts.TimeSeries([0, 1], [4, 8])
+            )
+            mock_load.assert_called_once()
+
+        shutil.rmtree(folder)
+
+    def test_parallel_loading(self):
+
+        with self.assertRaises(ValueError):
+            cs.AllScalars([], "average", incremental=True, use_processes=True)
+
+        allfiles = sd.SimDir("tests/tov").allfiles
+        reader = cs.AllScalars(allfiles, "average")
+
+        for use_processes in (False, True):
+            reader_parallel = cs.AllScalars(
+                allfiles,
+                "average",
+                num_workers=2,
+                use_processes=use_processes,
+            )
+            self.assertEqual(reader_parallel["rho"], reader["rho"])
+
+        # The option is passed from SimDir
+        sim = sd.SimDir("tests/tov", num_workers=2, use_processes=True)
+        self.assertEqual(sim.ts.average.num_workers, 2)
+        self.assertTrue(sim.ts.average.use_processes)
+
+    def test_ScalarsDir_lazy(self):
+
+        sim = sd.SimDir("tests/tov")
+        num_scalar_files = len(
+            cs._classify_scalar_files(sim.allfiles)["average"]
+        )
+
+        # The file names are parsed only once, and no header is scanned
+        with mock.patch.object(
+            cs.OneScalar,
+            "_scan_header",
+            autospec=True,
+            side_effect=cs.OneScalar._scan_header,
+        ) as scan_header, mock.patch.object(
+            cs.OneScalar,
+            "__init__",
+            autospec=True,
+            side_effect=cs.OneScalar.__init__,
+        ) as init:
+            scaldir = cs.ScalarsDir(sim)
+            self.assertEqual(
+                init.call_count, len(sim._files_by_kind["scalars"])
+            )
+            scan_header.assert_not_called()
+
+            # The same files are shared by point and scalar
+            self.assertIs(scaldir.point, scaldir.scalar)
+            self.assertEqual(len(scaldir.average._files), num_scalar_files)
+
+            # Listing the variables scans the headers of the files with
+            # multiple variables and that reduction, once
+            self.assertIn("rho", scaldir.average.keys())
+            num_scans = scan_header.call_count
+            self.assertGreater(num_scans, 0)
+            self.assertLessEqual(num_scans, num_scalar_files)
+            self.assertIn("rho", scaldir.average.fields.keys())
+            self.assertEqual(scan_header.call_count, num_scans)
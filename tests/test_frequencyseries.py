@@ -110,6 +110,15 @@ class TestFrequencySeries(unittest.TestCase):
         self.assertLessEqual(fs_copy.fmax, 1.5)
         self.assertGreaterEqual(np.amin(np.abs(fs_copy.f)), 0.5)
 
+        # Removing all the frequencies is an error
+        positive = fs.FrequencySeries(np.linspace(1, 10, 10), np.ones(10))
+        with self.assertRaises(ValueError):
+            positive.low_passed(0.5)
+        with self.assertRaises(ValueError):
+            positive.high_passed(11)
+        with self.assertRaises(ValueError):
+            positive.band_passed(20, 30)
+
     def test_negative_frequencies_remove(self):
 
         fs_copy = self.FS.copy()
@@ -118,6 +127,10 @@ class TestFrequencySeries(unittest.TestCase):
         fs_copy.negative_frequencies_remove()
         self.assertGreaterEqual(fs_copy.fmin, 0)
 
+        negative = fs.FrequencySeries(np.linspace(-10, -1, 10), np.ones(10))
+        with self.assertRaises(ValueError):
+            negative.negative_frequencies_removed()
+
     def test_peaks(self):
 
         # From a sin wave we are expecting two peaks
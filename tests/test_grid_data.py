@@ -133,6 +133,11 @@ class TestUniformGrid(unittest.TestCase):
         # Hopefully it is fine to hardcode the expected hash
         self.assertEqual(hash(geom4), 3458957428635756327)
 
+        # The hash is cached, and it is preserved by copies, so grids can be
+        # used as keys in dictionaries
+        cache = {geom4: 1}
+        self.assertEqual(cache[geom4.copy()], 1)
+
     def test_coordinate_to_indices(self):
         geom = gd.UniformGrid([101, 51], x0=[1, 2], dx=[1, 0.5])
         # Scalar input
@@ -233,6 +238,28 @@ class TestUniformGrid(unittest.TestCase):
         self.assertTrue(
             np.allclose(shaped_array[0][:, 0], geom4.coordinates()[0])
         )
+        self.assertTrue(
+            np.allclose(shaped_array[1], np.indices(geom4.shape)[1] * 0.5 + 2)
+        )
+
+        # The coordinates are cached and read-only
+        self.assertIs(geom4.coordinates_1d[0], geom4.coordinates_1d[0])
+        self.assertIs(
+            geom4.coordinates(as_same_shape=True)[0],
+            geom4.coordinates(as_same_shape=True)[0],
+        )
+        with self.assertRaises(ValueError):
+            geom4.coordinates_1d[0][0] = 2
+        # Modifying the returned list does not change the cache
+        coords = geom4.coordinates_1d
+        coords[0] = None
+        self.assertIsNotNone(geom4.coordinates_1d[0])
+
+        # The grid is immutable
+        with self.assertRaises(ValueError):
+            geom4.x0[0] = 2
+        with self.assertRaises(AttributeError):
+            geom4.new_attribute = 2
 
     def test__getitem__(self):
 
@@ -484,6 +511,13 @@ class TestUniformGridData(unittest.TestCase):
 
         self.assertTrue(ug_data_c.is_complex())
 
+        # Single precision
+        ug_data_c64 = gd.UniformGridData(
+            self.geom, (1j * data).astype(np.complex64)
+        )
+
+        self.assertTrue(ug_data_c64.is_complex())
+
     def test_flat_dimensions_remove(self):
 
         geom = gd.UniformGrid([101, 1], x0=[0, 0], dx=[0.01, 1])
@@ -673,6 +707,30 @@ class TestUniformGridData(unittest.TestCase):
             gd.UniformGridData(geom2d, data2d),
         )
 
+        # Test vectorized
+        self.assertEqual(
+            gd.sample_function_from_uniformgrid(
+                square, geom2d, vectorized=True
+            ),
+            gd.UniformGridData(geom2d, data2d),
+        )
+        self.assertEqual(
+            gd.sample_function(
+                square, [100, 200], [0, 1], [1, 2], vectorized=True
+            ),
+            gd.UniformGridData(geom2d, data2d),
+        )
+
+        # Test vectorized function that does not depend on all the coordinates
+        self.assertEqual(
+            gd.sample_function_from_uniformgrid(
+                lambda x, y: x, geom2d, vectorized=True
+            ),
+            gd.UniformGridData(
+                geom2d, geom2d.coordinates(as_same_shape=True)[0]
+            ),
+        )
+
     def test_slice(self):
 
         grid_data = gd.sample_function_from_uniformgrid(
@@ -1016,9 +1074,29 @@ class TestUniformGridData(unittest.TestCase):
         self.assertEqual(resampled.grid, new_grid)
         self.assertTrue(np.allclose(resampled.data, exp_resampled.data))
 
+        # Test that evaluating in multiple chunks gives the same result
+        points_per_chunk = gd._POINTS_PER_CHUNK
+        gd._POINTS_PER_CHUNK = 300
+        try:
+            resampled_chunks = prod_data_complex.resampled(new_grid)
+        finally:
+            gd._POINTS_PER_CHUNK = points_per_chunk
+        self.assertEqual(resampled_chunks, resampled)
+
         # Check that the method of the spline is linear
         self.assertEqual(prod_data_complex.spline_imag.method, "linear")
 
+        # Check that resampling preserves single precision
+        prod_data_single = gd.UniformGridData(
+            prod_data_complex.grid,
+            prod_data_complex.data.astype(np.complex64),
+        )
+        resampled_single = prod_data_single.resampled(new_grid)
+        self.assertEqual(resampled_single.dtype, np.complex64)
+        self.assertTrue(
+            np.allclose(resampled_single.data, exp_resampled.data, rtol=1e-5)
+        )
+
         # Test using nearest interpolation
         resampled_nearest = prod_data_complex.resampled(
             new_grid, piecewise_constant=True
@@ -1282,6 +1360,52 @@ class TestHierarchicalGridData(unittest.TestCase):
         hg3 = gd.HierarchicalGridData(self.grid_data_two_comp)
         self.assertEqual(hg3.grid_data_dict[0], self.grid_data_two_comp)
 
+    def test__components_cover_grid(self):
+
+        cover = gd.HierarchicalGridData._components_cover_grid
+
+        self.assertTrue(cover(self.expected_grid, self.grid_data))
+        # Missing pieces
+        self.assertFalse(cover(self.expected_grid, self.grid_data_two_comp))
+
+        # Overlapping components that cover the grid
+        self.assertTrue(
+            cover(
+                self.expected_grid,
+                self.grid_data + [self.expected_data],
+            )
+        )
+
+        # Overlapping components that do not cover the grid, but have more
+        # points than the grid
+        self.assertFalse(
+            cover(
+                self.expected_grid,
+                self.grid_data[1:] + [self.grid_data[1]],
+            )
+        )
+
+    def test__boxes_overlap(self):
+
+        overlap = gd.HierarchicalGridData._boxes_overlap
+
+        # Boxes that touch do not overlap
+        x0 = np.array([[0, 0], [5, 0], [0, 5], [5, 5]])
+        self.assertFalse(overlap(x0, x0 + 5))
+        self.assertTrue(overlap(x0, x0 + 6))
+
+        # Compare with checking all the pairs
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            x0 = rng.integers(0, 40, size=(30, 3))
+            x1 = x0 + rng.integers(0, 6, size=(30, 3))
+            expected = any(
+                np.all(np.maximum(x0[i], x0[j]) < np.minimum(x1[i], x1[j]))
+                for i in range(len(x0))
+                for j in range(i)
+            )
+            self.assertEqual(overlap(x0, x1), expected)
+
     def test__getitem__(self):
 
         hg = gd.HierarchicalGridData(self.grid_data)
@@ -1660,6 +1784,16 @@ class TestHierarchicalGridData(unittest.TestCase):
         self.assertEqual(hg.merge_refinement_levels()((5, 1)), 18)
         self.assertEqual(hg.merge_refinement_levels().grid, expected_grid)
 
+        # The level-by-level merge has to agree with evaluating the data point
+        # by point
+        for resample in (False, True):
+            self.assertEqual(
+                hg.merge_refinement_levels(resample=resample),
+                hg.to_UniformGridData_from_grid(
+                    expected_grid, resample=resample
+                ),
+            )
+
         # Test a case with only one refinement level, so just returning a copy
         hg_one = gd.HierarchicalGridData([big_grid_data])
         self.assertEqual(hg_one.merge_refinement_levels(), big_grid_data)
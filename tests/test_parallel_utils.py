@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2020 Gabriele Bozzola
+#
+# This program is free software; you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation; either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program; if not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from postcactus import parallel_utils as pu
+
+
+class TestParallelUtils(unittest.TestCase):
+    def test_map_in_pool(self):
+
+        with self.assertRaises(ValueError):
+            pu._map_in_pool(abs, [1, 2], num_workers=0)
+
+        # The order is preserved
+        for num_workers in (1, 3, None):
+            self.assertEqual(
+                pu._map_in_pool(abs, range(-10, 0), num_workers=num_workers),
+                list(range(10, 0, -1)),
+            )
+        self.assertEqual(
+            pu._map_in_pool(
+                abs, range(-10, 0), num_workers=2, use_processes=True
+            ),
+            list(range(10, 0, -1)),
+        )
@@ -16,7 +16,10 @@
 # this program; if not, see <https://www.gnu.org/licenses/>.
 
 import unittest
+from unittest import mock
 
+from postcactus import cactus_multipoles as mp
+from postcactus import cactus_scalars as cs
 from postcactus import simdir as sd
 
 
@@ -84,3 +87,120 @@ class TestSimDir(unittest.TestCase):
         # This is a fake folder
         empty_sim = sd.SimDir("postcactus")
         self.assertIn("No horizon found", empty_sim.__str__())
+
+    def test__classify_files(self):
+
+        files = sd._classify_files(
+            [
+                "a/hydrobase-rho.maximum.asc",
+                "a/carpet-timing..asc",
+                "a/alp.scalars.asc.gz",
+                "a/rho.xy.asc.bz2",
+                "a/rho.asc",
+                "a/rho.xyz.file_0.h5",
+                "a/mp_Psi4_l2_m2_r110.69.asc",
+                "a/mp_harmonic.h5",
+                "a/BH_diagnostics.ah1.gp",
+                "a/h.t0.ah1.gp",
+                "a/other.gp",
+                "a/sim.par",
+            ]
+        )
+
+        self.assertEqual(
+            files["scalars"],
+            [
+                "a/hydrobase-rho.maximum.asc",
+                "a/carpet-timing..asc",
+                "a/alp.scalars.asc.gz",
+            ],
+        )
+        self.assertEqual(
+            files["grid_functions"],
+            ["a/rho.xy.asc.bz2", "a/rho.asc", "a/rho.xyz.file_0.h5"],
+        )
+        self.assertEqual(
+            files["multipoles"],
+            ["a/mp_Psi4_l2_m2_r110.69.asc", "a/mp_harmonic.h5"],
+        )
+        self.assertEqual(
+            files["horizons"], ["a/BH_diagnostics.ah1.gp", "a/h.t0.ah1.gp"]
+        )
+
+        # Multipoles are not grid functions
+        self.assertNotIn("mp_harmonic", self.sim.gf.xyz.keys())
+
+    def test_preload(self):
+
+        with self.assertRaises(ValueError):
+            self.sim.preload({"bubu": True})
+
+        with self.assertRaises(ValueError):
+            self.sim.preload({"ts": {"bubu": ["rho"]}})
+
+        with self.assertRaises(KeyError):
+            self.sim.preload({"ts": {"maximum": ["bubu"]}})
+
+        with self.assertRaises(KeyError):
+            self.sim.preload({"multipoles": {"bubu": None}})
+
+        spec = {
+            "ts": {
+                "maximum": ["rho", "press"],
+                "scalar": ["time_total", "current_physical_time_per_hour"],
+            },
+            "multipoles": {"phi2": [110.69], "harmonic": None},
+        }
+
+        expected_rho = sd.SimDir("tests/tov").ts.maximum["rho"]
+        expected_phi2 = sd.SimDir("tests/tov").multipoles["phi2"]
+
+        for use_processes in (False, True):
+            sim = sd.SimDir("tests/tov")
+
+            with mock.patch.object(
+                cs, "load_ascii", wraps=cs.load_ascii
+            ) as load_scalars, mock.patch.object(
+                mp, "load_ascii", wraps=mp.load_ascii
+            ) as load_multipoles:
+                sim.preload(spec, num_workers=2, use_processes=use_processes)
+                if not use_processes:
+                    # Each file is read once: two restarts for rho and
+                    # press, and one file for the two timers
+                    self.assertEqual(load_scalars.call_count, 5)
+                    # There are five multipoles at radius 110.69
+                    self.assertEqual(load_multipoles.call_count, 5)
+                load_scalars.reset_mock()
+
+                # The data is not read again
+                self.assertEqual(sim.ts.maximum["rho"], expected_rho)
+                sim.ts.maximum["press"]
+                sim.ts.scalar["time_total"]
+                load_scalars.assert_not_called()
+
+            # Only the files of the other radii are read
+            self.assertEqual(len(sim.multipoles._textfiles_data), 5)
+            self.assertEqual(sim.multipoles["phi2"], expected_phi2)
+            # Once the data is in the MultipoleAllDets, it is not kept
+            # twice, and it is not read again
+            self.assertEqual(len(sim.multipoles._textfiles_data), 0)
+            self.assertEqual(sim.multipoles._jobs_to_preload("phi2"), [])
+
+        horizons = sd.SimDir("tests/horizons")
+        horizons.preload({"horizons": True}, num_workers=2)
+        # The AH files are read too
+        self.assertEqual(
+            len(horizons.horizons._ah_files_data),
+            sum(len(files) for files in horizons.horizons._ah_files.values()),
+        )
+        self.assertEqual(
+            horizons.horizons[0, 1].mass,
+            sd.SimDir("tests/horizons").ts.scalar["qlm_mass[0]"],
+        )
+        # The data of the files is not kept after it is combined
+        horizons.horizons[0, 1].ah.area
+        self.assertEqual(
+            len(horizons.horizons._ah_files_data),
+            len(horizons.horizons._ah_files[2]),
+        )
+        self.assertEqual(horizons.horizons._jobs_to_preload(), [])
@@ -143,6 +143,18 @@ class TestTimeseries(unittest.TestCase):
         self.assertEqual(ts.TimeSeries(t, t + 1j * t).time_at_maximum(), 1)
         self.assertEqual(ts.TimeSeries(t, t + 1j * t).time_at_minimum(), 0)
 
+        # The absolute value is computed in chunks, the first occurrence is
+        # returned
+        y = np.sin(2 * np.pi * t)
+        y[77] = -2
+        y[90] = 2
+        with mock.patch("postcactus.series._POINTS_PER_CHUNK", 7):
+            self.assertEqual(ts.TimeSeries(t, y).time_at_maximum(), t[77])
+            self.assertEqual(
+                ts.TimeSeries(t, y).time_at_minimum(),
+                t[np.argmin(np.abs(y))],
+            )
+
     def test_align_maximum_minimum(self):
         t = np.linspace(0, 1, 100)
 
@@ -174,6 +186,48 @@ class TestTimeseries(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             ts.TimeSeries([1], [1]).is_regularly_sampled()
 
+        # The result is saved, and reset when the times change
+        ts_log.t = np.linspace(0, 1, 100)
+        self.assertTrue(ts_log.is_regularly_sampled())
+        ts_log.time_shift(1)
+        self.assertTrue(ts_log.is_regularly_sampled())
+        times = np.linspace(0, 1, 100)
+        times[1] *= 1.01
+        ts_log.t = times
+        self.assertFalse(ts_log.is_regularly_sampled())
+        # Times that are changed in place are detected
+        ts_log.t[1] = 1 / 99
+        self.assertTrue(ts_log.is_regularly_sampled())
+        # Otherwise, the saved result is used without checking the step again
+        with mock.patch(
+            "postcactus.series.np.allclose", side_effect=np.allclose
+        ) as allclose:
+            self.assertTrue(ts_log.is_regularly_sampled())
+            self.assertTrue(ts_log.copy().is_regularly_sampled())
+            self.assertTrue((ts_log + 1).is_regularly_sampled())
+            allclose.assert_not_called()
+        # Read-only views of arrays that are changed are detected too
+        times = np.linspace(0, 1, 100)
+        view = times.view()
+        view.setflags(write=False)
+        ts_view = ts.TimeSeries._from_validated(view, self.values)
+        self.assertTrue(ts_view.is_regularly_sampled())
+        times[:] = np.linspace(0, 1, 100) ** 1.5
+        self.assertFalse(ts_view.is_regularly_sampled())
+        # Times that cannot be modified are not copied or compared
+        ts_frozen = ts.TimeSeries._from_validated(
+            series._frozen(np.linspace(0, 1, 100)), self.values
+        )
+        self.assertTrue(ts_frozen.is_regularly_sampled())
+        with mock.patch(
+            "postcactus.series.np.array_equal", side_effect=np.array_equal
+        ) as array_equal:
+            self.assertTrue(ts_frozen.is_regularly_sampled())
+            self.assertTrue((ts_frozen + 1).is_regularly_sampled())
+            array_equal.assert_not_called()
+        ts_log.t = np.linspace(0, 1, 100)
+        self.assertTrue(ts_log.copy().is_regularly_sampled())
+
     def test_tmin_tmax_length_dt(self):
 
         # Testing methods of the base class
@@ -196,6 +250,12 @@ class TestTimeseries(unittest.TestCase):
             sins.t[-1] = 20
             sins.dt
 
+        # dt is saved, and recomputed when the times change
+        sins.t = np.linspace(1, 2, 100)
+        self.assertAlmostEqual(sins.dt, 1 / 99)
+        sins.t *= 2
+        self.assertAlmostEqual(sins.dt, 2 / 99)
+
     def test__apply_binary(self):
         # Check that errors are thrown if:
         # 1. Lists have different times
@@ -495,6 +555,43 @@ class TestTimeseries(unittest.TestCase):
         tscopyc2 = tscopyc.copy()
         self.assertEqual(tscopyc.spline_imag, tscopyc2.spline_imag)
 
+        # The splines are shared and not recomputed
+        self.assertIs(tscopyc.spline_real, tscopyc2.spline_real)
+        with mock.patch.object(
+            series.interpolate, "splrep", wraps=series.interpolate.splrep
+        ) as mock_splrep:
+            tscopyc2(np.pi / 3)
+            tscopyc2.resampled(tscopyc2.t)(np.pi / 3)
+            mock_splrep.assert_not_called()
+
+            # Splines with different k do not evict the others
+            tscopyc2._make_spline(k=1)
+            self.assertEqual(mock_splrep.call_count, 2)
+            tscopyc2._make_spline(k=3)
+            tscopyc2._make_spline(k=1)
+            self.assertEqual(mock_splrep.call_count, 2)
+            self.assertEqual(tscopyc2.spline_real[2], 1)
+
+            # Changing the data invalidates the splines only of the copy
+            tscopyc2.y = tscopyc2.y * 2
+            tscopyc2._make_spline(k=1)
+            self.assertEqual(mock_splrep.call_count, 4)
+            # Splines computed by a copy are not added to the original
+            tscopyc._make_spline(k=1)
+            self.assertEqual(mock_splrep.call_count, 6)
+            self.assertTrue(np.allclose(2 * tscopyc(1), tscopyc2(1)))
+
+            # Copies that are modified in place do not use the old splines
+            tscopyc._make_spline(k=3)
+            tscopyc3 = tscopyc.copy()
+            tscopyc3.y[:] = tscopyc3.y * 2
+            self.assertTrue(np.allclose(2 * tscopyc(1), tscopyc3(1)))
+            self.assertEqual(mock_splrep.call_count, 8)
+
+        # Splines cannot be modified
+        with self.assertRaises(ValueError):
+            tscopyc.spline_real[1][0] = 1
+
     def test_time_shift(self):
 
         times = np.logspace(0, 1, 100)
@@ -535,6 +632,78 @@ class TestTimeseries(unittest.TestCase):
         self.assertGreaterEqual(sins.tmin, 1)
         self.assertLessEqual(sins.tmax, 1.4)
 
+        # Check that the result is the same as with masks
+        sins = ts.TimeSeries(self.times, self.values)
+        msk = (self.times >= 0.5) & (self.times <= 1.5)
+        self.assertEqual(
+            sins.cropped(init=0.5, end=1.5),
+            ts.TimeSeries(self.times[msk], self.values[msk]),
+        )
+
+        # Nothing left
+        with self.assertRaises(ValueError):
+            sins.cropped(init=7, end=8)
+
+    def test_shared_data(self):
+
+        sins = ts.TimeSeries(self.times, self.values)
+
+        # Series derived from sins do not change when sins is modified in place
+        derived = {
+            "cropped": sins.cropped(init=0.5, end=1.5),
+            "multiplied": sins * 2,
+            "time_shifted": sins.time_shifted(1),
+            "windowed": sins.hamming_windowed(),
+            "resampled": sins.resampled(sins.t[10:20]),
+            "bundled": ts.TimeSeriesBundle.from_timeseries([sins])[0],
+            "combined": ts.combine_ts([sins.cropped(end=1), sins]),
+        }
+        expected = {name: series.copy() for name, series in derived.items()}
+
+        sins.y[20] = 100
+        sins.t[0] = -1
+
+        for name, series in derived.items():
+            with self.subTest(name=name):
+                self.assertEqual(series, expected[name])
+                self.assertFalse(np.shares_memory(series.y, sins.y))
+                # The derived series can be modified
+                series.y[0] = 10
+
+        # Data that cannot be modified is shared instead of copied
+        times, values = self.times.copy(), self.values.copy()
+        times.setflags(write=False)
+        values.setflags(write=False)
+        frozen = ts.TimeSeries._from_validated(times, values)
+
+        frozen_cropped = frozen.cropped(init=0.5, end=1.5)
+        self.assertTrue(np.shares_memory(frozen_cropped.y, values))
+        with self.assertRaises(ValueError):
+            frozen_cropped.y[0] = 10
+
+        frozen_windowed = frozen.hamming_windowed()
+        self.assertTrue(np.shares_memory(frozen_windowed.t, times))
+        self.assertFalse(np.shares_memory(frozen_windowed.y, values))
+        # The new data is not read-only
+        frozen_windowed.y[0] = 10
+
+        # Read-only views of writeable arrays are not shared
+        view = sins.t.view()
+        view.setflags(write=False)
+        self.assertFalse(
+            np.shares_memory(
+                ts.TimeSeries._from_validated(view, sins.y).cropped().t,
+                sins.t,
+            )
+        )
+
+        # Modifying the series in place copies the shared data
+        frozen_cropped.time_shift(1)
+        frozen_cropped.y[0] = 10
+        self.assertTrue(np.array_equal(values, self.values))
+        msk = (self.times >= 0.5) & (self.times <= 1.5)
+        self.assertTrue(np.allclose(frozen_cropped.t, self.times[msk] + 1))
+
     def test_save(self):
 
         times = np.logspace(0, 1, 10)
@@ -575,6 +744,12 @@ class TestTimeseries(unittest.TestCase):
         self.assertTrue(np.allclose(sins.y, values[1:-1]))
         self.assertTrue(np.allclose(sins.t, self.times[1:-1]))
 
+        # If there are only nans, the result would be empty
+        with self.assertRaises(ValueError):
+            ts.TimeSeries(
+                self.times, np.full_like(self.times, np.nan)
+            ).nans_removed()
+
     def test_make_spline_call(self):
 
         # Cannot make a spline with 1 point
@@ -598,6 +773,17 @@ class TestTimeseries(unittest.TestCase):
 
         self.assertTrue(np.allclose(self.TS(self.TS.t[0]), self.TS.y[0]))
 
+        # Mixed points from data and from spline, not sorted
+        mixed_times = np.array([self.times[3], np.pi / 2, self.times[0], 1])
+        self.assertTrue(np.allclose(self.TS(mixed_times), np.sin(mixed_times)))
+
+        # Points from data within the tolerance do not use the spline
+        with mock.patch.object(
+            ts.TimeSeries, "evaluate_with_spline"
+        ) as mock_spline:
+            self.assertEqual(self.TS(self.times[5] + 1e-15), self.TS.y[5])
+            mock_spline.assert_not_called()
+
         # From data
         self.assertTrue(
             np.allclose(self.TS_c(self.times), self.values + 1j * self.values)
@@ -707,6 +893,107 @@ class TestTimeseries(unittest.TestCase):
         res.resample([1, 1.1, 1.9, 2], piecewise_constant=True)
         self.assertTrue(np.allclose(res.y, np.array([10, 10, 0, 0])))
 
+        # Resampling a regular series to a contiguous subset of its times
+        # does not need splines
+        sins = self.TS.copy()
+        with mock.patch.object(sins, "evaluate_with_spline") as mock_evaluate:
+            sub = sins.resampled(np.array(sins.t[10:20]))
+            mock_evaluate.assert_not_called()
+        self.assertTrue(np.array_equal(sub.y, sins.y[10:20]))
+        self.assertTrue(np.array_equal(sub.t, sins.t[10:20]))
+        # Also with different roundoff
+        sub = sins.resampled(sins.t[10] + np.arange(10) * sins.dt)
+        self.assertTrue(np.array_equal(sub.y, sins.y[10:20]))
+        # The data is copied, so modifying it does not change sins
+        sub.y[0] = 1
+        self.assertEqual(sins.y[10], np.sin(self.times[10]))
+        sins.resample(sins.t[50:])
+        self.assertTrue(np.allclose(sins.y, np.sin(self.times[50:])))
+        sins.y[0] = 1
+        self.assertEqual(sins.y[0], 1)
+
+        # Times in between points, or outside, use splines
+        sins = self.TS.copy()
+        shifted_times = sins.t[10:20] + sins.dt / 2
+        self.assertTrue(
+            np.allclose(sins.resampled(shifted_times).y, np.sin(shifted_times))
+        )
+        with self.assertRaises(ValueError):
+            sins.resampled(sins.t + sins.dt)
+
+        # Other methods
+        times = np.linspace(0, 10, 1001)
+        sins = ts.TimeSeries(times, np.sin(times))
+
+        with self.assertRaises(ValueError):
+            sins.resampled(times[:-1] + 0.005, method="cubic")
+
+        for method, tolerance in (
+            ("linear", 1e-4),
+            ("local_cubic", 1e-9),
+            ("polyphase", 5e-3),
+        ):
+            with self.subTest(method=method):
+                res = sins.fixed_timestep_resampled(0.025, method=method)
+                self.assertTrue(np.allclose(res.t, 0.025 * np.arange(401)))
+                self.assertTrue(
+                    np.allclose(res.y, np.sin(res.t), atol=tolerance)
+                )
+                res_c = (sins * (1 + 1j)).regular_resampled(method=method)
+                self.assertTrue(np.allclose(res_c.y, (1 + 1j) * sins.y))
+
+        # Linear is the same as np.interp
+        new_times = np.sort(np.random.uniform(0, 10, 500))
+        self.assertTrue(
+            np.allclose(
+                sins.resampled(new_times, method="linear").y,
+                np.interp(new_times, times, sins.y),
+            )
+        )
+
+        # Local cubic is exact for cubic polynomials, even when extrapolating,
+        # also when the points are processed in chunks
+        irregular_times = np.sort(np.random.uniform(0, 10, 50))
+        cubic = ts.TimeSeries(irregular_times, irregular_times ** 3 - 2)
+        out_times = np.linspace(-1, 11, 100)
+        with mock.patch("postcactus.series._POINTS_PER_CHUNK", 7):
+            res = cubic.resampled(out_times, ext=0, method="local_cubic")
+        self.assertTrue(np.allclose(res.y, out_times ** 3 - 2))
+
+        # ext
+        with self.assertRaises(ValueError):
+            cubic.resampled(out_times, method="linear")
+        self.assertTrue(
+            np.allclose(
+                cubic.resampled(out_times, ext=1, method="linear").y[[0, -1]],
+                0,
+            )
+        )
+        res = cubic.resampled(out_times, ext=3, method="local_cubic")
+        self.assertAlmostEqual(res.y[0], cubic.y[0])
+        self.assertAlmostEqual(res.y[-1], cubic.y[-1])
+        # Linear extrapolation
+        res = cubic.resampled([cubic.tmax + 1], ext=0, method="linear")
+        slope = (cubic.y[-1] - cubic.y[-2]) / (cubic.t[-1] - cubic.t[-2])
+        self.assertAlmostEqual(res.y[0], cubic.y[-1] + slope)
+
+        sins.fixed_frequency_resample(40, method="linear")
+        self.assertEqual(len(sins), 401)
+
+        # Polyphase requires regular times with a simple ratio of timesteps,
+        # within the interval
+        sins = ts.TimeSeries(times, np.sin(times))
+        with self.assertRaises(ValueError):
+            sins.resampled(new_times, method="polyphase")
+        with self.assertRaises(ValueError):
+            sins.resampled(times[:10] * np.pi, method="polyphase")
+        with self.assertRaises(ValueError):
+            sins.resampled(times[:10] + 0.001, method="polyphase")
+        with self.assertRaises(ValueError):
+            sins.resampled(times + 1, method="polyphase")
+        with self.assertRaises(ValueError):
+            cubic.resampled(times, method="polyphase")
+
     def test_integrate(self):
 
         times_long = np.linspace(0, 2 * np.pi, 10000)
@@ -878,6 +1165,162 @@ class TestTimeseries(unittest.TestCase):
             np.allclose(ts.combine_ts([ts4, ts5], prefer_late=True).y, coss5)
         )
 
+        # ts4 does not add any point, so the data of ts5 is taken entirely.
+        # It is copied, because it can be modified.
+        combined = ts.combine_ts([ts4, ts5])
+        self.assertEqual(combined, ts5)
+        self.assertFalse(np.shares_memory(combined.y, ts5.y))
+        # When it cannot be modified, it is shared
+        ts5.t.setflags(write=False)
+        ts5.y.setflags(write=False)
+        combined = ts.combine_ts([ts4, ts5])
+        self.assertTrue(np.shares_memory(combined.y, ts5.y))
+        self.assertFalse(combined.y.flags.writeable)
+        self.assertFalse(combined.t.flags.writeable)
+
+        # Many restarts, with segments not in order
+        times_seg = [
+            np.linspace(0, 10, 11),
+            np.linspace(20, 30, 11),
+            np.linspace(8, 22, 15),
+            np.linspace(25, 40, 16),
+        ]
+        segments = [ts.TimeSeries(t, t + i) for i, t in enumerate(times_seg)]
+
+        combined_late = ts.combine_ts(segments)
+        self.assertTrue(np.allclose(combined_late.t, np.linspace(0, 40, 41)))
+        self.assertTrue(
+            np.allclose(
+                combined_late.y - combined_late.t,
+                [0] * 8 + [2] * 12 + [1] * 5 + [3] * 16,
+            )
+        )
+
+        combined_early = ts.combine_ts(segments, prefer_late=False)
+        self.assertTrue(np.allclose(combined_early.t, np.linspace(0, 40, 41)))
+        self.assertTrue(
+            np.allclose(
+                combined_early.y - combined_early.t,
+                [0] * 11 + [2] * 12 + [1] * 8 + [3] * 10,
+            )
+        )
+
+        # Many variables at once
+        combined_many = ts.combine_many_ts(
+            times_seg,
+            {
+                "a": [t + i for i, t in enumerate(times_seg)],
+                "b": [-t for t in times_seg],
+            },
+        )
+        self.assertEqual(combined_many["a"], combined_late)
+        self.assertEqual(
+            combined_many["b"],
+            ts.TimeSeries(combined_late.t, -combined_late.t),
+        )
+
+        with self.assertRaises(ValueError):
+            ts.combine_many_ts(times_seg, {"a": times_seg[:2]})
+
+    def test_TimeSeriesBundle(self):
+
+        times = np.linspace(0, 2 * np.pi, 100)
+        sins = ts.TimeSeries(times, np.sin(times))
+        coss = ts.TimeSeries(times, np.cos(times))
+
+        # Errors
+        with self.assertRaises(ValueError):
+            ts.TimeSeriesBundle(times, [[1, 2]])
+        with self.assertRaises(ValueError):
+            ts.TimeSeriesBundle([], [[]])
+        with self.assertRaises(ValueError):
+            ts.TimeSeriesBundle([2, 1], [[1, 2]])
+        with self.assertRaises(ValueError):
+            ts.TimeSeriesBundle([1, 2], [[1, 2]], ["a", "b"])
+        with self.assertRaises(ValueError):
+            ts.TimeSeriesBundle([1, 2], [[1, 2], [3, 4]], ["a", "a"])
+        with self.assertRaises(ValueError):
+            ts.TimeSeriesBundle.from_timeseries([sins, sins.cropped(end=1)])
+        with self.assertRaises(RuntimeError):
+            ts.TimeSeriesBundle([1], [[1]]).is_regularly_sampled()
+
+        bundle = ts.TimeSeriesBundle(times, [sins.y, coss.y])
+        self.assertEqual(bundle.channels, [0, 1])
+        self.assertEqual(bundle[1], coss)
+        self.assertEqual(
+            bundle, ts.TimeSeriesBundle.from_timeseries([sins, coss])
+        )
+
+        bundle = ts.TimeSeriesBundle.from_timeseries(
+            {"sin": sins, "cos": coss}
+        )
+        self.assertEqual(bundle.keys(), ["sin", "cos"])
+        self.assertIn("sin", bundle)
+        self.assertEqual(len(bundle), 100)
+        self.assertEqual(bundle["sin"], sins)
+        self.assertEqual(bundle.to_TimeSeries(), {"sin": sins, "cos": coss})
+        self.assertAlmostEqual(bundle.tmin, 0)
+        self.assertAlmostEqual(bundle.tmax, 2 * np.pi)
+        self.assertAlmostEqual(bundle.dt, sins.dt)
+        self.assertNotEqual(bundle, sins)
+
+        bundle_copy = bundle.copy()
+        self.assertEqual(bundle_copy, bundle)
+        self.assertIsNot(bundle_copy.y, bundle.y)
+
+        # Resampling is the same as for each TimeSeries
+        new_times = np.linspace(-1, 2 * np.pi + 1, 200)
+        for ext in (0, 1, 3):
+            resampled = bundle.resampled(new_times, ext=ext)
+            self.assertEqual(
+                resampled["cos"], coss.resampled(new_times, ext=ext)
+            )
+        with self.assertRaises(ValueError):
+            bundle.resampled(new_times)
+
+        new_times = np.linspace(0, 2, 50)
+        self.assertEqual(
+            bundle.resampled(new_times, piecewise_constant=True)["sin"],
+            sins.resampled(new_times, piecewise_constant=True),
+        )
+        bundle_copy.resample(new_times)
+        self.assertEqual(bundle_copy["sin"], sins.resampled(new_times))
+
+        self.assertEqual(
+            bundle.windowed("tukey", 0.5)["cos"], coss.tukey_windowed(0.5)
+        )
+        bundle_copy.window(signal.hamming)
+        self.assertEqual(
+            bundle_copy["cos"], coss.resampled(new_times).hamming_windowed()
+        )
+
+        self.assertEqual(
+            bundle.to_FrequencySeries()["cos"], coss.to_FrequencySeries()
+        )
+        bundle_complex = ts.TimeSeriesBundle.from_timeseries([sins * 1j, coss])
+        self.assertEqual(
+            bundle_complex.to_FrequencySeries()[0],
+            (sins * 1j).to_FrequencySeries(),
+        )
+        bundle_log = ts.TimeSeriesBundle(np.logspace(0, 1, 100), [sins.y])
+        with self.assertWarns(RuntimeWarning):
+            bundle_log.to_FrequencySeries()
+        with self.assertRaises(ValueError):
+            bundle_log.dt
+
+        # combine_ts
+        bundle_late = ts.TimeSeriesBundle.from_timeseries(
+            {"sin": sins.time_shifted(5), "cos": coss.time_shifted(5)}
+        )
+        combined = ts.combine_ts([bundle, bundle_late])
+        self.assertEqual(
+            combined["cos"], ts.combine_ts([coss, coss.time_shifted(5)])
+        )
+        with self.assertRaises(TypeError):
+            ts.combine_ts([bundle, coss])
+        with self.assertRaises(ValueError):
+            ts.combine_ts([bundle, ts.TimeSeriesBundle(times, [sins.y])])
+
     def test_resample_common(self):
 
         # Test with resample=False
@@ -937,6 +1380,26 @@ class TestTimeseries(unittest.TestCase):
         )
         self.assertTrue(np.allclose(ts1_res.y, sins3))
 
+        # Test with resample=False on long series with points that are
+        # not exactly equal
+        times_long1 = np.linspace(0, 1, 20001)
+        times_long2 = np.linspace(0.5, 1.5, 20001) + 1e-15
+        ts_long1 = ts.TimeSeries(times_long1, np.sin(times_long1))
+        ts_long2 = ts.TimeSeries(times_long2, np.cos(times_long2))
+
+        new_long1, new_long2 = series.sample_common([ts_long1, ts_long2])
+        self.assertEqual(len(new_long1), 10001)
+        self.assertTrue(np.allclose(new_long1.t, times_long2[:10001]))
+        self.assertTrue(np.allclose(new_long1.y, np.sin(new_long1.t)))
+        self.assertTrue(np.allclose(new_long2.y, np.cos(new_long2.t)))
+
+        # Series with the same regular x are returned as copies
+        ts_same = ts.TimeSeries(times_long1, np.cos(times_long1))
+        new_long1, new_same = series.sample_common([ts_long1, ts_same])
+        self.assertEqual(new_long1, ts_long1)
+        self.assertEqual(new_same, ts_same)
+        self.assertIsNot(new_same, ts_same)
+
     def test_windows(self):
 
         ones = ts.TimeSeries(self.times, np.ones_like(self.times))
@@ -1096,3 +1559,69 @@ class TestTimeseries(unittest.TestCase):
 
         self.assertTrue(np.allclose(rfs.f, rfreq))
         self.assertTrue(np.allclose(rfs.fft, rfft))
+
+    def test_spectrogram(self):
+
+        times = np.linspace(0, 100, 10001)
+        values = np.sin(2 * np.pi * (5 + 0.2 * times) * times)
+        tts = ts.TimeSeries(times, values)
+
+        # Invalid overlap
+        with self.assertRaises(ValueError):
+            tts.spectrogram(2, overlap=1)
+
+        # Invalid segment_time
+        with self.assertRaises(ValueError):
+            tts.spectrogram(200)
+
+        # Segments of 200 points, separated by 50 points
+        stft = tts.spectrogram(2, overlap=0.75)
+        dt = times[1] - times[0]
+
+        self.assertEqual(stft.shape[0], (len(times) - 200) // 50 + 1)
+        self.assertAlmostEqual(stft.x0[0], (199 * dt) / 2)
+        self.assertAlmostEqual(stft.dx[0], 50 * dt)
+
+        # Use small batches to test the batching
+        with mock.patch.object(ts, "_SEGMENTS_PER_BATCH", 7):
+            stft_batched = tts.spectrogram(2, overlap=0.75)
+        self.assertEqual(stft, stft_batched)
+
+        # Window with arguments
+        stft_tukey = tts.spectrogram(2, 0.75, "tukey", 0.5)
+
+        for index in (0, 13, stft.shape[0] - 1):
+            segment = ts.TimeSeries(
+                times[50 * index : 50 * index + 200],
+                values[50 * index : 50 * index + 200],
+            )
+            expected = segment.tukey_windowed(0.5).to_FrequencySeries()
+            self.assertTrue(
+                np.allclose(stft_tukey.grid.coordinates_1d[1], expected.f)
+            )
+            self.assertTrue(np.allclose(stft_tukey.data[index], expected.fft))
+
+        # Data that is not contiguous in memory
+        strided = ts.TimeSeries._from_validated(times[::2], values[::2])
+        self.assertFalse(strided.y.flags.c_contiguous)
+        self.assertEqual(
+            strided.spectrogram(2, overlap=0.3),
+            ts.TimeSeries(times[::2], values[::2]).spectrogram(2, overlap=0.3),
+        )
+
+        # Complex
+        ctts = ts.TimeSeries(times, np.exp(1j * 2 * np.pi * times))
+        cstft = ctts.spectrogram(10, overlap=0)
+        expected = (
+            ts.TimeSeries(times[1000:2000], ctts.y[1000:2000])
+            .hamming_windowed()
+            .to_FrequencySeries()
+        )
+        self.assertEqual(cstft.shape[1], 1000)
+        self.assertTrue(np.allclose(cstft.grid.coordinates_1d[1], expected.f))
+        self.assertTrue(np.allclose(cstft.data[1], expected.fft))
+
+        # Not regularly sampled
+        with self.assertWarns(RuntimeWarning):
+            tts.t[1] *= 1.0001
+            tts.spectrogram(2)